@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+from dataclasses import fields, is_dataclass
 from datetime import datetime, timezone
 from typing import Any, List, Optional
 
@@ -8,6 +8,7 @@ from dicegame.actions import Bank, Roll
 from dicegame.engine import GameEngine, Event
 from dicegame.types import RandomDice
 
+from .metrics import EVENT_TO_DTO_SECONDS, GAME_STATE_DTO_SECONDS
 from .models import EventDTO, GameStateDTO, PlayerDTO, PlayerStatsDTO, ValidActionsDTO
 
 
@@ -36,42 +37,43 @@ def next_active_player_id(engine: GameEngine) -> Optional[int]:
 
 
 def game_state_dto(engine: GameEngine) -> GameStateDTO:
-    rs = engine.state.round_state
-    players: List[PlayerDTO] = []
-    stats: List[PlayerStatsDTO] = []
-    for player in engine.players:
-        status = "ACTIVE" if player.id in rs.active_players else "BANKED"
-        players.append(
-            PlayerDTO(
-                id=player.id,
-                name=player.name,
-                total_score=engine.state.totals[player.id],
-                round_status=status,
+    with GAME_STATE_DTO_SECONDS.time():
+        rs = engine.state.round_state
+        players: List[PlayerDTO] = []
+        stats: List[PlayerStatsDTO] = []
+        for player in engine.players:
+            status = "ACTIVE" if player.id in rs.active_players else "BANKED"
+            players.append(
+                PlayerDTO(
+                    id=player.id,
+                    name=player.name,
+                    total_score=engine.state.totals[player.id],
+                    round_status=status,
+                )
             )
-        )
-        stat = engine.state.stats[player.id]
-        stats.append(
-            PlayerStatsDTO(
-                ones_rolled=stat.ones_rolled,
-                voluntary_banks_count=stat.voluntary_banks_count,
-                forced_zero_banks_count=stat.forced_zero_banks_count,
-                missed_points=stat.missed_points,
-                rolls_taken_as_roller=stat.rolls_taken_as_roller,
-                avg_voluntary_bank=stat.avg_voluntary_bank,
-                avg_rolls_elapsed_before_bank=stat.avg_rolls_elapsed_before_bank,
+            stat = engine.state.stats[player.id]
+            stats.append(
+                PlayerStatsDTO(
+                    ones_rolled=stat.ones_rolled,
+                    voluntary_banks_count=stat.voluntary_banks_count,
+                    forced_zero_banks_count=stat.forced_zero_banks_count,
+                    missed_points=stat.missed_points,
+                    rolls_taken_as_roller=stat.rolls_taken_as_roller,
+                    avg_voluntary_bank=stat.avg_voluntary_bank,
+                    avg_rolls_elapsed_before_bank=stat.avg_rolls_elapsed_before_bank,
+                )
             )
+        return GameStateDTO(
+            players=players,
+            stats=stats,
+            round_score=rs.round_score,
+            round_number=rs.round_index,
+            match_number=rs.match_index,
+            current_roller_id=next_active_player_id(engine),
+            starter_id=rs.starter_index,
+            is_round_over=False,
+            is_game_over=engine.state.game_over,
         )
-    return GameStateDTO(
-        players=players,
-        stats=stats,
-        round_score=rs.round_score,
-        round_number=rs.round_index,
-        match_number=rs.match_index,
-        current_roller_id=next_active_player_id(engine),
-        starter_id=rs.starter_index,
-        is_round_over=False,
-        is_game_over=engine.state.game_over,
-    )
 
 
 def valid_actions_dto(engine: GameEngine) -> ValidActionsDTO:
@@ -88,7 +90,8 @@ def valid_actions_dto(engine: GameEngine) -> ValidActionsDTO:
 
 def _serialize_payload(value: Any) -> Any:
     if is_dataclass(value):
-        return {key: _serialize_payload(val) for key, val in asdict(value).items()}
+        # Walk the fields directly; asdict would deep-copy the whole tree first.
+        return {f.name: _serialize_payload(getattr(value, f.name)) for f in fields(value)}
     if isinstance(value, dict):
         return {key: _serialize_payload(val) for key, val in value.items()}
     if isinstance(value, list):
@@ -97,5 +100,6 @@ def _serialize_payload(value: Any) -> Any:
 
 
 def event_to_dto(seq: int, event: Event) -> EventDTO:
-    payload = _serialize_payload(dict(event.data))
-    return EventDTO(seq=seq, ts_iso=utc_now_iso(), type=event.type, payload=payload)
+    with EVENT_TO_DTO_SECONDS.time():
+        payload = _serialize_payload(dict(event.data))
+        return EventDTO(seq=seq, ts_iso=utc_now_iso(), type=event.type, payload=payload)
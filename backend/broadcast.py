@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Dict, Optional
+
+
+class _Waiters:
+    __slots__ = ("event", "count")
+
+    def __init__(self) -> None:
+        self.event = asyncio.Event()
+        self.count = 0
+
+
+class GameBroadcaster:
+    """Wakes coroutines waiting for a game to change.
+
+    ``publish`` may be called from any thread (sync route handlers run in a
+    thread pool); waiters live on the event loop. Each game has at most one
+    ``asyncio.Event`` shared by all of its waiters, replaced on every publish
+    and dropped when its last waiter leaves, so one idle spectator costs one
+    pending future.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[str, _Waiters] = {}
+
+    def publish(self, game_id: str) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake(game_id)
+        else:
+            loop.call_soon_threadsafe(self._wake, game_id)
+
+    def _wake(self, game_id: str) -> None:
+        waiters = self._waiters.pop(game_id, None)
+        if waiters is not None:
+            waiters.event.set()
+
+    async def wait(self, game_id: str, ready: Callable[[], bool], timeout: float) -> bool:
+        """Wait until ``ready()`` is true, rechecking after each publish; False on timeout.
+
+        ``ready`` is checked and the waiter registered in the same loop step,
+        so a publish cannot slip in between and be missed.
+        """
+        self._loop = asyncio.get_running_loop()
+        deadline = self._loop.time() + timeout
+        while not ready():
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                return False
+            waiters = self._waiters.get(game_id)
+            if waiters is None:
+                waiters = self._waiters[game_id] = _Waiters()
+            waiters.count += 1
+            try:
+                await asyncio.wait_for(waiters.event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return ready()
+            finally:
+                # Other waiters may still be on this event; only the last one removes it.
+                waiters.count -= 1
+                if not waiters.count and self._waiters.get(game_id) is waiters:
+                    del self._waiters[game_id]
+        return True
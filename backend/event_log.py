@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+from typing import Iterator, List, Union
+
+from .models import EventDTO, RawEvent
+
+DEFAULT_EVENT_RETENTION = int(os.environ.get("DICEGAME_EVENT_RETENTION", "2048"))
+# Approximate resident cost of an event beyond its JSON, measured with tracemalloc.
+PARSED_EVENT_BYTES = 1000
+RAW_EVENT_BYTES = 100
+
+LoggedEvent = Union[EventDTO, RawEvent]
+
+
+def _event_bytes(event: LoggedEvent) -> int:
+    overhead = RAW_EVENT_BYTES if isinstance(event, RawEvent) else PARSED_EVENT_BYTES
+    return len(event.json_bytes()) + overhead
+
+
+class ResyncRequired(Exception):
+    """The requested events were compacted; the client must reload from the current state."""
+
+    def __init__(self, snapshot_seq: int) -> None:
+        super().__init__(f"Events up to seq {snapshot_seq} were compacted")
+        self.snapshot_seq = snapshot_seq
+
+
+class EventLog:
+    """Dense, seq-indexed event log that keeps only the newest ``retention`` events.
+
+    Seqs start at 1 and increase by one, so the events after any seq are a
+    slice found by arithmetic. Older events are compacted away: their effect
+    lives on in the game state, and ``snapshot_seq`` records the last seq
+    that can no longer be replayed.
+
+    Events are ``EventDTO`` models or, once compacted, ``RawEvent`` JSON;
+    both carry ``seq`` and ``json_bytes()``, which is all responses need.
+    """
+
+    def __init__(self, retention: int = DEFAULT_EVENT_RETENTION, base_seq: int = 0) -> None:
+        if retention < 1:
+            raise ValueError("retention must be at least 1")
+        self.retention = retention
+        self._events: List[LoggedEvent] = []
+        # Seq of the event before _events[0], and the first retained index.
+        self._base_seq = base_seq
+        self._start = 0
+        self.nbytes = 0
+
+    @property
+    def latest_seq(self) -> int:
+        return self._base_seq + len(self._events)
+
+    @property
+    def next_seq(self) -> int:
+        return self.latest_seq + 1
+
+    @property
+    def snapshot_seq(self) -> int:
+        return self._base_seq + self._start
+
+    def append(self, event: LoggedEvent) -> None:
+        if event.seq != self.next_seq:
+            raise ValueError(f"Expected seq {self.next_seq}, got {event.seq}")
+        self._events.append(event)
+        self.nbytes += _event_bytes(event)
+        if len(self._events) - self._start > self.retention:
+            self._start += 1
+            # Drop the compacted prefix in bulk so appends stay amortized O(1).
+            if self._start >= self.retention:
+                self._drop_prefix()
+
+    def _drop_prefix(self) -> None:
+        self.nbytes -= sum(_event_bytes(event) for event in self._events[: self._start])
+        del self._events[: self._start]
+        self._base_seq += self._start
+        self._start = 0
+
+    def compact(self) -> None:
+        """Keep retained events only as JSON, for logs that will not grow again."""
+        self._drop_prefix()
+        self._events = [RawEvent(event.seq, event.json_bytes()) for event in self._events]
+        self.nbytes = sum(_event_bytes(event) for event in self._events)
+
+    def since(self, seq: int) -> List[LoggedEvent]:
+        """Return retained events with a seq greater than ``seq``.
+
+        A seq past ``latest_seq`` means the client saw a log that has since
+        been reset, so it must resync as well.
+        """
+        if seq < self.snapshot_seq or seq > self.latest_seq:
+            raise ResyncRequired(self.snapshot_seq)
+        return self._events[max(seq - self._base_seq, self._start) :]
+
+    def retained(self) -> List[LoggedEvent]:
+        return self._events[self._start :]
+
+    def clear(self) -> None:
+        self._events = []
+        self._base_seq = 0
+        self._start = 0
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._events) - self._start
+
+    def __iter__(self) -> Iterator[LoggedEvent]:
+        return iter(self.retained())
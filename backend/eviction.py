@@ -0,0 +1,120 @@
+"""Policies and on-disk archive for sessions evicted from memory."""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+ARCHIVE_VERSION = 2
+
+
+def _env_limit(name: str, parse):
+    value = parse(os.environ.get(name, "0"))
+    return value or None
+
+
+@dataclass(frozen=True)
+class EvictionPolicy:
+    """When to spill resident sessions; ``None`` disables a limit.
+
+    ``max_bytes`` is compared against the sessions' approximate footprint
+    (see ``GameSession.approx_bytes``), not the process RSS.
+    """
+
+    idle_ttl: Optional[float] = None
+    max_sessions: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "EvictionPolicy":
+        """Read ``DICEGAME_IDLE_TTL`` (seconds), ``DICEGAME_MAX_SESSIONS`` and
+        ``DICEGAME_MAX_SESSION_BYTES``.
+
+        An unset or ``0`` variable leaves that limit off, so eviction is
+        disabled unless at least one is set.
+        """
+        return cls(
+            idle_ttl=_env_limit("DICEGAME_IDLE_TTL", float),
+            max_sessions=_env_limit("DICEGAME_MAX_SESSIONS", int),
+            max_bytes=_env_limit("DICEGAME_MAX_SESSION_BYTES", int),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in (self.idle_ttl, self.max_sessions, self.max_bytes))
+
+
+@dataclass
+class ArchivedSession:
+    game_id: str
+    version: int
+    engine: bytes
+    snapshot_seq: int
+    events: List[bytes]
+
+
+class SessionArchive:
+    """One zlib-compressed JSON file per spilled session in ``directory``.
+
+    Files are removed when a session is loaded back, so the archive holds
+    exactly the sessions that are not resident. Files left by an earlier
+    process are picked up, so spilled games survive a restart.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._ids: Set[str] = {
+            name[:-3] for name in os.listdir(directory) if name.endswith(".gz")
+        }
+
+    def _path(self, game_id: str) -> str:
+        return os.path.join(self.directory, f"{game_id}.gz")
+
+    def save(self, archived: ArchivedSession) -> int:
+        """Write ``archived`` and return its size on disk."""
+        payload = {
+            "version": ARCHIVE_VERSION,
+            "game_id": archived.game_id,
+            "game_version": archived.version,
+            "engine": archived.engine.decode(),
+            "snapshot_seq": archived.snapshot_seq,
+            "events": [event.decode() for event in archived.events],
+        }
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        path = self._path(archived.game_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+        self._ids.add(archived.game_id)
+        return len(data)
+
+    def pop(self, game_id: str) -> ArchivedSession:
+        """Load and remove a spilled session; KeyError if there is none."""
+        if game_id not in self._ids:
+            raise KeyError("Game not found")
+        path = self._path(game_id)
+        with open(path, "rb") as handle:
+            payload = json.loads(zlib.decompress(handle.read()))
+        if payload.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version in {path}")
+        archived = ArchivedSession(
+            game_id=payload["game_id"],
+            version=payload["game_version"],
+            engine=payload["engine"].encode(),
+            snapshot_seq=payload["snapshot_seq"],
+            events=[event.encode() for event in payload["events"]],
+        )
+        os.remove(path)
+        self._ids.discard(game_id)
+        return archived
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
@@ -0,0 +1,165 @@
+"""Stateless front end for a sharded deployment (see ``backend.sharding``).
+
+Serves the same API as ``backend.main`` by forwarding each request to the
+owner of its game over ``DICEGAME_SHARDS``, a comma-separated list of owner
+socket paths. Holding no games, it can run with any number of workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Optional
+from uuid import uuid4
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from .metrics import REGISTRY
+from .models import BankRequest, CreateGameRequest, ErrorResponse, GameResponse
+from .sharding import ShardClient, ShardReply
+
+app = FastAPI(title="Dice Game API")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Not imported from backend.main: importing it builds a store, and gateways hold no games.
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+FORWARDED = REGISTRY.counter(
+    "dicegame_gateway_requests_total", "Requests forwarded to shard owners, by op"
+)
+
+_clients: Dict[asyncio.AbstractEventLoop, ShardClient] = {}
+
+
+def client() -> ShardClient:
+    """The shard client for the running event loop; its connections cannot cross loops."""
+    loop = asyncio.get_running_loop()
+    shard_client = _clients.get(loop)
+    if shard_client is None:
+        paths = [path for path in os.environ.get("DICEGAME_SHARDS", "").split(",") if path]
+        if not paths:
+            raise RuntimeError("DICEGAME_SHARDS must list the shard owner sockets")
+        shard_client = _clients[loop] = ShardClient(paths)
+    return shard_client
+
+
+def to_response(reply: ShardReply) -> Response:
+    return Response(reply.body, status_code=reply.status, headers=reply.headers)
+
+
+async def forward(game_id: str, op: str, **fields: object) -> Response:
+    FORWARDED.inc(op=op)
+    return to_response(await client().forward(game_id, {"op": op, **fields}))
+
+
+@app.post("/api/games", response_model=GameResponse, responses={400: {"model": ErrorResponse}})
+async def create_game(payload: CreateGameRequest):
+    # The id picks the owner, so the gateway chooses it before forwarding.
+    return await forward(str(uuid4()), "create", players=payload.players)
+
+
+@app.get(
+    "/api/games/{game_id}",
+    response_model=GameResponse,
+    responses={304: {"description": "Unchanged since If-None-Match"}, 404: {"model": ErrorResponse}},
+)
+async def get_game(
+    game_id: str,
+    request: Request,
+    since_seq: Optional[int] = None,
+    wait: float = 0,
+    delta: bool = False,
+):
+    return await forward(
+        game_id,
+        "get",
+        since_seq=since_seq,
+        wait=wait,
+        delta=delta,
+        if_none_match=request.headers.get("if-none-match"),
+    )
+
+
+async def sse_messages(
+    game_id: str, first: ShardReply, heartbeat: float = STREAM_HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """Relay ``first`` and then long-poll the owner, sending an SSE ``update`` per change."""
+    shard_client = client()
+    reply = first
+    cursor = None
+    while reply.status == 200:
+        latest_seq = int(reply.headers["x-latest-seq"])
+        if latest_seq == cursor:
+            yield ": keepalive\n\n"
+        else:
+            cursor = latest_seq
+            yield f"id: {latest_seq}\nevent: update\ndata: {reply.body.decode()}\n\n"
+        message = {"op": "get", "since_seq": cursor, "wait": heartbeat}
+        reply = await shard_client.forward(game_id, message)
+
+
+@app.get("/api/games/{game_id}/stream", responses={404: {"model": ErrorResponse}})
+async def stream_game(game_id: str, request: Request, since_seq: Optional[int] = None):
+    """Server-Sent Events, as ``backend.main.stream_game``."""
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        since_seq = int(last_event_id)
+    FORWARDED.inc(op="stream")
+    first = await client().forward(game_id, {"op": "get", "since_seq": since_seq})
+    if first.status == 404:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return StreamingResponse(
+        sse_messages(game_id, first),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post(
+    "/api/games/{game_id}/bank",
+    response_model=GameResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def bank(game_id: str, payload: BankRequest):
+    return await forward(game_id, "bank", player_id=payload.player_id)
+
+
+@app.post(
+    "/api/games/{game_id}/roll",
+    response_model=GameResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def roll(game_id: str):
+    return await forward(game_id, "roll")
+
+
+@app.post(
+    "/api/games/{game_id}/reset",
+    response_model=GameResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def reset(game_id: str):
+    return await forward(game_id, "reset")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """This gateway worker's metrics; each owner's are at ``/metrics/shards/{index}``."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/shards/{index}", response_class=PlainTextResponse)
+async def shard_metrics(index: int):
+    shard_client = client()
+    if not 0 <= index < len(shard_client.paths):
+        raise HTTPException(status_code=404, detail="Shard not found")
+    return to_response(await shard_client.request(shard_client.paths[index], {"op": "metrics"}))
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import os
+from typing import AsyncIterator, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
 from dicegame.actions import Bank, Roll
 
-from .adapter import game_state_dto, valid_actions_dto
-from .models import BankRequest, CreateGameRequest, ErrorResponse, GameResponse
-from .store import InMemoryGameStore
+from .broadcast import GameBroadcaster
+from .event_log import ResyncRequired
+from .metrics import REGISTRY
+from .models import (
+    BankRequest,
+    CreateGameRequest,
+    ErrorResponse,
+    GameResponse,
+    encode_game_response,
+)
+from .eviction import EvictionPolicy, SessionArchive
+from .sqlite_store import SqliteGameStore
+from .store import GameSession, InMemoryGameStore
 
 app = FastAPI(title="Dice Game API")
 
@@ -22,42 +34,264 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-store = InMemoryGameStore()
+# Set DICEGAME_DB to a file path to keep games across restarts.
+DB_PATH = os.environ.get("DICEGAME_DB")
+POLICY = EvictionPolicy.from_env()
+if DB_PATH:
+    store = SqliteGameStore(DB_PATH, policy=POLICY)
+else:
+    # Eviction is opt-in; the in-memory store then spills to DICEGAME_ARCHIVE_DIR.
+    ARCHIVE_DIR = os.environ.get("DICEGAME_ARCHIVE_DIR")
+    store = InMemoryGameStore(
+        policy=POLICY, archive=SessionArchive(ARCHIVE_DIR) if ARCHIVE_DIR else None
+    )
+broadcaster = GameBroadcaster()
+REGISTRY.gauge("dicegame_live_sessions", "Sessions resident in memory", lambda: len(store))
+REGISTRY.gauge(
+    "dicegame_spilled_sessions", "Sessions evicted from memory", lambda: store.spilled_count()
+)
+REGISTRY.gauge(
+    "dicegame_resident_session_bytes",
+    "Approximate memory held by resident sessions",
+    lambda: store.resident_bytes(),
+)
 
+MAX_WAIT_SECONDS = 30.0
+STREAM_HEARTBEAT_SECONDS = 15.0
 
-def build_response(game_id: str, events, latest_seq: int) -> GameResponse:
-    session = store.get(game_id)
-    state = game_state_dto(session.engine)
-    valid_actions = valid_actions_dto(session.engine)
-    return GameResponse(
-        game_id=game_id,
-        state=state,
-        events=events,
-        valid_actions=valid_actions,
-        latest_seq=latest_seq,
-    )
+
+def build_response(
+    session: GameSession,
+    events,
+    resync_required: bool = False,
+    base_version: Optional[int] = None,
+) -> GameResponse:
+    """Build a response from the session's cached state; with ``base_version``, as a delta."""
+    with session.lock:
+        snapshot = session.snapshot()
+        delta = None
+        if base_version is not None:
+            delta = session.states.delta(base_version, snapshot)
+        # Every part is already a validated model; skip re-validating the event list.
+        return GameResponse.model_construct(
+            game_id=session.game_id,
+            state=None if delta is not None else snapshot.state,
+            events=events,
+            valid_actions=snapshot.valid_actions,
+            latest_seq=session.latest_seq,
+            snapshot_seq=session.events.snapshot_seq,
+            resync_required=resync_required,
+            version=snapshot.version,
+            state_delta=delta,
+        )
+
+
+def json_response(response: GameResponse, headers: Optional[dict] = None) -> Response:
+    headers = {**(headers or {}), "X-Latest-Seq": str(response.latest_seq)}
+    return Response(encode_game_response(response), media_type="application/json", headers=headers)
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_etag(header: Optional[str]) -> Optional[int]:
+    """The version named by an ``If-None-Match`` header, if it is one of ours."""
+    if header is None:
+        return None
+    value = header.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    return int(value) if value.isdigit() else None
 
 
 @app.post("/api/games", response_model=GameResponse, responses={400: {"model": ErrorResponse}})
 def create_game(payload: CreateGameRequest):
+    return new_game(payload.players)
+
+
+def new_game(players: List[str], game_id: Optional[str] = None) -> Response:
     try:
-        session = store.create(payload.players)
+        session = store.create(players, game_id=game_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return build_response(session.game_id, session.events, session.latest_seq)
+    return json_response(build_response(session, session.events.retained()))
+
+
+def updates_since(
+    game_id: str, since_seq: Optional[int], base_version: Optional[int] = None
+) -> GameResponse:
+    session = store.get(game_id)
+    with session.lock:
+        return _updates_since(session, since_seq, base_version)
 
 
-@app.get("/api/games/{game_id}", response_model=GameResponse, responses={404: {"model": ErrorResponse}})
-def get_game(game_id: str, since_seq: Optional[int] = None):
+def _updates_since(
+    session: GameSession, since_seq: Optional[int], base_version: Optional[int]
+) -> GameResponse:
+    if since_seq is None:
+        return build_response(session, session.events.retained(), base_version=base_version)
     try:
-        session = store.get(game_id)
+        events = session.events.since(since_seq)
+    except ResyncRequired:
+        return build_response(session, session.events.retained(), resync_required=True)
+    return build_response(session, events, base_version=base_version)
+
+
+async def wait_for_change(game_id: str, seen_seq: int, timeout: float) -> bool:
+    session = await asyncio.to_thread(store.get, game_id)
+    # The check runs on the event loop, so it reads the session without its lock.
+    # An evicted session counts as changed; the caller re-reads the reloaded one.
+    return await broadcaster.wait(
+        game_id, lambda: session.evicted or session.latest_seq != seen_seq, timeout
+    )
+
+
+@app.get(
+    "/api/games/{game_id}",
+    response_model=GameResponse,
+    responses={304: {"description": "Unchanged since If-None-Match"}, 404: {"model": ErrorResponse}},
+)
+async def get_game(
+    game_id: str,
+    request: Request,
+    since_seq: Optional[int] = None,
+    wait: float = 0,
+    delta: bool = False,
+):
+    """Return the game, or ``304`` if ``If-None-Match`` names its current version.
+
+    With ``wait`` set and a ``since_seq`` or ``If-None-Match`` to compare
+    against, hold the request up to ``wait`` seconds for news. With
+    ``delta=true`` and an ``If-None-Match`` version that is still cached, the
+    state comes back as a ``state_delta`` against that version.
+    """
+    return await read_game(
+        game_id, since_seq, wait, delta, request.headers.get("if-none-match")
+    )
+
+
+async def read_game(
+    game_id: str,
+    since_seq: Optional[int],
+    wait: float,
+    delta: bool,
+    if_none_match: Optional[str],
+) -> Response:
+    # Session lookups and locked reads may block (on a busy game's lock, or on
+    # disk for spilled and durable sessions), so they run off the event loop.
+    try:
+        session = await asyncio.to_thread(store.get, game_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Game not found") from exc
-    if since_seq is None:
-        events = list(session.events)
-    else:
-        events = [event for event in session.events if event.seq > since_seq]
-    return build_response(game_id, events, session.latest_seq)
+    known = parse_etag(if_none_match)
+    if wait > 0 and (since_seq is not None or known is not None):
+
+        def changed() -> bool:
+            if session.evicted:
+                return True
+            if known is not None and session.version != known:
+                return True
+            return since_seq is not None and session.latest_seq != since_seq
+
+        await broadcaster.wait(game_id, changed, min(wait, MAX_WAIT_SECONDS))
+    try:
+        result = await asyncio.to_thread(read_updates, game_id, since_seq, known, delta)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Game not found") from exc
+    if result is None:
+        return Response(status_code=304, headers={"ETag": etag(known)})
+    return json_response(result, headers={"ETag": etag(result.version)})
+
+
+def read_updates(
+    game_id: str, since_seq: Optional[int], known: Optional[int], delta: bool
+) -> Optional[GameResponse]:
+    """``updates_since`` for a conditional GET; ``None`` if ``known`` is still current."""
+    session = store.get(game_id)
+    with session.lock:
+        if known is not None and known == session.version:
+            return None
+        return _updates_since(session, since_seq, known if delta else None)
+
+
+async def game_updates(
+    game_id: str, since_seq: Optional[int], heartbeat: float = STREAM_HEARTBEAT_SECONDS
+) -> AsyncIterator[Optional[GameResponse]]:
+    """Yield a response now and after every change; ``None`` when ``heartbeat`` passes idle."""
+    cursor = since_seq
+    changed = True
+    while True:
+        try:
+            if changed:
+                response = await asyncio.to_thread(updates_since, game_id, cursor)
+                cursor = response.latest_seq
+                yield response
+            else:
+                yield None
+            changed = await wait_for_change(game_id, cursor, heartbeat)
+        except KeyError:
+            return
+
+
+async def sse_messages(game_id: str, since_seq: Optional[int]) -> AsyncIterator[str]:
+    async for response in game_updates(game_id, since_seq):
+        if response is None:
+            yield ": keepalive\n\n"
+            continue
+        data = encode_game_response(response).decode()
+        yield f"id: {response.latest_seq}\nevent: update\ndata: {data}\n\n"
+
+
+@app.get("/api/games/{game_id}/stream", responses={404: {"model": ErrorResponse}})
+async def stream_game(game_id: str, request: Request, since_seq: Optional[int] = None):
+    """Server-Sent Events: one ``update`` message (a ``GameResponse``) per change.
+
+    Reconnecting ``EventSource`` clients resume from their ``Last-Event-ID``.
+    """
+    try:
+        await asyncio.to_thread(store.get, game_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Game not found") from exc
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        since_seq = int(last_event_id)
+    return StreamingResponse(
+        sse_messages(game_id, since_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def apply_action(game_id: str, action: object):
+    """Apply ``action`` and build its response under the game's lock.
+
+    Holding the lock across both keeps ``latest_seq`` and the state in the
+    response consistent with the returned events, even with concurrent
+    actions on the same game. Waiting for the action to be durable happens
+    after the lock is released, so the game's next action need not wait
+    for this one's commit.
+    """
+    try:
+        with store.locked(game_id) as session:
+            try:
+                events, durable = store.submit_action(game_id, action)
+            except ValueError as exc:
+                snapshot = session.snapshot()
+                payload = ErrorResponse(
+                    detail=str(exc), state=snapshot.state, valid_actions=snapshot.valid_actions
+                ).model_dump()
+                return JSONResponse(status_code=400, content=payload)
+            response = build_response(session, events)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Game not found") from exc
+    try:
+        durable()
+    finally:
+        # A failed commit discards the session; waiters must see that too.
+        broadcaster.publish(game_id)
+    return json_response(response)
 
 
 @app.post(
@@ -66,22 +300,7 @@ def get_game(game_id: str, since_seq: Optional[int] = None):
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
 )
 def bank(game_id: str, payload: BankRequest):
-    try:
-        events = store.apply_action(game_id, Bank(payload.player_id))
-    except KeyError as exc:
-        raise HTTPException(status_code=404, detail="Game not found") from exc
-    except ValueError as exc:
-        session = store.get(game_id)
-        state = game_state_dto(session.engine)
-        valid_actions = valid_actions_dto(session.engine)
-        payload = ErrorResponse(
-            detail=str(exc),
-            state=state,
-            valid_actions=valid_actions,
-        ).model_dump()
-        return JSONResponse(status_code=400, content=payload)
-    session = store.get(game_id)
-    return build_response(game_id, events, session.latest_seq)
+    return apply_action(game_id, Bank(payload.player_id))
 
 
 @app.post(
@@ -90,22 +309,7 @@ def bank(game_id: str, payload: BankRequest):
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
 )
 def roll(game_id: str):
-    try:
-        events = store.apply_action(game_id, Roll())
-    except KeyError as exc:
-        raise HTTPException(status_code=404, detail="Game not found") from exc
-    except ValueError as exc:
-        session = store.get(game_id)
-        state = game_state_dto(session.engine)
-        valid_actions = valid_actions_dto(session.engine)
-        payload = ErrorResponse(
-            detail=str(exc),
-            state=state,
-            valid_actions=valid_actions,
-        ).model_dump()
-        return JSONResponse(status_code=400, content=payload)
-    session = store.get(game_id)
-    return build_response(game_id, events, session.latest_seq)
+    return apply_action(game_id, Roll())
 
 
 @app.post(
@@ -115,7 +319,15 @@ def roll(game_id: str):
 )
 def reset(game_id: str):
     try:
-        session = store.reset(game_id)
+        with store.locked(game_id) as session:
+            store.reset(game_id)
+            response = build_response(session, session.events.retained())
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Game not found") from exc
-    return build_response(session.game_id, session.events, session.latest_seq)
+    broadcaster.publish(game_id)
+    return json_response(response)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+
+from dicegame.metrics import MetricsRegistry
+
+# Set DICEGAME_METRICS=0 to turn every observation into a no-op.
+REGISTRY = MetricsRegistry(enabled=os.environ.get("DICEGAME_METRICS", "1") != "0")
+
+ACTIONS = REGISTRY.counter("dicegame_actions_total", "Actions applied, by action and outcome")
+EVENTS = REGISTRY.counter("dicegame_events_total", "Engine events recorded, by type")
+GAMES_CREATED = REGISTRY.counter("dicegame_games_created_total", "Games created or reset")
+SESSIONS_EVICTED = REGISTRY.counter(
+    "dicegame_sessions_evicted_total", "Sessions spilled out of memory, by reason"
+)
+SESSIONS_RELOADED = REGISTRY.counter(
+    "dicegame_sessions_reloaded_total", "Spilled sessions loaded back into memory"
+)
+EVENTS_PER_GAME = REGISTRY.histogram(
+    "dicegame_events_per_game",
+    "Events recorded by games that reached game_end",
+    buckets=(50, 100, 200, 400, 800, 1600, 3200),
+)
+APPLY_ACTION_SECONDS = REGISTRY.histogram(
+    "dicegame_apply_action_seconds", "Time spent in store.apply_action"
+)
+GAME_STATE_DTO_SECONDS = REGISTRY.histogram(
+    "dicegame_game_state_dto_seconds", "Time spent building game state DTOs"
+)
+EVENT_TO_DTO_SECONDS = REGISTRY.histogram(
+    "dicegame_event_to_dto_seconds", "Time spent converting engine events to DTOs"
+)
+COMMIT_BATCH_WRITES = REGISTRY.histogram(
+    "dicegame_commit_batch_writes",
+    "Writes grouped into one SQLite commit",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
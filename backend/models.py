@@ -2,12 +2,34 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 RoundStatus = Literal["ACTIVE", "BANKED"]
 
 
+class CachedJSON(BaseModel):
+    """A model that is never mutated after construction, so its JSON is encoded once."""
+
+    _json: Optional[bytes] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes):
+        """Parse ``data`` and keep it as the cached encoding."""
+        model = cls.model_validate_json(data)
+        model.__pydantic_private__["_json"] = data
+        return model
+
+    def json_bytes(self) -> bytes:
+        # Read private storage directly: attribute access on private fields goes
+        # through BaseModel.__getattr__, which costs more than the join it feeds.
+        private = self.__pydantic_private__
+        cached = private["_json"]
+        if cached is None:
+            cached = private["_json"] = self.model_dump_json().encode()
+        return cached
+
+
 class PlayerDTO(BaseModel):
     id: int
     name: str
@@ -25,7 +47,7 @@ class PlayerStatsDTO(BaseModel):
     avg_rolls_elapsed_before_bank: float
 
 
-class GameStateDTO(BaseModel):
+class GameStateDTO(CachedJSON):
     players: List[PlayerDTO]
     stats: List[PlayerStatsDTO]
     round_score: int
@@ -42,13 +64,23 @@ class ValidActionsDTO(BaseModel):
     bankable_player_ids: List[int]
 
 
-class EventDTO(BaseModel):
+class EventDTO(CachedJSON):
     seq: int
     ts_iso: str
     type: str
     payload: Dict[str, Any] = Field(default_factory=dict)
 
 
+class StateDeltaDTO(BaseModel):
+    """Fields that changed since ``base_version``; anything not listed is unchanged."""
+
+    base_version: int
+    # Changed top-level GameStateDTO fields (not players or stats).
+    fields: Dict[str, Any] = Field(default_factory=dict)
+    # One entry per changed player: "id" plus changed PlayerDTO and PlayerStatsDTO fields.
+    players: List[Dict[str, Any]] = Field(default_factory=list)
+
+
 class CreateGameRequest(BaseModel):
     players: List[str]
 
@@ -59,10 +91,48 @@ class BankRequest(BaseModel):
 
 class GameResponse(BaseModel):
     game_id: str
-    state: GameStateDTO
+    # None only when state_delta carries the changes instead.
+    state: Optional[GameStateDTO]
     events: List[EventDTO]
     valid_actions: ValidActionsDTO
     latest_seq: int
+    # Events up to this seq were compacted into the state and cannot be replayed.
+    snapshot_seq: int = 0
+    # True when since_seq fell behind snapshot_seq: replace local events and state.
+    resync_required: bool = False
+    # Bumps on every applied action and reset; the response ETag is derived from it.
+    version: int = 0
+    state_delta: Optional[StateDeltaDTO] = None
+
+
+class RawEvent:
+    """A logged event kept only as its JSON; compacted logs hold these instead of EventDTOs."""
+
+    __slots__ = ("seq", "_json")
+
+    def __init__(self, seq: int, data: bytes) -> None:
+        self.seq = seq
+        self._json = data
+
+    def json_bytes(self) -> bytes:
+        return self._json
+
+    def to_dto(self) -> EventDTO:
+        return EventDTO.from_json_bytes(self._json)
+
+
+def encode_game_response(response: GameResponse) -> bytes:
+    """Serialize ``response``, splicing in the cached JSON of its state and events.
+
+    Only the small scalar fields go through pydantic; ``events`` is placed last.
+    """
+    exclude = {"events"} if response.state is None else {"events", "state"}
+    head = response.model_dump_json(exclude=exclude).encode()
+    parts = [head[:-1]]
+    if response.state is not None:
+        parts += [b',"state":', response.state.json_bytes()]
+    parts += [b',"events":[', b",".join(event.json_bytes() for event in response.events), b"]}"]
+    return b"".join(parts)
 
 
 class ErrorResponse(BaseModel):
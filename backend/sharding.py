@@ -0,0 +1,303 @@
+"""Sharded deployment: games live in owner processes picked by consistent hashing.
+
+Each owner process runs the ordinary backend logic (``backend.main``) over
+its own store and answers requests on a Unix socket. Front-end workers
+(``backend.gateway``) hold no games; they hash the game id to its owner and
+forward the request. Every action on a game is applied by the one process
+that owns it, under that game's lock, so each game keeps a strict order
+while different games use every core.
+
+Messages are length-prefixed: a request is one JSON frame; a reply is a
+JSON header frame (status and HTTP headers) followed by the body frame,
+which owners send already encoded so gateways pass it through untouched.
+
+Run ``python -m backend.sharding run --shards 4 --workers 4`` to start the
+owners and a multi-worker uvicorn gateway in front of them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_REPLICAS = 128
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAME = struct.Struct(">I")
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto nodes.
+
+    Each node sits at ``replicas`` points on the ring, so load is even and
+    adding or removing a node only moves the keys next to its points.
+    """
+
+    def __init__(self, nodes: Sequence[str], replicas: int = DEFAULT_REPLICAS) -> None:
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas)
+        )
+        self.nodes = list(nodes)
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+def frame(data: bytes) -> bytes:
+    return FRAME.pack(len(data)) + data
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return await reader.readexactly(length)
+
+
+@dataclass
+class ShardReply:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class ShardClient:
+    """Forwards requests to shard owners over pooled Unix socket connections.
+
+    A connection carries one request at a time; a request that finds no
+    idle connection to its owner opens another. Create one client per event
+    loop.
+    """
+
+    def __init__(self, paths: Sequence[str], replicas: int = DEFAULT_REPLICAS) -> None:
+        self.paths = list(paths)
+        self.ring = HashRing(self.paths, replicas)
+        self._idle: Dict[str, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {
+            path: [] for path in self.paths
+        }
+
+    def owner(self, game_id: str) -> str:
+        return self.ring.owner(game_id)
+
+    async def request(self, path: str, message: Dict[str, object]) -> ShardReply:
+        idle = self._idle[path]
+        reader, writer = idle.pop() if idle else await asyncio.open_unix_connection(path)
+        try:
+            writer.write(frame(json.dumps(message).encode()))
+            await writer.drain()
+            header = json.loads(await read_frame(reader))
+            body = await read_frame(reader)
+        except BaseException:
+            writer.close()
+            raise
+        idle.append((reader, writer))
+        return ShardReply(header["status"], header["headers"], body)
+
+    async def forward(self, game_id: str, message: Dict[str, object]) -> ShardReply:
+        return await self.request(self.owner(game_id), {**message, "game_id": game_id})
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            while connections:
+                _, writer = connections.pop()
+                writer.close()
+
+
+async def _dispatch(message: Dict[str, object]):
+    """Run one forwarded request through the backend routes; returns a Response."""
+    from fastapi.responses import PlainTextResponse
+
+    from dicegame.actions import Bank, Roll
+
+    from . import main
+    from .metrics import REGISTRY
+
+    op = message["op"]
+    game_id = message.get("game_id")
+    if op == "create":
+        return await asyncio.to_thread(main.new_game, message["players"], game_id)
+    if op == "get":
+        return await main.read_game(
+            game_id,
+            message.get("since_seq"),
+            message.get("wait", 0),
+            message.get("delta", False),
+            message.get("if_none_match"),
+        )
+    if op == "bank":
+        return await asyncio.to_thread(main.apply_action, game_id, Bank(message["player_id"]))
+    if op == "roll":
+        return await asyncio.to_thread(main.apply_action, game_id, Roll())
+    if op == "reset":
+        return await asyncio.to_thread(main.reset, game_id)
+    if op == "metrics":
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+    raise ValueError(f"Unknown op {op!r}")
+
+
+async def _reply(message: Dict[str, object]) -> Tuple[int, Dict[str, str], bytes]:
+    """Run one request; errors become replies so the connection stays usable."""
+    from fastapi import HTTPException
+
+    try:
+        response = await _dispatch(message)
+    except HTTPException as exc:
+        body = json.dumps({"detail": exc.detail}).encode()
+        return exc.status_code, {"content-type": "application/json"}, body
+    except Exception:
+        logger.exception("Shard request %r failed", message.get("op"))
+        body = json.dumps({"detail": "Internal Server Error"}).encode()
+        return 500, {"content-type": "application/json"}, body
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return response.status_code, headers, bytes(response.body)
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                message = json.loads(await read_frame(reader))
+            except asyncio.IncompleteReadError:
+                return
+            status, headers, body = await _reply(message)
+            header = json.dumps({"status": status, "headers": headers}).encode()
+            writer.write(frame(header) + frame(body))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_shard(path: str, store=None) -> None:
+    """Serve the backend over a Unix socket at ``path`` until cancelled."""
+    from . import main
+
+    if store is not None:
+        main.store = store
+    if os.path.exists(path):
+        os.remove(path)
+    server = await asyncio.start_unix_server(_handle_connection, path=path)
+    async with server:
+        await server.serve_forever()
+
+
+def socket_paths(directory: str, shards: int) -> List[str]:
+    return [os.path.join(directory, f"shard-{index}.sock") for index in range(shards)]
+
+
+def wait_for_sockets(
+    paths: Sequence[str], processes: Sequence[subprocess.Popen] = (), timeout: float = 30.0
+) -> None:
+    deadline = time.monotonic() + timeout
+    while not all(os.path.exists(path) for path in paths):
+        if any(process.poll() is not None for process in processes):
+            raise RuntimeError("A shard owner exited during startup")
+        if time.monotonic() >= deadline:
+            raise TimeoutError("Shard owners did not start in time")
+        time.sleep(0.05)
+
+
+def start_owners(
+    directory: str, shards: int, db: Optional[str] = None, archive_dir: Optional[str] = None
+) -> List[subprocess.Popen]:
+    """Launch one owner process per shard.
+
+    With ``db`` each owner gets ``{db}.{index}``, and with ``archive_dir`` it
+    spills evicted sessions to ``{archive_dir}.{index}``.
+    """
+    # Each owner gets its own database and archive; none may open the shared ones.
+    shared = ("DICEGAME_DB", "DICEGAME_ARCHIVE_DIR")
+    env = {key: value for key, value in os.environ.items() if key not in shared}
+    processes = []
+    for index, path in enumerate(socket_paths(directory, shards)):
+        command = [sys.executable, "-m", "backend.sharding", "serve", "--socket", path]
+        if db:
+            command += ["--db", f"{db}.{index}"]
+        if archive_dir:
+            command += ["--archive-dir", f"{archive_dir}.{index}"]
+        processes.append(subprocess.Popen(command, env=env, cwd=ROOT))
+    try:
+        wait_for_sockets(socket_paths(directory, shards), processes)
+    except Exception:
+        for process in processes:
+            process.terminate()
+        raise
+    return processes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.sharding")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run one shard owner")
+    serve.add_argument("--socket", required=True)
+    serve.add_argument("--db", help="SQLite file for this shard (default: in memory)")
+    serve.add_argument("--archive-dir", help="Directory for this shard's evicted sessions")
+    run = commands.add_parser("run", help="Start shard owners and a gateway in front of them")
+    run.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    run.add_argument("--host", default="127.0.0.1")
+    run.add_argument("--port", type=int, default=8000)
+    run.add_argument("--socket-dir", help="Directory for shard sockets (default: a temp dir)")
+    run.add_argument(
+        "--db",
+        default=os.environ.get("DICEGAME_DB"),
+        help="SQLite path prefix; shard i uses PATH.i (default: $DICEGAME_DB)",
+    )
+    run.add_argument(
+        "--archive-dir",
+        default=os.environ.get("DICEGAME_ARCHIVE_DIR"),
+        help="Eviction archive prefix; shard i uses DIR.i (default: $DICEGAME_ARCHIVE_DIR)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        # backend.main builds the owner's store from these when serve_shard imports it.
+        for name, value in (("DICEGAME_DB", args.db), ("DICEGAME_ARCHIVE_DIR", args.archive_dir)):
+            if value:
+                os.environ[name] = value
+        try:
+            asyncio.run(serve_shard(args.socket))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    import uvicorn
+
+    directory = args.socket_dir or tempfile.mkdtemp(prefix="dicegame-shards-")
+    # Shard order fixes the ring; keep --shards and --db stable across restarts.
+    owners = start_owners(directory, args.shards, args.db, args.archive_dir)
+    os.environ["DICEGAME_SHARDS"] = ",".join(socket_paths(directory, args.shards))
+    os.environ.pop("DICEGAME_DB", None)
+    try:
+        uvicorn.run("backend.gateway:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        for process in owners:
+            process.terminate()
+        for process in owners:
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,420 @@
+"""Durable, event-sourced game store on SQLite.
+
+Every applied action is appended with the dice it consumed and the events it
+produced; a game is rebuilt by loading its latest engine snapshot and
+replaying only the actions after it with those dice. The database runs in
+WAL mode and one writer thread commits everything queued while the previous
+commit was in flight, so concurrent games share fsyncs instead of paying one
+per action. Callers still wait for their own commit before returning, but
+outside the game's lock; a game whose commit fails is dropped from memory and
+reloaded from the database on next access.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from dicegame.actions import Bank, Roll
+from dicegame.engine import GameEngine
+from dicegame.types import Dice, FixedDice, RandomDice
+
+from .event_log import DEFAULT_EVENT_RETENTION, EventLog, LoggedEvent, ResyncRequired
+from .metrics import COMMIT_BATCH_WRITES
+from .eviction import EvictionPolicy
+from .models import EventDTO, RawEvent
+from .store import GameSession, InMemoryGameStore, attach_engine
+
+DEFAULT_SNAPSHOT_INTERVAL = 64
+# An action emits at most roll/bank, bust, round_end, match_end and game_end.
+MIN_EVENT_RETENTION = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    players TEXT NOT NULL,
+    base_version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    game_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    rolls TEXT NOT NULL,
+    PRIMARY KEY (game_id, version)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    game_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    engine BLOB NOT NULL
+);
+"""
+
+Statement = Tuple[str, object]
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # FULL syncs the WAL on every commit; group commit keeps that to one fsync per batch.
+    conn.execute("PRAGMA synchronous=FULL")
+    return conn
+
+
+def _encode_action(action: object) -> str:
+    if isinstance(action, Bank):
+        return json.dumps({"type": "bank", "player_id": action.player_id})
+    return json.dumps({"type": "roll"})
+
+
+def _decode_action(text: str) -> object:
+    data = json.loads(text)
+    return Bank(data["player_id"]) if data["type"] == "bank" else Roll()
+
+
+class RecordingDice:
+    """Passes rolls through from ``dice`` and remembers them for the action log."""
+
+    def __init__(self, dice: Dice) -> None:
+        self.dice = dice
+        self.rolls: List[int] = []
+
+    def roll(self) -> int:
+        value = self.dice.roll()
+        self.rolls.append(value)
+        return value
+
+
+class _Write:
+    __slots__ = ("statements", "after", "future")
+
+    def __init__(self, statements: Sequence[Statement], after: Optional[Future]) -> None:
+        self.statements = statements
+        self.after = after
+        self.future: Future = Future()
+
+    def aborted(self) -> bool:
+        after = self.after
+        return after is not None and after.done() and after.exception() is not None
+
+
+class GroupCommitWriter:
+    """One thread owning the write connection.
+
+    Writes submitted while a commit is running are committed together in the
+    next transaction, in submission order. A failed transaction fails every
+    write in it, and a write submitted ``after`` a failed one fails without
+    running.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = _connect(path)
+        self._conn.executescript(SCHEMA)
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, statements: Sequence[Statement], after: Optional[Future] = None) -> Future:
+        """Queue ``(sql, params)`` pairs; a list of param tuples means ``executemany``."""
+        write = _Write(statements, after)
+        self._queue.put(write)
+        return write.future
+
+    def write(self, statements: Sequence[Statement]) -> None:
+        self.submit(statements).result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [write for write in batch if write is not None]
+            if writes:
+                self._commit(writes)
+            if len(writes) < len(batch):
+                self._conn.close()
+                return
+
+    def _commit(self, batch: List[_Write]) -> None:
+        writes: List[_Write] = []
+        # Writes are checked in order, so one aborted write aborts those queued after it too.
+        for write in batch:
+            if write.aborted():
+                write.future.set_exception(RuntimeError("An earlier write of this game failed"))
+            else:
+                writes.append(write)
+        if not writes:
+            return
+        COMMIT_BATCH_WRITES.observe(len(writes))
+        try:
+            with self._conn:
+                for write in writes:
+                    for sql, params in write.statements:
+                        if isinstance(params, list):
+                            self._conn.executemany(sql, params)
+                        else:
+                            self._conn.execute(sql, params)
+        except Exception as exc:
+            for write in writes:
+                write.future.set_exception(exc)
+        else:
+            for write in writes:
+                write.future.set_result(None)
+
+
+class SqliteEventLog(EventLog):
+    """Keeps the newest events in memory and reads older ones from the database.
+
+    Nothing is ever compacted away, so ``snapshot_seq`` stays 0 and clients
+    never need to resync. ``retained`` is still just the in-memory window;
+    only ``since`` reads older events back.
+    """
+
+    def __init__(
+        self,
+        retention: int,
+        load: Callable[[int, int], List[LoggedEvent]],
+        base_seq: int = 0,
+    ) -> None:
+        super().__init__(retention, base_seq)
+        self._load = load
+
+    @property
+    def snapshot_seq(self) -> int:
+        return 0
+
+    def since(self, seq: int) -> List[LoggedEvent]:
+        window = self._base_seq + self._start
+        if seq > self.latest_seq or seq < 0:
+            raise ResyncRequired(0)
+        if seq >= window:
+            return super().since(seq)
+        return self._load(seq, window) + super().retained()
+
+
+class SqliteGameStore(InMemoryGameStore):
+    """``InMemoryGameStore`` that persists every game to SQLite and reloads it on ``get``.
+
+    Sessions are loaded lazily, so a restarted server serves any stored game
+    on first access, and evicting one just drops it from memory: the
+    database already holds everything needed to rebuild it. Only one process
+    may open a database at a time.
+    """
+
+    _spills_to_archive = False
+
+    def __init__(
+        self,
+        path: str,
+        event_retention: int = DEFAULT_EVENT_RETENTION,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        policy: Optional[EvictionPolicy] = None,
+    ) -> None:
+        if event_retention < MIN_EVENT_RETENTION:
+            raise ValueError(f"event_retention must be at least {MIN_EVENT_RETENTION}")
+        super().__init__(event_retention, policy=policy)
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self._writer = GroupCommitWriter(path)
+        self._reader = _connect(path)
+        self._read_lock = threading.Lock()
+        self._since_snapshot: Dict[str, int] = {}
+
+    def close(self) -> None:
+        self._writer.close()
+        self._reader.close()
+
+    def spilled_count(self) -> int:
+        with self._read_lock:
+            (stored,) = self._reader.execute("SELECT COUNT(*) FROM games").fetchone()
+        return max(stored - len(self), 0)
+
+    def create(self, players: List[str], game_id: Optional[str] = None) -> GameSession:
+        if game_id is not None:
+            with self._read_lock:
+                stored = self._reader.execute(
+                    "SELECT 1 FROM games WHERE game_id = ?", (game_id,)
+                ).fetchone()
+            if stored is not None:
+                raise ValueError("Game already exists")
+        session = super().create(players, game_id)
+        with session.lock:
+            future = self._submit(
+                session,
+                [
+                    (
+                        "INSERT INTO games (game_id, players, base_version) VALUES (?, ?, 0)",
+                        (session.game_id, json.dumps(players)),
+                    )
+                ],
+            )
+        self._wait(session, future)
+        return session
+
+    def submit_action(
+        self, game_id: str, action: object
+    ) -> Tuple[List[EventDTO], Callable[[], None]]:
+        with self.locked(game_id) as session:
+            dice: RecordingDice = session.engine.dice
+            dice.rolls.clear()
+            events, _ = super().submit_action(game_id, action)
+            statements: List[Statement] = [
+                (
+                    "INSERT INTO actions (game_id, version, action, rolls) VALUES (?, ?, ?, ?)",
+                    (game_id, session.version, _encode_action(action), json.dumps(dice.rolls)),
+                )
+            ]
+            if events:
+                statements.append(
+                    (
+                        "INSERT INTO events (game_id, seq, body) VALUES (?, ?, ?)",
+                        [(game_id, event.seq, event.json_bytes()) for event in events],
+                    )
+                )
+            pending = self._since_snapshot.get(game_id, 0) + 1
+            if pending >= self.snapshot_interval or (events and session.engine.state.game_over):
+                statements.append(
+                    (
+                        "INSERT OR REPLACE INTO snapshots (game_id, version, engine) "
+                        "VALUES (?, ?, ?)",
+                        (game_id, session.version, session.engine.to_snapshot()),
+                    )
+                )
+                pending = 0
+            self._since_snapshot[game_id] = pending
+            future = self._submit(session, statements)
+        return events, lambda: self._wait(session, future)
+
+    def reset(self, game_id: str) -> GameSession:
+        with self.locked(game_id) as session:
+            super().reset(game_id)
+            self._since_snapshot.pop(game_id, None)
+            future = self._submit(
+                session,
+                [
+                    ("DELETE FROM actions WHERE game_id = ?", (game_id,)),
+                    ("DELETE FROM events WHERE game_id = ?", (game_id,)),
+                    ("DELETE FROM snapshots WHERE game_id = ?", (game_id,)),
+                    (
+                        "UPDATE games SET base_version = ? WHERE game_id = ?",
+                        (session.version, game_id),
+                    ),
+                ],
+            )
+        self._wait(session, future)
+        return session
+
+    def _submit(self, session: GameSession, statements: List[Statement]) -> Future:
+        """Queue a write of ``session``'s after its previous one; call under its lock."""
+        future = self._writer.submit(statements, after=session.last_write)
+        session.last_write = future
+        return future
+
+    def _wait(self, session: GameSession, future: Future) -> None:
+        try:
+            future.result()
+        except Exception:
+            self._discard(session)
+            raise
+
+    def _discard(self, session: GameSession) -> None:
+        """Drop a session that got ahead of the database; ``get`` reloads it from there."""
+        with session.lock:
+            if session.evicted:
+                return
+            session.evicted = True
+            with self._lock:
+                if self._games.get(session.game_id) is session:
+                    del self._games[session.game_id]
+            self._since_snapshot.pop(session.game_id, None)
+
+    def _new_engine(self, players: List[str]) -> GameEngine:
+        engine = super()._new_engine(players)
+        engine.dice = RecordingDice(engine.dice)
+        return engine
+
+    def _new_event_log(self, game_id: str, base_seq: int = 0) -> EventLog:
+        return SqliteEventLog(
+            self.event_retention,
+            lambda after, upto: self._load_events(game_id, after, upto),
+            base_seq,
+        )
+
+    def _spill(self, session: GameSession) -> None:
+        # Actions are waited on outside the game lock, so the last one may still be
+        # committing; dropping the session before it lands would reload a stale game.
+        if session.last_write is not None:
+            wait([session.last_write])
+        self._since_snapshot.pop(session.game_id, None)
+
+    def _load(self, game_id: str) -> GameSession:
+        return self._recover(game_id)
+
+    def _load_events(self, game_id: str, after: int, upto: int) -> List[LoggedEvent]:
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT seq, body FROM events WHERE game_id = ? AND seq > ? AND seq <= ? "
+                "ORDER BY seq",
+                (game_id, after, upto),
+            ).fetchall()
+        return [RawEvent(seq, body) for seq, body in rows]
+
+    def _recover(self, game_id: str) -> GameSession:
+        """Rebuild a session from its latest snapshot plus the actions logged after it."""
+        with self._read_lock:
+            game = self._reader.execute(
+                "SELECT players, base_version FROM games WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            if game is None:
+                raise KeyError("Game not found")
+            players, version = json.loads(game[0]), game[1]
+            snapshot = self._reader.execute(
+                "SELECT version, engine FROM snapshots WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            if snapshot is not None:
+                version = snapshot[0]
+            actions = self._reader.execute(
+                "SELECT version, action, rolls FROM actions "
+                "WHERE game_id = ? AND version > ? ORDER BY version",
+                (game_id, version),
+            ).fetchall()
+            tail = self._reader.execute(
+                "SELECT seq, body FROM events WHERE game_id = ? ORDER BY seq DESC LIMIT ?",
+                (game_id, self.event_retention),
+            ).fetchall()
+
+        if snapshot is not None:
+            engine = GameEngine.from_snapshot(snapshot[1], FixedDice([]))
+        else:
+            engine = GameEngine(players, FixedDice([]))
+        for version, action, rolls in actions:
+            engine.dice = FixedDice(json.loads(rolls))
+            engine.step(_decode_action(action))
+        # The replayed events are already stored; only new ones need recording.
+        engine.event_log.clear()
+        engine.dice = RecordingDice(RandomDice())
+
+        tail.reverse()
+        events = self._new_event_log(game_id, base_seq=tail[0][0] - 1 if tail else 0)
+        for seq, body in tail:
+            events.append(RawEvent(seq, body))
+        session = GameSession(game_id=game_id, engine=engine, events=events, version=version)
+        attach_engine(session, engine)
+        self._since_snapshot[game_id] = len(actions)
+        return session
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .models import GameStateDTO, StateDeltaDTO, ValidActionsDTO
+
+STATE_HISTORY = 8
+
+
+@dataclass
+class StateSnapshot:
+    """The state DTOs for one session version, plus a lazily built plain-dict form."""
+
+    version: int
+    state: GameStateDTO
+    valid_actions: ValidActionsDTO
+    _fields: Optional[Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]] = field(
+        default=None, repr=False
+    )
+
+    def fields(self) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+        """Top-level state fields, and each player's fields merged with their stats."""
+        if self._fields is None:
+            top = self.state.model_dump(exclude={"players", "stats"})
+            players = {
+                player.id: {**player.model_dump(), **stats.model_dump()}
+                for player, stats in zip(self.state.players, self.state.stats)
+            }
+            self._fields = (top, players)
+        return self._fields
+
+
+class StateCache:
+    """Builds a session's state DTOs once per version and keeps a few past versions.
+
+    Every spectator of an unchanged game shares one snapshot, and deltas
+    against a recent version are computed once and reused.
+    """
+
+    def __init__(self, history: int = STATE_HISTORY) -> None:
+        self._snapshots: Deque[StateSnapshot] = deque(maxlen=history)
+        self._deltas: Dict[int, StateDeltaDTO] = {}
+
+    def get(
+        self, version: int, build: Callable[[], Tuple[GameStateDTO, ValidActionsDTO]]
+    ) -> StateSnapshot:
+        if self._snapshots and self._snapshots[-1].version == version:
+            return self._snapshots[-1]
+        state, valid_actions = build()
+        snapshot = StateSnapshot(version, state, valid_actions)
+        self._snapshots.append(snapshot)
+        self._deltas.clear()
+        return snapshot
+
+    def delta(self, base_version: int, current: StateSnapshot) -> Optional[StateDeltaDTO]:
+        """Changes from ``base_version`` to ``current``; None if that version is gone."""
+        cached = self._deltas.get(base_version)
+        if cached is not None:
+            return cached
+        base = next((s for s in self._snapshots if s.version == base_version), None)
+        if base is None or base is current:
+            return None
+        base_top, base_players = base.fields()
+        top, players = current.fields()
+        changed_players = []
+        for player_id, values in players.items():
+            before = base_players.get(player_id, {})
+            changed = {key: value for key, value in values.items() if before.get(key) != value}
+            if changed:
+                changed_players.append({"id": player_id, **changed})
+        delta = StateDeltaDTO(
+            base_version=base_version,
+            fields={key: value for key, value in top.items() if base_top.get(key) != value},
+            players=changed_players,
+        )
+        self._deltas[base_version] = delta
+        return delta
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._deltas.clear()
@@ -1,69 +1,347 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict, List, Protocol
+from typing import Callable, Iterator, List, Optional, Protocol, Tuple
 from uuid import uuid4
 
 from dicegame.actions import Bank, Roll
-from dicegame.engine import GameEngine
+from dicegame.engine import Event, GameEngine
+from dicegame.types import RandomDice
 
-from .adapter import build_engine, event_to_dto
-from .models import EventDTO
+from .adapter import build_engine, event_to_dto, game_state_dto, valid_actions_dto
+from .event_log import DEFAULT_EVENT_RETENTION, EventLog
+from .eviction import ArchivedSession, EvictionPolicy, SessionArchive
+from .metrics import (
+    ACTIONS,
+    APPLY_ACTION_SECONDS,
+    EVENTS,
+    EVENTS_PER_GAME,
+    GAMES_CREATED,
+    SESSIONS_EVICTED,
+    SESSIONS_RELOADED,
+)
+from .models import EventDTO, RawEvent
+from .state_cache import StateCache, StateSnapshot
+
+# Approximate resident cost of a session's state, stats and cached DTOs, and of
+# each event in the engine's own history (measured with tracemalloc, 3 players).
+SESSION_BASE_BYTES = 24_000
+ENGINE_EVENT_BYTES = 300
+# Budgets are rechecked after this many actions, since sessions grow as they play.
+EVICTION_CHECK_INTERVAL = 256
 
 
 @dataclass
 class GameSession:
+    """One game's engine and event log.
+
+    ``lock`` serializes everything that touches the engine or log, so
+    actions on one game apply in order while different games run in
+    parallel. It is reentrant so callers can hold it across an action and
+    the response built from it.
+
+    ``version`` bumps on every applied action and reset; the state DTOs are
+    built at most once per version.
+
+    A session evicted from its store is marked ``evicted`` under its lock
+    and never changes again; the store serves a reloaded copy instead.
+
+    Durable stores keep the session's most recently queued write in
+    ``last_write`` so the next one can depend on it.
+    """
+
     game_id: str
     engine: GameEngine
-    events: List[EventDTO] = field(default_factory=list)
-    latest_seq: int = 0
+    events: EventLog = field(default_factory=EventLog)
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    version: int = 0
+    states: StateCache = field(default_factory=StateCache, repr=False, compare=False)
+    last_used: float = field(default=0.0, compare=False)
+    evicted: bool = field(default=False, compare=False)
+    last_write: Optional[Future] = field(default=None, repr=False, compare=False)
+
+    @property
+    def latest_seq(self) -> int:
+        return self.events.latest_seq
+
+    def approx_bytes(self) -> int:
+        engine_bytes = ENGINE_EVENT_BYTES * len(self.engine.event_log)
+        return SESSION_BASE_BYTES + self.events.nbytes + engine_bytes
+
+    def snapshot(self) -> StateSnapshot:
+        with self.lock:
+            return self.states.get(
+                self.version,
+                lambda: (game_state_dto(self.engine), valid_actions_dto(self.engine)),
+            )
 
 
 class GameStore(Protocol):
     def get(self, game_id: str) -> GameSession:
         ...
 
-    def create(self, players: List[str]) -> GameSession:
+    def locked(self, game_id: str) -> Iterator[GameSession]:
+        ...
+
+    def create(self, players: List[str], game_id: Optional[str] = None) -> GameSession:
         ...
 
     def apply_action(self, game_id: str, action: object) -> List[EventDTO]:
         ...
 
+    def submit_action(
+        self, game_id: str, action: object
+    ) -> Tuple[List[EventDTO], Callable[[], None]]:
+        ...
+
     def reset(self, game_id: str) -> GameSession:
         ...
 
 
+def _record_event(session: GameSession, event: Event) -> None:
+    dto = event_to_dto(session.events.next_seq, event)
+    # Encode once now; every response that includes the event reuses these bytes.
+    dto.json_bytes()
+    session.events.append(dto)
+    EVENTS.inc(type=event.type)
+    if event.type == "game_end":
+        EVENTS_PER_GAME.observe(session.latest_seq)
+
+
+def _already_durable() -> None:
+    pass
+
+
+def _action_name(action: object) -> str:
+    if isinstance(action, Bank):
+        return "bank"
+    if isinstance(action, Roll):
+        return "roll"
+    return "other"
+
+
+def attach_engine(session: GameSession, engine: GameEngine) -> None:
+    """Make ``engine`` the session's engine and record its events as they happen."""
+    session.engine = engine
+    engine.add_observer(lambda event: _record_event(session, event))
+
+
+def compact_session(session: GameSession) -> None:
+    """Drop what a finished game no longer needs: engine history, event models, old states."""
+    session.engine.event_log = []
+    session.events.compact()
+    session.states.clear()
+
+
 class InMemoryGameStore:
-    def __init__(self) -> None:
-        self._games: Dict[str, GameSession] = {}
+    """Sessions kept in memory, least recently used first.
+
+    With an ``EvictionPolicy``, sessions idle past its TTL, and then the
+    least recently used ones while over its session or byte budget, are
+    spilled to ``archive`` and reloaded transparently by ``get``; an enabled
+    policy needs one. Finished games are compacted as soon as they end.
+    """
+
+    # Subclasses that can rebuild evicted sessions themselves need no archive.
+    _spills_to_archive = True
+
+    def __init__(
+        self,
+        event_retention: int = DEFAULT_EVENT_RETENTION,
+        policy: Optional[EvictionPolicy] = None,
+        archive: Optional[SessionArchive] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._games: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.event_retention = event_retention
+        self.policy = policy if policy is not None else EvictionPolicy()
+        if self.policy.enabled and archive is None and self._spills_to_archive:
+            raise ValueError("Eviction needs a SessionArchive to spill sessions to")
+        self.archive = archive
+        self._clock = clock
+        self._actions_since_check = 0
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def spilled_count(self) -> int:
+        return len(self.archive) if self.archive is not None else 0
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            sessions = list(self._games.values())
+        return sum(session.approx_bytes() for session in sessions)
 
     def get(self, game_id: str) -> GameSession:
-        if game_id not in self._games:
-            raise KeyError("Game not found")
-        return self._games[game_id]
+        with self._lock:
+            session = self._games.get(game_id)
+            loaded = session is None
+            if loaded:
+                session = self._load(game_id)
+                self._games[game_id] = session
+                SESSIONS_RELOADED.inc()
+            else:
+                self._games.move_to_end(game_id)
+            session.last_used = self._clock()
+        if loaded:
+            self.evict(keep=game_id)
+        return session
+
+    @contextmanager
+    def locked(self, game_id: str) -> Iterator[GameSession]:
+        """Hold the lock of ``game_id``'s resident session, even if it is evicted meanwhile."""
+        while True:
+            session = self.get(game_id)
+            with session.lock:
+                if not session.evicted:
+                    yield session
+                    return
+
+    def _new_engine(self, players: List[str]) -> GameEngine:
+        return build_engine(players)
 
-    def create(self, players: List[str]) -> GameSession:
-        game_id = str(uuid4())
-        engine = build_engine(players)
-        session = GameSession(game_id=game_id, engine=engine)
-        self._games[game_id] = session
+    def _new_event_log(self, game_id: str) -> EventLog:
+        return EventLog(self.event_retention)
+
+    def create(self, players: List[str], game_id: Optional[str] = None) -> GameSession:
+        """Start a game; ``game_id`` lets a sharding gateway choose ids that route to this store."""
+        game_id = game_id or str(uuid4())
+        engine = self._new_engine(players)
+        session = GameSession(game_id=game_id, engine=engine, events=self._new_event_log(game_id))
+        attach_engine(session, engine)
+        with self._lock:
+            spilled = self.archive is not None and game_id in self.archive
+            if game_id in self._games or spilled:
+                raise ValueError("Game already exists")
+            session.last_used = self._clock()
+            self._games[game_id] = session
+        GAMES_CREATED.inc()
+        self.evict(keep=game_id)
         return session
 
     def apply_action(self, game_id: str, action: object) -> List[EventDTO]:
-        session = self.get(game_id)
-        events = session.engine.step(action)
-        dto_events: List[EventDTO] = []
-        for event in events:
-            session.latest_seq += 1
-            dto = event_to_dto(session.latest_seq, event)
-            session.events.append(dto)
-            dto_events.append(dto)
-        return dto_events
+        events, wait = self.submit_action(game_id, action)
+        wait()
+        return events
+
+    def submit_action(
+        self, game_id: str, action: object
+    ) -> Tuple[List[EventDTO], Callable[[], None]]:
+        """Apply ``action`` without waiting for it to be durable.
+
+        Returns its events and a function that blocks until the action is
+        saved, raising if it could not be. Call that after releasing the
+        game's lock so other actions on the game are not held up meanwhile.
+        """
+        name = _action_name(action)
+        with self.locked(game_id) as session, APPLY_ACTION_SECONDS.time():
+            start = session.latest_seq
+            try:
+                session.engine.step(action)
+            except ValueError:
+                ACTIONS.inc(action=name, outcome="invalid")
+                raise
+            session.version += 1
+            events = session.events.since(max(start, session.events.snapshot_seq))
+            if events and session.engine.state.game_over:
+                compact_session(session)
+        ACTIONS.inc(action=name, outcome="ok")
+        self._actions_since_check += 1
+        if self._actions_since_check >= EVICTION_CHECK_INTERVAL:
+            self._actions_since_check = 0
+            self.evict(keep=game_id)
+        return events, _already_durable
 
     def reset(self, game_id: str) -> GameSession:
-        session = self.get(game_id)
-        players = [player.name for player in session.engine.players]
-        session.engine = build_engine(players)
-        session.events = []
-        session.latest_seq = 0
+        with self.locked(game_id) as session:
+            players = [player.name for player in session.engine.players]
+            session.events = self._new_event_log(game_id)
+            attach_engine(session, self._new_engine(players))
+            session.version += 1
+            session.states.clear()
+        GAMES_CREATED.inc()
+        return session
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Spill idle sessions, then least recently used ones until within budget.
+
+        Sessions whose lock is held elsewhere are skipped, as is ``keep``.
+        Victims are chosen under the store lock but written out after it is
+        released, holding only their own locks, so other games' lookups never
+        wait on the archive. Returns the number of sessions spilled.
+        """
+        policy = self.policy
+        if not policy.enabled:
+            return 0
+        victims: List[Tuple[GameSession, str]] = []
+        with self._lock:
+            now = self._clock()
+            resident = len(self._games)
+            total = 0
+            if policy.max_bytes is not None:
+                total = sum(session.approx_bytes() for session in self._games.values())
+            for game_id, session in list(self._games.items()):
+                if game_id == keep:
+                    continue
+                if policy.idle_ttl is not None and now - session.last_used >= policy.idle_ttl:
+                    reason = "idle"
+                elif policy.max_sessions is not None and resident > policy.max_sessions:
+                    reason = "sessions"
+                elif policy.max_bytes is not None and total > policy.max_bytes:
+                    reason = "bytes"
+                else:
+                    break
+                if not session.lock.acquire(blocking=False):
+                    continue
+                victims.append((session, reason))
+                resident -= 1
+                total -= session.approx_bytes()
+
+        evicted = 0
+        try:
+            while victims:
+                session, reason = victims.pop(0)
+                try:
+                    self._spill(session)
+                    with self._lock:
+                        session.evicted = True
+                        del self._games[session.game_id]
+                finally:
+                    session.lock.release()
+                evicted += 1
+                SESSIONS_EVICTED.inc(reason=reason)
+        finally:
+            for session, _ in victims:
+                session.lock.release()
+        return evicted
+
+    def _spill(self, session: GameSession) -> None:
+        self.archive.save(
+            ArchivedSession(
+                game_id=session.game_id,
+                version=session.version,
+                engine=session.engine.to_snapshot(),
+                snapshot_seq=session.events.snapshot_seq,
+                events=[event.json_bytes() for event in session.events.retained()],
+            )
+        )
+
+    def _load(self, game_id: str) -> GameSession:
+        if self.archive is None:
+            raise KeyError("Game not found")
+        archived = self.archive.pop(game_id)
+        engine = GameEngine.from_snapshot(archived.engine, RandomDice())
+        events = EventLog(self.event_retention, base_seq=archived.snapshot_seq)
+        for seq, data in enumerate(archived.events, start=archived.snapshot_seq + 1):
+            events.append(RawEvent(seq, data))
+        session = GameSession(
+            game_id=game_id, engine=engine, events=events, version=archived.version
+        )
+        attach_engine(session, engine)
         return session
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the engine, simulator and web API.
+
+Run ``python -m benchmarks run --output results.json`` and gate changes with
+``python -m benchmarks compare --baseline baseline.json results.json``.
+"""
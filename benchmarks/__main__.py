@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .suite import SUITES, compare, load, run_suites
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Dice game benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Run benchmarks and write a JSON report")
+    run.add_argument("--output", default="benchmark_results.json")
+    run.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=list(SUITES))
+    run.add_argument("--scale", type=float, default=1.0, help="Multiply workload sizes")
+    run.add_argument("--repeat", type=int, default=3)
+    cmp = sub.add_parser("compare", help="Fail if a report regressed against a baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--baseline", required=True)
+    cmp.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suites(args.suite, scale=args.scale, repeat=args.repeat)
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        for name, metric in report["metrics"].items():
+            print(f"{name}: {metric['value']:.4g} {metric['unit']}")
+        return 0
+
+    regressions = compare(load(args.baseline), load(args.current), args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List
+
+from dicegame.actions import Bank, Roll
+from dicegame.cli import simulate
+from dicegame.engine import GameEngine
+from dicegame.strategies import ThresholdStrategy
+from dicegame.types import BufferedRandomDice
+
+HIGHER = "higher"
+LOWER = "lower"
+
+
+@dataclass
+class Metric:
+    value: float
+    unit: str
+    better: str
+
+
+def _best_rate(work: Callable[[], int], repeat: int) -> float:
+    """Best-of-``repeat`` rate of ``work``, which returns the units it processed."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = work()
+        best = max(best, units / (time.perf_counter() - start))
+    return best
+
+
+def _play_steps(headless: bool, steps: int) -> int:
+    done = 0
+    engine = GameEngine(
+        ["A", "B", "C"], BufferedRandomDice(rng=random.Random(1)), headless=headless
+    )
+    while done < steps:
+        if engine.state.game_over:
+            engine = GameEngine(
+                ["A", "B", "C"], BufferedRandomDice(rng=random.Random(done)), headless=headless
+            )
+        rs = engine.state.round_state
+        if rs.round_score >= 30 and rs.active_mask:
+            engine.step(Bank(next(iter(rs.active_players))))
+        else:
+            engine.step(Roll())
+        done += 1
+    return done
+
+
+def bench_engine(scale: float, repeat: int) -> Dict[str, Metric]:
+    steps = int(50000 * scale)
+    full = _best_rate(lambda: _play_steps(False, steps), repeat)
+    headless = _best_rate(lambda: _play_steps(True, steps), repeat)
+    return {
+        "engine.steps_per_sec": Metric(full, "steps/s", HIGHER),
+        "engine.headless_steps_per_sec": Metric(headless, "steps/s", HIGHER),
+        "engine.headless_speedup": Metric(headless / full, "x", HIGHER),
+    }
+
+
+def bench_simulate(scale: float, repeat: int) -> Dict[str, Metric]:
+    metrics: Dict[str, Metric] = {}
+    games = max(int(400 * scale), 1)
+    for n_players in (2, 3, 6):
+        players = [f"P{i}" for i in range(n_players)]
+        strategies = [ThresholdStrategy(20 + 10 * i) for i in range(n_players)]
+
+        def work() -> int:
+            return simulate(players, strategies, games, seed=1).games
+
+        metrics[f"simulate.games_per_sec.players_{n_players}"] = Metric(
+            _best_rate(work, repeat), "games/s", HIGHER
+        )
+    return metrics
+
+
+def _finished_game_engine() -> GameEngine:
+    engine = GameEngine(["A", "B", "C"], BufferedRandomDice(rng=random.Random(7)))
+    while not engine.state.game_over:
+        rs = engine.state.round_state
+        if rs.round_score >= 25:
+            engine.step(Bank(next(iter(rs.active_players))))
+        else:
+            engine.step(Roll())
+    return engine
+
+
+def bench_serialization(scale: float, repeat: int) -> Dict[str, Metric]:
+    try:
+        from backend.adapter import event_to_dto, game_state_dto, valid_actions_dto
+        from backend.models import GameResponse, encode_game_response
+    except ImportError:
+        return {}
+    engine = _finished_game_engine()
+    events = engine.event_log
+    calls = max(int(2000 * scale), 1)
+    log = [event_to_dto(seq, event) for seq, event in enumerate(events, start=1)]
+    fields = dict(
+        game_id="bench",
+        state=game_state_dto(engine),
+        valid_actions=valid_actions_dto(engine),
+        latest_seq=len(log),
+    )
+
+    def states() -> int:
+        for _ in range(calls):
+            game_state_dto(engine)
+        return calls
+
+    def event_dtos() -> int:
+        for seq, event in enumerate(events, start=1):
+            event_to_dto(seq, event)
+        return len(events)
+
+    # A full GET of a finished 30-round game: validating and dumping every event per
+    # request, versus joining each event's JSON cached when it was logged.
+    def full_log_validated() -> int:
+        for _ in range(calls // 20 or 1):
+            GameResponse(events=log, **fields).model_dump_json()
+        return calls // 20 or 1
+
+    def full_log_cached() -> int:
+        for _ in range(calls // 20 or 1):
+            encode_game_response(GameResponse.model_construct(events=log, **fields))
+        return calls // 20 or 1
+
+    for event in log:
+        event.json_bytes()
+    return {
+        "serialize.game_state_dto_us": Metric(1e6 / _best_rate(states, repeat), "us", LOWER),
+        "serialize.event_to_dto_us": Metric(1e6 / _best_rate(event_dtos, repeat), "us", LOWER),
+        "serialize.full_log_validated_us": Metric(
+            1e6 / _best_rate(full_log_validated, repeat), "us", LOWER
+        ),
+        "serialize.full_log_cached_us": Metric(
+            1e6 / _best_rate(full_log_cached, repeat), "us", LOWER
+        ),
+    }
+
+
+async def _route_latencies(requests: int) -> Dict[str, List[float]]:
+    import httpx
+
+    from backend.main import app
+
+    timings: Dict[str, List[float]] = {}
+
+    async def timed(name: str, call) -> httpx.Response:
+        start = time.perf_counter()
+        response = await call
+        timings.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        return response
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        game_id = None
+        latest_seq = 0
+        for _ in range(requests):
+            if game_id is None:
+                response = await timed(
+                    "create", client.post("/api/games", json={"players": ["A", "B", "C"]})
+                )
+                game_id = response.json()["game_id"]
+                latest_seq = 0
+            response = await timed("get_full", client.get(f"/api/games/{game_id}"))
+            await timed(
+                "get_unchanged",
+                client.get(
+                    f"/api/games/{game_id}", headers={"If-None-Match": response.headers["etag"]}
+                ),
+            )
+            await timed("get_since", client.get(f"/api/games/{game_id}?since_seq={latest_seq}"))
+            response = await timed("roll", client.post(f"/api/games/{game_id}/roll"))
+            body = response.json()
+            if response.status_code == 200 and body["valid_actions"]["bankable_player_ids"]:
+                player_id = body["valid_actions"]["bankable_player_ids"][0]
+                response = await timed(
+                    "bank", client.post(f"/api/games/{game_id}/bank", json={"player_id": player_id})
+                )
+                body = response.json()
+            if response.status_code != 200 or body["state"]["is_game_over"]:
+                game_id = None
+                continue
+            latest_seq = body["latest_seq"]
+    return timings
+
+
+def bench_api(scale: float, repeat: int) -> Dict[str, Metric]:
+    try:
+        import httpx  # noqa: F401
+
+        import backend.main  # noqa: F401
+    except ImportError:
+        return {}
+    timings = asyncio.run(_route_latencies(max(int(300 * scale), 10)))
+    metrics: Dict[str, Metric] = {}
+    for route, samples in sorted(timings.items()):
+        quantiles = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        metrics[f"api.{route}.p50_ms"] = Metric(quantiles[49], "ms", LOWER)
+        metrics[f"api.{route}.p99_ms"] = Metric(quantiles[98], "ms", LOWER)
+    return metrics
+
+
+def _store_actions(store, games: int, actions: int) -> int:
+    game_ids = [store.create(["A", "B", "C"]).game_id for _ in range(games)]
+
+    def play(game_id: str) -> None:
+        done = 0
+        while done < actions:
+            session = store.get(game_id)
+            if session.engine.state.game_over:
+                store.reset(game_id)
+                continue
+            rs = session.engine.state.round_state
+            if rs.round_score >= 25:
+                store.apply_action(game_id, Bank(next(iter(rs.active_players))))
+            else:
+                store.apply_action(game_id, Roll())
+            done += 1
+
+    with ThreadPoolExecutor(max_workers=games) as pool:
+        list(pool.map(play, game_ids))
+    return games * actions
+
+
+def bench_store(scale: float, repeat: int) -> Dict[str, Metric]:
+    """Durable actions per second, alone and with concurrent games sharing commits."""
+    try:
+        from backend.sqlite_store import SqliteGameStore
+    except ImportError:
+        return {}
+    actions = max(int(500 * scale), 10)
+    metrics: Dict[str, Metric] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for games in (1, 16):
+            runs = iter(range(repeat))
+
+            def work() -> int:
+                store = SqliteGameStore(os.path.join(directory, f"{games}-{next(runs)}.db"))
+                try:
+                    return _store_actions(store, games, actions)
+                finally:
+                    store.close()
+
+            metrics[f"store.sqlite_actions_per_sec.games_{games}"] = Metric(
+                _best_rate(work, repeat), "actions/s", HIGHER
+            )
+    return metrics
+
+
+SUITES = {
+    "engine": bench_engine,
+    "simulate": bench_simulate,
+    "serialize": bench_serialization,
+    "api": bench_api,
+    "store": bench_store,
+}
+
+
+def run_suites(names: List[str], scale: float = 1.0, repeat: int = 3) -> Dict[str, object]:
+    metrics: Dict[str, Metric] = {}
+    for name in names:
+        metrics.update(SUITES[name](scale, repeat))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scale": scale,
+            "suites": names,
+        },
+        "metrics": {name: asdict(metric) for name, metric in sorted(metrics.items())},
+    }
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object], tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed past ``tolerance``."""
+    regressions: List[str] = []
+    base_metrics = baseline["metrics"]
+    for name, metric in current["metrics"].items():
+        if name not in base_metrics:
+            continue
+        before = base_metrics[name]["value"]
+        after = metric["value"]
+        if metric["better"] == HIGHER:
+            regressed = after < before * (1 - tolerance)
+        else:
+            regressed = after > before * (1 + tolerance)
+        if regressed:
+            change = (after - before) / before * 100 if before else float("inf")
+            regressions.append(
+                f"{name}: {before:.4g} -> {after:.4g} {metric['unit']} ({change:+.1f}%)"
+            )
+    return regressions
+
+
+def load(path: str) -> Dict[str, object]:
+    with open(path) as handle:
+        return json.load(handle)
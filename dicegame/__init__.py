@@ -1,7 +1,7 @@
 """Dice game engine and CLI simulator."""
 
 from .engine import GameEngine
-from .types import Player, Dice, RandomDice, FixedDice
+from .types import Player, Dice, RandomDice, BufferedRandomDice, FixedDice, TapeDice
 from .actions import Bank, Roll
 
 __all__ = [
@@ -9,7 +9,9 @@ __all__ = [
     "Player",
     "Dice",
     "RandomDice",
+    "BufferedRandomDice",
     "FixedDice",
+    "TapeDice",
     "Bank",
     "Roll",
 ]
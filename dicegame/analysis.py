@@ -0,0 +1,100 @@
+"""Exact round-outcome distributions for the built-in banking policies.
+
+A round is a Markov chain over ``round_score``: a 1 busts, a 2 doubles (or sets
+2 from 0) and 3-6 add. Rolling continues while the player is active, so the
+amount a player banks depends only on the dice and their own stopping rule,
+not on the other players; results are memoized per policy.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
+
+from .strategies import GreedyStrategy, RollLimitStrategy, Strategy, ThresholdStrategy
+
+ROUNDS_PER_GAME = 30
+FACE_PROBABILITY = 1 / 6
+
+
+@dataclass(frozen=True)
+class RoundDistribution:
+    """Probability of each banked amount in one round; busts count as banking 0."""
+
+    outcomes: Dict[int, float]
+    bust_probability: float
+
+    @property
+    def expected_value(self) -> float:
+        return sum(amount * prob for amount, prob in self.outcomes.items())
+
+    @property
+    def expected_game_score(self) -> float:
+        return ROUNDS_PER_GAME * self.expected_value
+
+
+def _next_score(score: int, face: int) -> int:
+    if face == 2:
+        return 2 if score == 0 else score * 2
+    return score + face
+
+
+# A player who never banks is always caught by the round's bust.
+GREEDY_DISTRIBUTION = RoundDistribution(outcomes={0: 1.0}, bust_probability=1.0)
+
+
+@lru_cache(maxsize=None)
+def threshold_distribution(threshold: int) -> RoundDistribution:
+    """Distribution for a player who banks once ``round_score >= threshold``."""
+    if threshold <= 0:
+        return RoundDistribution(outcomes={0: 1.0}, bust_probability=0.0)
+    # Every transition strictly increases the score, so one ascending pass
+    # over the non-terminal scores visits each state after all its parents.
+    reach = [0.0] * threshold
+    reach[0] = 1.0
+    outcomes: Dict[int, float] = {}
+    bust = 0.0
+    for score in range(threshold):
+        mass = reach[score]
+        if not mass:
+            continue
+        step = mass * FACE_PROBABILITY
+        bust += step
+        for face in range(2, 7):
+            target = _next_score(score, face)
+            if target >= threshold:
+                outcomes[target] = outcomes.get(target, 0.0) + step
+            else:
+                reach[target] += step
+    outcomes[0] = outcomes.get(0, 0.0) + bust
+    return RoundDistribution(outcomes=dict(sorted(outcomes.items())), bust_probability=bust)
+
+
+@lru_cache(maxsize=None)
+def roll_limit_distribution(roll_limit: int) -> RoundDistribution:
+    """Distribution for a player who banks once ``roll_limit`` rolls have elapsed."""
+    frontier: Dict[int, float] = {0: 1.0}
+    bust = 0.0
+    for _ in range(max(roll_limit, 0)):
+        following: Dict[int, float] = {}
+        for score, mass in frontier.items():
+            step = mass * FACE_PROBABILITY
+            bust += step
+            for face in range(2, 7):
+                target = _next_score(score, face)
+                following[target] = following.get(target, 0.0) + step
+        frontier = following
+    outcomes = dict(frontier)
+    outcomes[0] = outcomes.get(0, 0.0) + bust
+    return RoundDistribution(outcomes=dict(sorted(outcomes.items())), bust_probability=bust)
+
+
+def round_distribution(strategy: Strategy) -> RoundDistribution:
+    if isinstance(strategy, ThresholdStrategy):
+        return threshold_distribution(strategy.threshold)
+    if isinstance(strategy, RollLimitStrategy):
+        return roll_limit_distribution(strategy.roll_limit)
+    if isinstance(strategy, GreedyStrategy):
+        return GREEDY_DISTRIBUTION
+    raise ValueError(f"No exact distribution for strategy: {strategy!r}")
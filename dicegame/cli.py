@@ -1,13 +1,39 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
-from typing import List
+import contextlib
+import hashlib
+import itertools
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple
 
-from .actions import Bank, Roll
 from .engine import GameEngine
-from .strategies import GreedyStrategy, RollLimitStrategy, ThresholdStrategy, Strategy
-from .types import RandomDice
+from .results import COLUMNS, GameRows, ResultsWriter
+from .rollout import play_to_end
+from .strategies import (
+    BankResolver,
+    GreedyStrategy,
+    LookaheadStrategy,
+    OptimalStrategy,
+    RollLimitStrategy,
+    SeedableStrategy,
+    Strategy,
+    ThresholdStrategy,
+)
+from .types import BufferedRandomDice, Dice
+
+# Games are always split into fixed-size chunks seeded from (seed, chunk index),
+# so a seeded run produces the same result whatever the worker count.
+SCALAR_CHUNK_GAMES = 1000
+BATCH_CHUNK_GAMES = 16384
+Z_95 = 1.96
+# A game takes a few hundred rolls; don't draw a full default buffer per game.
+SINGLE_GAME_DICE_BUFFER = 1024
 
 
 @dataclass
@@ -15,6 +41,19 @@ class SimulationResult:
     totals: List[int]
     wins: List[int]
     games: int
+    score_squares: List[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SimulationChunk:
+    players: List[str]
+    strategies: List[Strategy]
+    games: int
+    seed: int
+    index: int
+    batch: bool = False
+    record: bool = False
+    first_game: int = 0
 
 
 def parse_strategy(spec: str) -> Strategy:
@@ -26,42 +65,332 @@ def parse_strategy(spec: str) -> Strategy:
         return RollLimitStrategy(value)
     if spec == "greedy":
         return GreedyStrategy()
+    if spec == "optimal":
+        return OptimalStrategy.load()
+    if spec.startswith("optimal:"):
+        value = int(spec.split(":", 1)[1])
+        return OptimalStrategy.load(opponent_threshold=value)
+    if spec == "lookahead":
+        return LookaheadStrategy()
+    if spec.startswith("lookahead:"):
+        value = int(spec.split(":", 1)[1])
+        return LookaheadStrategy(time_budget=value / 1000)
     raise ValueError(f"Unknown strategy: {spec}")
 
 
-def run_single_game(players: List[str], strategies: List[Strategy]) -> List[int]:
-    engine = GameEngine(players, RandomDice())
-    while not engine.state.game_over:
-        rs = engine.state.round_state
-        decisions: List[int] = []
-        for pid in range(len(players)):
-            if pid in rs.active_players and strategies[pid].decide_bank(engine.state, pid):
-                decisions.append(pid)
-        for pid in decisions:
-            if engine.state.game_over:
-                break
-            if pid in engine.state.round_state.active_players:
-                engine.step(Bank(pid))
-        if engine.state.game_over:
-            break
-        if not engine.state.round_state.active_players:
+def run_single_game(
+    players: List[str], strategies: List[Strategy], dice: Optional[Dice] = None
+) -> List[int]:
+    if dice is None:
+        dice = BufferedRandomDice(buffer_size=SINGLE_GAME_DICE_BUFFER)
+    engine = GameEngine(players, dice, headless=True)
+    return play_to_end(engine, BankResolver(strategies))
+
+
+def empty_result(n_players: int) -> SimulationResult:
+    return SimulationResult(
+        totals=[0] * n_players, wins=[0] * n_players, games=0, score_squares=[0] * n_players
+    )
+
+
+def record_game(result: SimulationResult, scores: List[int]) -> None:
+    for i, score in enumerate(scores):
+        result.totals[i] += score
+        result.score_squares[i] += score * score
+    max_score = max(scores)
+    for i, score in enumerate(scores):
+        if score == max_score:
+            result.wins[i] += 1
+    result.games += 1
+
+
+def merge_results(results: Iterable[SimulationResult]) -> SimulationResult:
+    merged: Optional[SimulationResult] = None
+    for result in results:
+        if merged is None:
+            merged = SimulationResult(
+                list(result.totals), list(result.wins), result.games, list(result.score_squares)
+            )
             continue
-        engine.step(Roll())
-    return list(engine.state.totals)
+        merged.totals = [a + b for a, b in zip(merged.totals, result.totals)]
+        merged.wins = [a + b for a, b in zip(merged.wins, result.wins)]
+        merged.score_squares = [a + b for a, b in zip(merged.score_squares, result.score_squares)]
+        merged.games += result.games
+    if merged is None:
+        raise ValueError("No results to merge")
+    return merged
+
+
+def confidence_intervals(result: SimulationResult) -> Tuple[List[float], List[float]]:
+    """Return 95% half-widths for each player's win rate and average score."""
+    n = result.games
+    if n < 2:
+        infinite = [math.inf for _ in result.totals]
+        return infinite, list(infinite)
+    win_widths = []
+    score_widths = []
+    for wins, total, squares in zip(result.wins, result.totals, result.score_squares):
+        # Wilson score interval: unlike the normal approximation it does not
+        # collapse to zero width when a player always (or never) wins.
+        rate = wins / n
+        spread = math.sqrt(rate * (1 - rate) / n + Z_95 * Z_95 / (4 * n * n))
+        win_widths.append(Z_95 * spread / (1 + Z_95 * Z_95 / n))
+        mean = total / n
+        variance = max(squares / n - mean * mean, 0.0) * n / (n - 1)
+        score_widths.append(Z_95 * math.sqrt(variance / n))
+    return win_widths, score_widths
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """Derive a stable 64-bit seed for one chunk of a seeded run."""
+    digest = hashlib.sha256(f"{seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def simulate_chunk(chunk: SimulationChunk) -> SimulationResult:
+    return simulate_chunk_rows(chunk)[0]
+
+
+def _empty_rows(chunk: SimulationChunk, chunk_seed: int) -> GameRows:
+    rows: GameRows = {name: [] for name, _, _ in COLUMNS}
+    rows["game"] = range(chunk.first_game, chunk.first_game + chunk.games)
+    rows["chunk_seed"] = [chunk_seed] * chunk.games
+    rows["chunk_game"] = range(chunk.games)
+    return rows
+
+
+def _winner(scores: List[int]) -> int:
+    """The top scorer, or -1 when several tie (the aggregates credit each of them)."""
+    best = max(scores)
+    return -1 if scores.count(best) > 1 else scores.index(best)
+
+
+def simulate_chunk_rows(chunk: SimulationChunk) -> Tuple[SimulationResult, Optional[GameRows]]:
+    """Simulate one chunk; with ``chunk.record`` also return its per-game rows."""
+    chunk_seed = derive_seed(chunk.seed, chunk.index)
+    if chunk.batch:
+        import numpy as np
 
+        from .vectorized import simulate_batch
 
-def simulate(players: List[str], strategies: List[Strategy], games: int) -> SimulationResult:
-    totals = [0 for _ in players]
-    wins = [0 for _ in players]
-    for _ in range(games):
-        scores = run_single_game(players, strategies)
-        for i, score in enumerate(scores):
-            totals[i] += score
-        max_score = max(scores)
-        winners = [i for i, score in enumerate(scores) if score == max_score]
-        for i in winners:
-            wins[i] += 1
-    return SimulationResult(totals=totals, wins=wins, games=games)
+        rows = _empty_rows(chunk, chunk_seed) if chunk.record else None
+        result = simulate_batch(
+            chunk.players,
+            chunk.strategies,
+            chunk.games,
+            rng=np.random.default_rng(chunk_seed),
+            rows=rows,
+        )
+        return result, rows
+    dice = BufferedRandomDice(rng=random.Random(chunk_seed))
+    # Strategies with their own randomness are reseeded per chunk, like the dice.
+    strategies = [
+        strategy.with_seed(derive_seed(chunk_seed, pid))
+        if isinstance(strategy, SeedableStrategy)
+        else strategy
+        for pid, strategy in enumerate(chunk.strategies)
+    ]
+    result = empty_result(len(chunk.players))
+    if not chunk.record:
+        for _ in range(chunk.games):
+            record_game(result, run_single_game(chunk.players, strategies, dice))
+        return result, None
+    rows = _empty_rows(chunk, chunk_seed)
+    resolver = BankResolver(strategies)
+    for _ in range(chunk.games):
+        engine = GameEngine(chunk.players, dice, headless=True, record_stats=True)
+        scores = play_to_end(engine, resolver)
+        record_game(result, scores)
+        rows["winner"].append(_winner(scores))
+        rows["total"].extend(scores)
+        for stats in engine.state.stats:
+            rows["ones_rolled"].append(stats.ones_rolled)
+            rows["voluntary_banks"].append(stats.voluntary_banks_count)
+            rows["forced_zero_banks"].append(stats.forced_zero_banks_count)
+            rows["missed_points"].append(stats.missed_points)
+            rows["rolls_taken_as_roller"].append(stats.rolls_taken_as_roller)
+    return result, rows
+
+
+def iter_chunks(
+    players: List[str],
+    strategies: List[Strategy],
+    games: int,
+    seed: int,
+    batch: bool = False,
+    record: bool = False,
+    first_chunk: int = 0,
+) -> Iterator[SimulationChunk]:
+    size = BATCH_CHUNK_GAMES if batch else SCALAR_CHUNK_GAMES
+    for index, start in enumerate(range(first_chunk * size, games, size), start=first_chunk):
+        yield SimulationChunk(
+            players=list(players),
+            strategies=list(strategies),
+            games=min(size, games - start),
+            seed=seed,
+            index=index,
+            batch=batch,
+            record=record,
+            first_game=start,
+        )
+
+
+def plan_chunks(
+    players: List[str],
+    strategies: List[Strategy],
+    games: int,
+    seed: int,
+    batch: bool = False,
+) -> List[SimulationChunk]:
+    return list(iter_chunks(players, strategies, games, seed, batch))
+
+
+def run_chunks(
+    chunks: Iterable[SimulationChunk],
+    players: List[str],
+    workers: int = 1,
+    done: Optional[Callable[[SimulationResult], bool]] = None,
+    sink: Optional[Callable[[GameRows], None]] = None,
+    initial: Optional[SimulationResult] = None,
+    on_merge: Optional[Callable[[SimulationResult], None]] = None,
+) -> SimulationResult:
+    """Merge chunk results in index order, stopping early once ``done`` returns True.
+
+    Chunks are checked in order even when run in parallel, so the stopping
+    point (and therefore the result) does not depend on the worker count.
+    Recorded per-game rows are passed to ``sink`` in the same order, and
+    ``on_merge`` sees the running result after each chunk. ``initial``
+    continues from an earlier partial result.
+    """
+    result = initial if initial is not None else empty_result(len(players))
+
+    def merge(chunk_result: SimulationResult, rows: Optional[GameRows]) -> SimulationResult:
+        if sink is not None and rows is not None:
+            sink(rows)
+        merged = merge_results([result, chunk_result])
+        if on_merge is not None:
+            on_merge(merged)
+        return merged
+
+    if workers <= 1:
+        for chunk in chunks:
+            result = merge(*simulate_chunk_rows(chunk))
+            if done is not None and done(result):
+                break
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        chunk_iter = iter(chunks)
+        while True:
+            for chunk in itertools.islice(chunk_iter, 2 * workers - len(pending)):
+                pending.append(pool.submit(simulate_chunk_rows, chunk))
+            if not pending:
+                return result
+            result = merge(*pending.popleft().result())
+            if done is not None and done(result):
+                for future in pending:
+                    future.cancel()
+                return result
+
+
+def simulate(
+    players: List[str],
+    strategies: List[Strategy],
+    games: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+) -> SimulationResult:
+    if seed is None:
+        seed = random.getrandbits(63)
+    chunks = iter_chunks(players, strategies, games, seed)
+    return run_chunks(chunks, players, workers)
+
+
+def run_simulation(
+    players: List[str],
+    strategies: List[Strategy],
+    games: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    target_ci: Optional[float] = None,
+    output: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60.0,
+    resume: bool = False,
+) -> SimulationResult:
+    """Simulate with the NumPy batch engine when every strategy supports it.
+
+    With ``target_ci`` set, ``games`` is a budget: chunks run until every
+    player's 95% win-rate half-width is at most ``target_ci``. With ``output``
+    set, per-game rows are streamed to that path (see ``dicegame.results``).
+
+    With ``checkpoint`` set, progress is saved there every
+    ``checkpoint_interval`` seconds; ``resume`` continues from that file and
+    gives the same result as an uninterrupted run.
+    """
+    from .checkpoint import Checkpoint, Checkpointer, load_checkpoint
+    from .vectorized import supports_batch
+
+    batch = supports_batch(strategies)
+    record = output is not None
+    # Built-in strategies are dataclasses, so their repr identifies their parameters.
+    config = {
+        "players": list(players),
+        "strategies": [repr(strategy) for strategy in strategies],
+        "games": games,
+        "batch": batch,
+        "target_ci": target_ci,
+        "output": os.path.abspath(output) if record else None,
+    }
+    state: Optional[Checkpoint] = None
+    if resume:
+        if checkpoint is None:
+            raise ValueError("resume requires a checkpoint path")
+        state = load_checkpoint(checkpoint)
+        if state.config != config or seed not in (None, state.seed):
+            raise ValueError(f"Checkpoint {checkpoint} was written for a different run")
+        if state.complete:
+            return state.result
+        seed = state.seed
+    if seed is None:
+        seed = random.getrandbits(63)
+    if state is None:
+        state = Checkpoint(config, seed, next_chunk=0, result=empty_result(len(players)))
+    chunks = iter_chunks(
+        players, strategies, games, seed, batch=batch, record=record, first_chunk=state.next_chunk
+    )
+    done = None
+    if target_ci is not None:
+
+        def done(result: SimulationResult) -> bool:
+            win_widths, _ = confidence_intervals(result)
+            return max(win_widths) <= target_ci
+
+    with contextlib.ExitStack() as stack:
+        sink = None
+        if record:
+            writer = ResultsWriter(output, players, resume_offset=state.output_offset)
+            sink = stack.enter_context(writer).write_block
+        checkpointer = None
+        if checkpoint is not None:
+            checkpointer = Checkpointer(
+                checkpoint,
+                state,
+                checkpoint_interval,
+                output_offset=writer.flush if record else None,
+            )
+        result = run_chunks(
+            chunks,
+            players,
+            workers,
+            done=done,
+            sink=sink,
+            initial=state.result,
+            on_merge=checkpointer,
+        )
+        if checkpointer is not None:
+            checkpointer.save(complete=True)
+        return result
 
 
 def main() -> None:
@@ -71,6 +400,51 @@ def main() -> None:
     sim.add_argument("--players", nargs="+", required=True)
     sim.add_argument("--strategy", nargs="+", required=True)
     sim.add_argument("--games", type=int, default=1000)
+    sim.add_argument("--workers", type=int, default=1)
+    sim.add_argument("--seed", type=int, default=None)
+    sim.add_argument(
+        "--target-ci",
+        type=float,
+        default=None,
+        help="Stop once every win-rate 95%% half-width is below this; --games becomes the budget",
+    )
+    sim.add_argument(
+        "--output", default=None, help="Stream per-game rows to this columnar results file"
+    )
+    sim.add_argument("--checkpoint", default=None, help="Periodically save progress to this file")
+    sim.add_argument(
+        "--checkpoint-interval", type=float, default=60.0, help="Seconds between checkpoints"
+    )
+    sim.add_argument(
+        "--resume", action="store_true", help="Continue the run saved in --checkpoint"
+    )
+    coordinator = sub.add_parser("coordinator", help="Serve a simulation to remote workers")
+    coordinator.add_argument("--players", nargs="+", required=True)
+    coordinator.add_argument("--strategy", nargs="+", required=True)
+    coordinator.add_argument("--games", type=int, default=1000)
+    coordinator.add_argument("--seed", type=int, default=None)
+    coordinator.add_argument("--host", default="0.0.0.0")
+    coordinator.add_argument("--port", type=int, default=7070)
+    coordinator.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds before an unreturned chunk is handed to another worker",
+    )
+    worker = sub.add_parser("worker", help="Run simulation chunks for a coordinator")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=7070)
+    sweep = sub.add_parser("sweep", help="Rank a grid of strategies on common dice")
+    sweep.add_argument("--players", nargs="+", required=True)
+    sweep.add_argument(
+        "--strategy",
+        nargs="+",
+        required=True,
+        help="One spec per player; ranges like threshold:20..200:10 expand into a grid",
+    )
+    sweep.add_argument("--games", type=int, default=1000)
+    sweep.add_argument("--seed", type=int, default=0)
+    sweep.add_argument("--focus", type=int, default=0, help="Player index to rank cells by")
     args = parser.parse_args()
 
     if args.command == "simulate":
@@ -78,12 +452,60 @@ def main() -> None:
         if len(args.strategy) != len(players):
             raise ValueError("Number of strategies must match number of players")
         strategies = [parse_strategy(s) for s in args.strategy]
-        result = simulate(players, strategies, args.games)
+        result = run_simulation(
+            players,
+            strategies,
+            args.games,
+            seed=args.seed,
+            workers=args.workers,
+            target_ci=args.target_ci,
+            output=args.output,
+            checkpoint=args.checkpoint,
+            checkpoint_interval=args.checkpoint_interval,
+            resume=args.resume,
+        )
         print(f"Games: {result.games}")
+        win_widths, score_widths = confidence_intervals(result)
         for i, name in enumerate(players):
+            win_rate = result.wins[i] / result.games
+            avg_score = result.totals[i] / result.games
+            line = f"{name}: win_rate={win_rate:.3f} avg_score={avg_score:.2f}"
+            if args.target_ci is not None:
+                line += f" win_rate_ci=±{win_widths[i]:.4f} avg_score_ci=±{score_widths[i]:.2f}"
+            print(line)
+    elif args.command == "coordinator":
+        from .cluster import Coordinator
+
+        server = Coordinator(
+            args.players,
+            args.strategy,
+            args.games,
+            seed=args.seed,
+            host=args.host,
+            port=args.port,
+            lease_timeout=args.lease_timeout,
+        )
+        host, port = server.address
+        print(f"Coordinator listening on {host}:{port} (seed {server.seed})", flush=True)
+        result = server.run()
+        print(f"Games: {result.games}")
+        for i, name in enumerate(args.players):
             win_rate = result.wins[i] / result.games
             avg_score = result.totals[i] / result.games
             print(f"{name}: win_rate={win_rate:.3f} avg_score={avg_score:.2f}")
+    elif args.command == "worker":
+        from .cluster import run_worker
+
+        completed = run_worker(args.host, args.port)
+        print(f"Completed {completed} chunks")
+    elif args.command == "sweep":
+        from .sweep import format_sweep, run_sweep
+
+        rows = run_sweep(
+            args.players, args.strategy, args.games, args.seed, parse_strategy, focus=args.focus
+        )
+        print(f"Games per cell: {args.games} (common dice, seed {args.seed})")
+        print(format_sweep(rows))
 
 
 if __name__ == "__main__":
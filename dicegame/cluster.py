@@ -0,0 +1,263 @@
+"""Run one simulation across machines: a coordinator hands out chunks to workers.
+
+The protocol is newline-delimited JSON over TCP. A worker sends ``ready``
+and then, for each ``task`` it receives, a ``result`` carrying the chunk's
+``SimulationResult``; the coordinator answers every message with the next
+``task`` or with ``stop`` once the job is finished.
+
+Tasks are the same seed-indexed chunks ``run_simulation`` uses and results
+are merged in chunk order, so the outcome for a master seed matches a local
+run whatever the number of workers. Chunks held by a worker that disconnects,
+or that are not returned within ``lease_timeout``, go back into the queue;
+late duplicates are ignored, as are results whose shape or game count does
+not fit their chunk.
+
+The coordinator plans chunks for batch play when the strategies allow it,
+and each worker checks for itself that it can: one without NumPy plays its
+chunks with the scalar engine instead (same chunk seeds, but different
+dice, so the merged result then no longer matches a local run exactly).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .cli import (
+    SimulationChunk,
+    SimulationResult,
+    empty_result,
+    iter_chunks,
+    merge_results,
+    parse_strategy,
+    simulate_chunk,
+)
+from .vectorized import supports_batch
+
+DEFAULT_PORT = 7070
+DEFAULT_LEASE_TIMEOUT = 300.0
+WAIT_POLL_SECONDS = 0.5
+
+
+def _send(stream, message: Dict[str, object]) -> None:
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+class Coordinator:
+    """Serve one simulation job to any number of workers and merge their results."""
+
+    def __init__(
+        self,
+        players: List[str],
+        strategy_specs: List[str],
+        games: int,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        lease_timeout: float = DEFAULT_LEASE_TIMEOUT,
+    ) -> None:
+        if len(strategy_specs) != len(players):
+            raise ValueError("Number of strategies must match number of players")
+        self.players = list(players)
+        self.strategy_specs = list(strategy_specs)
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.lease_timeout = lease_timeout
+        strategies = [parse_strategy(spec) for spec in strategy_specs]
+        batch = supports_batch(strategies)
+        self._chunks = {
+            chunk.index: chunk for chunk in iter_chunks(players, [], games, self.seed, batch)
+        }
+        self._pending: Deque[int] = deque(sorted(self._chunks))
+        self._leases: Dict[int, Tuple[object, float]] = {}
+        self._finished: Dict[int, SimulationResult] = {}
+        self._next_merge = 0
+        self._result = empty_result(len(players))
+        self._condition = threading.Condition()
+        self._server = _CoordinatorServer((host, port), _WorkerHandler, self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def done(self) -> bool:
+        return self._next_merge == len(self._chunks)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> SimulationResult:
+        """Block until every chunk is merged, then stop serving and return the result."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.done, timeout=timeout):
+                raise TimeoutError("Simulation did not finish in time")
+        self.close()
+        return self._result
+
+    def run(self) -> SimulationResult:
+        self.start()
+        return self.wait()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def task_message(self, index: int) -> Dict[str, object]:
+        chunk = self._chunks[index]
+        return {
+            "type": "task",
+            "players": self.players,
+            "strategies": self.strategy_specs,
+            "seed": chunk.seed,
+            "index": chunk.index,
+            "games": chunk.games,
+            "first_game": chunk.first_game,
+            "batch": chunk.batch,
+        }
+
+    def assign(self, worker: object) -> Optional[int]:
+        """Lease the next chunk to ``worker``; None once the job is finished."""
+        with self._condition:
+            while True:
+                self._expire_leases()
+                while self._pending and self._is_complete(self._pending[0]):
+                    self._pending.popleft()
+                if self._pending:
+                    index = self._pending.popleft()
+                    self._leases[index] = (worker, time.monotonic())
+                    return index
+                if self.done:
+                    return None
+                self._condition.wait(WAIT_POLL_SECONDS)
+
+    def complete(self, index: int, result: SimulationResult) -> None:
+        self._check_result(index, result)
+        with self._condition:
+            self._leases.pop(index, None)
+            if self._is_complete(index):
+                return
+            self._finished[index] = result
+            while self._next_merge in self._finished:
+                chunk_result = self._finished.pop(self._next_merge)
+                self._result = merge_results([self._result, chunk_result])
+                self._next_merge += 1
+            self._condition.notify_all()
+
+    def release(self, worker: object) -> None:
+        """Requeue every chunk leased to a worker that went away."""
+        with self._condition:
+            for index, (holder, _) in list(self._leases.items()):
+                if holder is worker:
+                    del self._leases[index]
+                    self._pending.appendleft(index)
+            self._condition.notify_all()
+
+    def _check_result(self, index: int, result: SimulationResult) -> None:
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            raise ValueError(f"Unknown chunk {index}")
+        n_players = len(self.players)
+        columns = (result.totals, result.wins, result.score_squares)
+        if any(not isinstance(values, list) or len(values) != n_players for values in columns):
+            raise ValueError(f"Result for chunk {index} does not have one value per player")
+        if result.games != chunk.games or any(
+            not isinstance(value, int) or value < 0 for values in columns for value in values
+        ):
+            raise ValueError(f"Result for chunk {index} does not match its {chunk.games} games")
+        if sum(result.wins) < chunk.games or max(result.wins) > chunk.games:
+            raise ValueError(f"Result for chunk {index} has impossible win counts")
+
+    def _is_complete(self, index: int) -> bool:
+        return index < self._next_merge or index in self._finished
+
+    def _expire_leases(self) -> None:
+        cutoff = time.monotonic() - self.lease_timeout
+        for index, (_, leased_at) in list(self._leases.items()):
+            if leased_at < cutoff:
+                del self._leases[index]
+                self._pending.appendleft(index)
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, coordinator: Coordinator) -> None:
+        self.coordinator = coordinator
+        super().__init__(address, handler)
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator: Coordinator = self.server.coordinator
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message.get("type") == "result":
+                    coordinator.complete(message["index"], SimulationResult(**message["result"]))
+                index = coordinator.assign(self)
+                if index is None:
+                    _send(self.wfile, {"type": "stop"})
+                    return
+                _send(self.wfile, coordinator.task_message(index))
+        except (ConnectionError, ValueError, KeyError, TypeError):
+            return
+        finally:
+            coordinator.release(self)
+
+
+def run_worker(host: str, port: int = DEFAULT_PORT, connect_timeout: float = 30.0) -> int:
+    """Process tasks from a coordinator until it says stop; return the chunks completed."""
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+    completed = 0
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            completed = _serve_tasks(stream)
+        except (BrokenPipeError, ConnectionResetError):
+            # The coordinator finished (or died) while this worker was busy.
+            pass
+    return completed
+
+
+def _serve_tasks(stream) -> int:
+    completed = 0
+    strategies_cache: Dict[Tuple[str, ...], list] = {}
+    _send(stream, {"type": "ready"})
+    for line in stream:
+        message = json.loads(line)
+        if message["type"] == "stop":
+            break
+        specs = tuple(message["strategies"])
+        if specs not in strategies_cache:
+            strategies_cache[specs] = [parse_strategy(spec) for spec in specs]
+        chunk = SimulationChunk(
+            players=message["players"],
+            strategies=strategies_cache[specs],
+            games=message["games"],
+            seed=message["seed"],
+            index=message["index"],
+            batch=message["batch"] and supports_batch(strategies_cache[specs]),
+            first_game=message["first_game"],
+        )
+        result = simulate_chunk(chunk)
+        _send(stream, {"type": "result", "index": chunk.index, "result": asdict(result)})
+        completed += 1
+    return completed
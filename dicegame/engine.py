@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Sequence
+import json
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Optional, Sequence
 
 from .actions import Bank, Roll
 from .state import GameState, RoundState
-from .stats import PlayerStats, PlayerStatsDelta, diff_stats
+from .stats import PlayerStats, PlayerStatsDelta, RunningStat, diff_stats
 from .types import Dice, Player
 
+SNAPSHOT_VERSION = 1
+
 
 @dataclass
 class Event:
@@ -25,15 +28,98 @@ class MatchSummary:
     stats_deltas: List[PlayerStatsDelta]
 
 
+EventObserver = Callable[[Event], None]
+
+
+# Snapshots walk these field lists directly; ``dataclasses.asdict`` deep-copies
+# every value and made spilling a session several times slower.
+_ROUND_STATE_FIELDS = tuple(f.name for f in fields(RoundState))
+_RUNNING_STAT_FIELDS = tuple(f.name for f in fields(RunningStat))
+_STATS_FIELDS = tuple(f.name for f in fields(PlayerStats))
+_STATS_HISTOGRAMS = ("voluntary_bank_amounts", "rolls_elapsed_before_voluntary_bank")
+_SUMMARY_FIELDS = tuple(f.name for f in fields(MatchSummary))
+
+
+def _encode_stats(stats) -> Dict[str, object]:
+    data = {name: getattr(stats, name) for name in _STATS_FIELDS}
+    for name in _STATS_HISTOGRAMS:
+        stat = data[name]
+        data[name] = {field: getattr(stat, field) for field in _RUNNING_STAT_FIELDS}
+    return data
+
+
+def _encode_summary(summary: MatchSummary) -> Dict[str, object]:
+    data = {name: getattr(summary, name) for name in _SUMMARY_FIELDS}
+    data["stats_deltas"] = [_encode_stats(delta) for delta in summary.stats_deltas]
+    return data
+
+
+def _encode_state(state: GameState) -> Dict[str, object]:
+    rs = state.round_state
+    return {
+        "players": [{"id": player.id, "name": player.name} for player in state.players],
+        "totals": state.totals,
+        "stats": [_encode_stats(stats) for stats in state.stats],
+        "round_state": {name: getattr(rs, name) for name in _ROUND_STATE_FIELDS},
+        "match_summaries": [_encode_summary(summary) for summary in state.match_summaries],
+        "game_over": state.game_over,
+    }
+
+
+def _decode_running_stat(data: Dict[str, object]) -> RunningStat:
+    return RunningStat(**{**data, "edges": tuple(data["edges"])})
+
+
+def _decode_stats(cls, data: Dict[str, object]):
+    return cls(
+        **{
+            **data,
+            **{name: _decode_running_stat(data[name]) for name in _STATS_HISTOGRAMS},
+        }
+    )
+
+
+def _decode_summary(data: Dict[str, object]) -> MatchSummary:
+    return MatchSummary(
+        **{
+            **data,
+            "stats_deltas": [
+                _decode_stats(PlayerStatsDelta, delta) for delta in data["stats_deltas"]
+            ],
+        }
+    )
+
+
 class GameEngine:
-    """Pure step-based game engine."""
+    """Pure step-based game engine.
+
+    With ``headless=True`` the engine applies the same rules but builds no
+    events and skips match summaries, so ``step`` always returns an empty
+    list and memory stays constant per game. ``record_stats`` (default: not
+    headless) controls the ``PlayerStats`` counters and histograms; headless
+    engines leave them untouched unless asked to keep them.
 
-    def __init__(self, players: Sequence[str], dice: Dice):
+    Observers added with ``add_observer`` are called with every event as it
+    is appended to ``event_log``, including round, match and game ends that
+    ``step`` does not return. Headless engines have no events to observe.
+    """
+
+    def __init__(
+        self,
+        players: Sequence[str],
+        dice: Dice,
+        headless: bool = False,
+        record_stats: Optional[bool] = None,
+    ):
         if len(players) < 2:
             raise ValueError("At least two players required")
         self.players: List[Player] = [Player(i, name) for i, name in enumerate(players)]
         self.dice = dice
+        self.headless = headless
+        self.record_stats = not headless if record_stats is None else record_stats
+        self._all_players_mask = (1 << len(self.players)) - 1
         self.event_log: List[Event] = []
+        self.observers: List[EventObserver] = []
         self.state = GameState(
             players=self.players,
             totals=[0 for _ in self.players],
@@ -42,21 +128,126 @@ class GameEngine:
                 round_index=1,
                 match_index=1,
                 round_score=0,
-                active_players=set(range(len(self.players))),
+                active_mask=self._all_players_mask,
                 roller_index=0,
                 starter_index=0,
                 rolls_elapsed_in_round=0,
             ),
         )
-        self._match_start_stats = [s.snapshot() for s in self.state.stats]
-        self._match_start_totals = list(self.state.totals)
+        self._match_start_stats: List[PlayerStats] = []
+        self._match_start_totals: List[int] = []
+        if not headless:
+            self._match_start_stats = [s.snapshot() for s in self.state.stats]
+            self._match_start_totals = list(self.state.totals)
+
+    @classmethod
+    def from_state(
+        cls,
+        state: GameState,
+        dice: Dice,
+        headless: bool = True,
+        record_stats: Optional[bool] = None,
+    ) -> "GameEngine":
+        """Return an engine that continues from a copy of ``state`` without its history."""
+        engine = cls.__new__(cls)
+        engine.players = state.players
+        engine.dice = dice
+        engine.headless = headless
+        engine.record_stats = not headless if record_stats is None else record_stats
+        engine._all_players_mask = (1 << len(state.players)) - 1
+        engine.event_log = []
+        engine.observers = []
+        rs = state.round_state
+        engine.state = GameState(
+            players=state.players,
+            totals=list(state.totals),
+            stats=[s.snapshot() for s in state.stats],
+            round_state=RoundState(
+                round_index=rs.round_index,
+                match_index=rs.match_index,
+                round_score=rs.round_score,
+                active_mask=rs.active_mask,
+                roller_index=rs.roller_index,
+                starter_index=rs.starter_index,
+                rolls_elapsed_in_round=rs.rolls_elapsed_in_round,
+            ),
+            match_summaries=list(state.match_summaries),
+            game_over=state.game_over,
+        )
+        engine._match_start_stats = []
+        engine._match_start_totals = []
+        return engine
+
+    def fork(self, dice: Optional[Dice] = None, record_events: bool = False) -> "GameEngine":
+        """Copy the mutable game state into a new engine.
+
+        History is shared rather than deep-copied: match summaries and
+        match-start snapshots are never mutated once created. By default the
+        fork is headless and shares this engine's dice; pass ``dice`` for an
+        independent rollout. A headless engine has no match-start snapshots
+        to build summaries from, so it cannot fork with ``record_events``.
+        """
+        if record_events and self.headless:
+            raise ValueError("Headless engines cannot fork with record_events")
+        engine = GameEngine.from_state(
+            self.state, dice if dice is not None else self.dice, headless=not record_events
+        )
+        if record_events:
+            engine.event_log = list(self.event_log)
+        engine._match_start_stats = self._match_start_stats
+        engine._match_start_totals = self._match_start_totals
+        return engine
+
+    def to_snapshot(self) -> bytes:
+        """Encode the game state and match bookkeeping as versioned JSON.
+
+        Dice, events and observers are not included.
+        """
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "state": _encode_state(self.state),
+            "match_start_stats": [_encode_stats(stats) for stats in self._match_start_stats],
+            "match_start_totals": self._match_start_totals,
+        }
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_snapshot(cls, data: bytes, dice: Dice) -> "GameEngine":
+        """Rebuild an engine from ``to_snapshot`` output."""
+        payload = json.loads(data)
+        if payload.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported engine snapshot version")
+        state = payload["state"]
+        engine = cls.from_state(
+            GameState(
+                players=[Player(**player) for player in state["players"]],
+                totals=list(state["totals"]),
+                stats=[_decode_stats(PlayerStats, stats) for stats in state["stats"]],
+                round_state=RoundState(**state["round_state"]),
+                match_summaries=[_decode_summary(summary) for summary in state["match_summaries"]],
+                game_over=state["game_over"],
+            ),
+            dice,
+            headless=False,
+        )
+        engine._match_start_stats = [
+            _decode_stats(PlayerStats, stats) for stats in payload["match_start_stats"]
+        ]
+        engine._match_start_totals = list(payload["match_start_totals"])
+        return engine
+
+    def add_observer(self, observer: EventObserver) -> None:
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: EventObserver) -> None:
+        self.observers.remove(observer)
 
     def valid_actions(self) -> List[object]:
         if self.state.game_over:
             return []
-        if not self.state.round_state.active_players:
+        if not self.state.round_state.active_mask:
             return []
-        actions: List[object] = [Bank(pid) for pid in sorted(self.state.round_state.active_players)]
+        actions: List[object] = [Bank(pid) for pid in self.state.round_state.active_players]
         actions.append(Roll())
         return actions
 
@@ -71,15 +262,19 @@ class GameEngine:
 
     def _handle_bank(self, action: Bank) -> List[Event]:
         rs = self.state.round_state
-        if action.player_id not in rs.active_players:
+        bit = 1 << action.player_id
+        if action.player_id < 0 or not rs.active_mask & bit:
             raise ValueError("Player is not active")
         amount = rs.round_score
-        rs.active_players.remove(action.player_id)
+        rs.active_mask ^= bit
         self.state.totals[action.player_id] += amount
-        stats = self.state.stats[action.player_id]
-        stats.voluntary_banks_count += 1
-        stats.voluntary_bank_amounts.append(amount)
-        stats.rolls_elapsed_before_voluntary_bank.append(rs.rolls_elapsed_in_round)
+        if self.record_stats:
+            stats = self.state.stats[action.player_id]
+            stats.record_voluntary_bank(amount, rs.rolls_elapsed_in_round)
+        if self.headless:
+            if not rs.active_mask:
+                self._end_round(reason="all_bank")
+            return []
         event = Event(
             type="bank",
             data={
@@ -91,26 +286,34 @@ class GameEngine:
             },
         )
         self._append_event(event)
-        if not rs.active_players:
+        if not rs.active_mask:
             self._end_round(reason="all_bank")
         return [event]
 
     def _handle_roll(self) -> List[Event]:
         rs = self.state.round_state
-        if not rs.active_players:
+        if not rs.active_mask:
             raise ValueError("No active players to roll")
-        if rs.roller_index not in rs.active_players:
+        if not rs.active_mask >> rs.roller_index & 1:
             rs.roller_index = self._next_active_index(rs.roller_index)
         roller_id = rs.roller_index
-        self.state.stats[roller_id].rolls_taken_as_roller += 1
         die = self.dice.roll()
         round_score_before = rs.round_score
         events: List[Event] = []
+        if self.record_stats:
+            stats = self.state.stats
+            stats[roller_id].rolls_taken_as_roller += 1
+            if die == 1:
+                stats[roller_id].ones_rolled += 1
+                for pid in rs.active_players:
+                    stats[pid].forced_zero_banks_count += 1
+                    stats[pid].missed_points += round_score_before
         if die == 1:
-            self.state.stats[roller_id].ones_rolled += 1
-            for pid in rs.active_players:
-                self.state.stats[pid].forced_zero_banks_count += 1
-                self.state.stats[pid].missed_points += round_score_before
+            if self.headless:
+                rs.round_score = 0
+                rs.rolls_elapsed_in_round += 1
+                self._end_round(reason="bust")
+                return []
             roll_event = Event(
                 type="roll",
                 data={
@@ -125,7 +328,7 @@ class GameEngine:
                 data={
                     "player_id": roller_id,
                     "round_score_before": round_score_before,
-                    "affected_players": sorted(rs.active_players),
+                    "affected_players": list(rs.active_players),
                 },
             )
             self._append_event(roll_event)
@@ -141,6 +344,8 @@ class GameEngine:
         else:
             rs.round_score += die
         rs.rolls_elapsed_in_round += 1
+        if self.headless:
+            return []
         roll_event = Event(
             type="roll",
             data={
@@ -155,28 +360,32 @@ class GameEngine:
         return events
 
     def _next_active_index(self, start_index: int) -> int:
-        n = self.state.n_players
-        for offset in range(1, n + 1):
-            idx = (start_index + offset) % n
-            if idx in self.state.round_state.active_players:
-                return idx
-        raise ValueError("No active players")
+        mask = self.state.round_state.active_mask
+        if not mask:
+            raise ValueError("No active players")
+        # First active player after start_index, wrapping to the lowest active id.
+        higher = mask >> (start_index + 1) << (start_index + 1)
+        candidates = higher or mask
+        return (candidates & -candidates).bit_length() - 1
 
     def _end_round(self, reason: str) -> None:
         rs = self.state.round_state
-        round_end_event = Event(
-            type="round_end",
-            data={
-                "round_index": rs.round_index,
-                "reason": reason,
-                "totals": list(self.state.totals),
-            },
-        )
-        self._append_event(round_end_event)
-        if rs.round_index % 10 == 0:
-            self._end_match(rs.match_index)
+        if not self.headless:
+            round_end_event = Event(
+                type="round_end",
+                data={
+                    "round_index": rs.round_index,
+                    "reason": reason,
+                    "totals": list(self.state.totals),
+                },
+            )
+            self._append_event(round_end_event)
+            if rs.round_index % 10 == 0:
+                self._end_match(rs.match_index)
         if rs.round_index >= 30:
             self.state.game_over = True
+            if self.headless:
+                return
             game_end_event = Event(
                 type="game_end",
                 data={
@@ -185,18 +394,14 @@ class GameEngine:
             )
             self._append_event(game_end_event)
             return
-        next_round_index = rs.round_index + 1
         next_starter_index = (rs.starter_index + 1) % self.state.n_players
-        next_match_index = (next_round_index - 1) // 10 + 1
-        self.state.round_state = RoundState(
-            round_index=next_round_index,
-            match_index=next_match_index,
-            round_score=0,
-            active_players=set(range(self.state.n_players)),
-            roller_index=next_starter_index,
-            starter_index=next_starter_index,
-            rolls_elapsed_in_round=0,
-        )
+        rs.round_index += 1
+        rs.match_index = (rs.round_index - 1) // 10 + 1
+        rs.round_score = 0
+        rs.active_mask = self._all_players_mask
+        rs.roller_index = next_starter_index
+        rs.starter_index = next_starter_index
+        rs.rolls_elapsed_in_round = 0
 
     def _end_match(self, match_index: int) -> None:
         stats_deltas = [
@@ -229,6 +434,8 @@ class GameEngine:
 
     def _append_event(self, event: Event) -> None:
         self.event_log.append(event)
+        for observer in self.observers:
+            observer(event)
 
     def greediest_players(self) -> tuple[Player, Player]:
         by_avg_bank = self._max_by(
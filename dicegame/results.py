@@ -0,0 +1,219 @@
+"""Per-game simulation rows in a chunked, memory-mappable columnar file.
+
+Layout (all integers little-endian)::
+
+    b"DGRS" | u32 version | u32 header length | JSON header | pad to 8 bytes
+    repeated blocks:
+        b"BLCK" | u32 rows
+        one array per column in ``COLUMNS`` order, each padded to 8 bytes
+
+The header lists the players and the columns with their array typecodes.
+Per-player columns hold ``rows x players`` values in row-major order. Blocks
+are appended as simulation chunks finish, so the writer needs memory for
+one chunk only. Readers find blocks by skipping over fixed-size columns and
+never parse rows one at a time.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+MAGIC = b"DGRS"
+BLOCK_MAGIC = b"BLCK"
+VERSION = 2
+ALIGNMENT = 8
+
+# (name, array typecode, one value per player). Games in a chunk share one dice
+# stream, so a game replays from its chunk's seed by playing ``chunk_game``
+# games before it. ``winner`` is -1 for a tie.
+COLUMNS: Tuple[Tuple[str, str, bool], ...] = (
+    ("game", "q", False),
+    ("chunk_seed", "Q", False),
+    ("chunk_game", "i", False),
+    ("winner", "b", False),
+    ("total", "q", True),
+    ("ones_rolled", "i", True),
+    ("voluntary_banks", "i", True),
+    ("forced_zero_banks", "i", True),
+    ("missed_points", "q", True),
+    ("rolls_taken_as_roller", "i", True),
+)
+STAT_COLUMNS = tuple(name for name, _, per_player in COLUMNS if per_player and name != "total")
+_NUMPY_DTYPES = {"q": "<i8", "Q": "<u8", "b": "i1", "i": "<i4"}
+
+GameRows = Dict[str, Sequence[int]]
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _column_bytes(values, typecode: str) -> bytes:
+    if np is not None and isinstance(values, np.ndarray):
+        return np.ascontiguousarray(values, dtype=_NUMPY_DTYPES[typecode]).tobytes()
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+class ResultsWriter:
+    """Append blocks of per-game rows to a results file.
+
+    ``resume_offset`` reopens an existing file, dropping anything written
+    after that offset (as returned by ``flush``) before appending.
+    """
+
+    def __init__(
+        self, path: str, players: Sequence[str], resume_offset: Optional[int] = None
+    ) -> None:
+        self.players = list(players)
+        self.games = 0
+        if resume_offset is not None:
+            self._handle = open(path, "r+b")
+            self._handle.truncate(resume_offset)
+            self._handle.seek(resume_offset)
+            return
+        header = json.dumps(
+            {"players": self.players, "columns": [list(column) for column in COLUMNS]}
+        ).encode()
+        self._handle = open(path, "wb")
+        prefix = MAGIC + struct.pack("<II", VERSION, len(header)) + header
+        self._handle.write(prefix + b"\0" * _padding(len(prefix)))
+
+    def write_block(self, rows: GameRows) -> None:
+        """Write one block; per-player columns are flattened row by row."""
+        count = len(rows["game"])
+        if not count:
+            return
+        parts = [BLOCK_MAGIC, struct.pack("<I", count)]
+        for name, typecode, per_player in COLUMNS:
+            data = _column_bytes(rows[name], typecode)
+            expected = count * (len(self.players) if per_player else 1) * array(typecode).itemsize
+            if len(data) != expected:
+                raise ValueError(f"Column {name} has the wrong number of values")
+            parts.append(data)
+            parts.append(b"\0" * _padding(len(data)))
+        self._handle.write(b"".join(parts))
+        self.games += count
+
+    def flush(self) -> int:
+        """Flush written blocks to disk and return the file offset after them."""
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        return self._handle.tell()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class ResultsSummary:
+    games: int
+    avg_total: List[float]
+    win_rate: List[float]
+    stat_totals: Dict[str, List[int]]
+
+
+class ResultsFile:
+    """Memory-mapped reader yielding NumPy views over each block's columns."""
+
+    def __init__(self, path: str) -> None:
+        if np is None:
+            raise RuntimeError("ResultsFile requires numpy")
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:4] != MAGIC:
+            raise ValueError(f"Not a results file: {path}")
+        version, header_length = struct.unpack_from("<II", self._mmap, 4)
+        if version != VERSION:
+            raise ValueError(f"Unsupported results version: {version}")
+        header = json.loads(self._mmap[12 : 12 + header_length])
+        self.players: List[str] = header["players"]
+        self.columns = [tuple(column) for column in header["columns"]]
+        self._blocks = self._index_blocks(12 + header_length + _padding(12 + header_length))
+
+    def _index_blocks(self, offset: int) -> List[Tuple[int, int]]:
+        blocks: List[Tuple[int, int]] = []
+        size = len(self._mmap)
+        while offset < size:
+            if self._mmap[offset : offset + 4] != BLOCK_MAGIC:
+                raise ValueError(f"Corrupt block at offset {offset}")
+            (rows,) = struct.unpack_from("<I", self._mmap, offset + 4)
+            blocks.append((offset + 8, rows))
+            offset += 8
+            for _, typecode, per_player in self.columns:
+                width = len(self.players) if per_player else 1
+                length = rows * width * np.dtype(_NUMPY_DTYPES[typecode]).itemsize
+                offset += length + _padding(length)
+        return blocks
+
+    @property
+    def games(self) -> int:
+        return sum(rows for _, rows in self._blocks)
+
+    def blocks(self) -> Iterator[Dict[str, "np.ndarray"]]:
+        n_players = len(self.players)
+        for offset, rows in self._blocks:
+            block = {}
+            for name, typecode, per_player in self.columns:
+                dtype = np.dtype(_NUMPY_DTYPES[typecode])
+                width = n_players if per_player else 1
+                values = np.frombuffer(self._mmap, dtype=dtype, count=rows * width, offset=offset)
+                block[name] = values.reshape(rows, width) if per_player else values
+                length = rows * width * dtype.itemsize
+                offset += length + _padding(length)
+            yield block
+
+    def column(self, name: str) -> "np.ndarray":
+        """Concatenate one column across blocks (copies; prefer ``blocks`` for huge files)."""
+        return np.concatenate([block[name] for block in self.blocks()])
+
+    def summary(self) -> ResultsSummary:
+        """Aggregate block by block; ties count as wins for every tied player."""
+        n_players = len(self.players)
+        games = 0
+        totals = np.zeros(n_players, dtype=np.float64)
+        wins = np.zeros(n_players, dtype=np.int64)
+        stat_totals = {name: np.zeros(n_players, dtype=np.int64) for name in STAT_COLUMNS}
+        for block in self.blocks():
+            scores = block["total"]
+            games += scores.shape[0]
+            totals += scores.sum(axis=0)
+            wins += (scores == scores.max(axis=1, keepdims=True)).sum(axis=0)
+            for name in STAT_COLUMNS:
+                stat_totals[name] += block[name].sum(axis=0)
+        divisor = max(games, 1)
+        return ResultsSummary(
+            games=games,
+            avg_total=(totals / divisor).tolist(),
+            win_rate=(wins / divisor).tolist(),
+            stat_totals={name: values.tolist() for name, values in stat_totals.items()},
+        )
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "ResultsFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
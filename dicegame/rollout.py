@@ -0,0 +1,41 @@
+"""Shared game loop for simulations and lookahead rollouts."""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from .actions import Bank, Roll
+from .engine import GameEngine
+from .state import GameState
+
+BankDecider = Callable[[GameState], int]
+
+
+def play_to_end(
+    engine: GameEngine, resolve_banks: BankDecider, last_round: Optional[int] = None
+) -> List[int]:
+    """Play ``engine`` to game over, or until round ``last_round`` closes, and return the totals.
+
+    ``resolve_banks`` returns the bitmask of players banking in each pre-roll
+    window (see ``dicegame.strategies.BankResolver``); banks are applied in
+    player order, then the current roller rolls.
+    """
+    state = engine.state
+    banks = [Bank(pid) for pid in range(state.n_players)]
+    roll = Roll()
+    rs = state.round_state
+    while not state.game_over and (last_round is None or rs.round_index <= last_round):
+        decisions = resolve_banks(state)
+        while decisions:
+            lowest = decisions & -decisions
+            decisions ^= lowest
+            if state.game_over:
+                break
+            if state.round_state.active_mask & lowest:
+                engine.step(banks[lowest.bit_length() - 1])
+        if state.game_over:
+            break
+        if not state.round_state.active_mask:
+            continue
+        engine.step(roll)
+    return list(state.totals)
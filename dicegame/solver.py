@@ -0,0 +1,148 @@
+"""Value iteration for a win-maximizing banking policy.
+
+The solver computes a best response against a field of opponents who all bank
+at a reference threshold. Opponents sharing a threshold bank identically in
+every round, so the leader keeps the lead and the game reduces to the state
+(round_index, diff to the leading opponent, round_score, opponents active).
+That makes one table valid for any player count.
+
+Tables are stored as ``.npy`` files of shape
+``(2, ROUNDS_PER_GAME, 2 * max_diff + 1, max_score + 1)`` holding 1 where the
+player should bank; index 0 of the first axis means every opponent has banked.
+Diffs are clamped to ``±max_diff`` and scores above ``max_score`` always bank.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+ROUNDS_PER_GAME = 30
+DEFAULT_OPPONENT_THRESHOLD = 100
+DEFAULT_MAX_DIFF = 600
+DEFAULT_MAX_SCORE = 400
+FACES = (2, 3, 4, 5, 6)
+MARGIN_WEIGHT = 1e-3
+
+
+def _next_score(score: int, face: int) -> int:
+    if face == 2:
+        return 2 if score == 0 else score * 2
+    return score + face
+
+
+def solve_policy(
+    opponent_threshold: int = DEFAULT_OPPONENT_THRESHOLD,
+    max_diff: int = DEFAULT_MAX_DIFF,
+    max_score: int = DEFAULT_MAX_SCORE,
+):
+    """Return the bank/roll decision table as a uint8 array."""
+    if np is None:
+        raise RuntimeError("solve_policy requires numpy")
+    if not 0 < opponent_threshold <= max_score:
+        raise ValueError("opponent_threshold must be in 1..max_score")
+    n_diff = 2 * max_diff + 1
+    n_score = max_score + 1
+    base = np.arange(n_diff)
+    table = np.zeros((2, ROUNDS_PER_GAME, n_diff, n_score), dtype=np.uint8)
+
+    def shifted(values, offset: int):
+        return values[np.clip(base + offset, 0, n_diff - 1)]
+
+    # Win probability after the last round (ties count as wins, as in simulate()),
+    # plus a small margin term so states where both actions always win still
+    # prefer the larger lead.
+    following = (base >= max_diff) + MARGIN_WEIGHT * (base - max_diff) / max_diff
+    for round_offset in range(ROUNDS_PER_GAME - 1, -1, -1):
+        alone = [None] * n_score  # I banked, opponents roll on from this score.
+        leading = [None] * n_score  # Opponents banked, I am still active.
+        contested = [None] * n_score  # Everyone still active.
+        bust = following / 6
+        for score in range(max_score, -1, -1):
+            if score >= opponent_threshold:
+                alone[score] = shifted(following, -score)
+            else:
+                total = bust.copy()
+                for face in FACES:
+                    target = _next_score(score, face)
+                    if target <= max_score:
+                        total += alone[target] / 6
+                    else:
+                        total += shifted(following, -target) / 6
+                alone[score] = total
+
+            bank_value = shifted(following, score)
+            roll_value = bust.copy()
+            for face in FACES:
+                target = _next_score(score, face)
+                if target <= max_score:
+                    roll_value += leading[target] / 6
+                else:
+                    roll_value += shifted(following, target) / 6
+            decision = bank_value > roll_value
+            leading[score] = np.where(decision, bank_value, roll_value)
+            table[0, round_offset, :, score] = decision
+
+            if score >= opponent_threshold:
+                # Opponents bank in this window, moving the diff down by score.
+                contested[score] = shifted(leading[score], -score)
+                table[1, round_offset, :, score] = table[0, round_offset, :, score][
+                    np.clip(base - score, 0, n_diff - 1)
+                ]
+                continue
+            bank_value = shifted(alone[score], score)
+            roll_value = bust.copy()
+            for face in FACES:
+                target = _next_score(score, face)
+                roll_value += (contested[target] if target <= max_score else following) / 6
+            decision = bank_value > roll_value
+            contested[score] = np.where(decision, bank_value, roll_value)
+            table[1, round_offset, :, score] = decision
+        following = contested[0]
+    return table
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("DICEGAME_CACHE_DIR", Path.home() / ".cache" / "dicegame"))
+
+
+def policy_table_path(
+    opponent_threshold: int = DEFAULT_OPPONENT_THRESHOLD,
+    max_diff: int = DEFAULT_MAX_DIFF,
+    max_score: int = DEFAULT_MAX_SCORE,
+    cache_dir: Optional[Path] = None,
+) -> Path:
+    directory = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    return directory / f"optimal_t{opponent_threshold}_d{max_diff}_s{max_score}.npy"
+
+
+def ensure_policy_table(
+    opponent_threshold: int = DEFAULT_OPPONENT_THRESHOLD,
+    max_diff: int = DEFAULT_MAX_DIFF,
+    max_score: int = DEFAULT_MAX_SCORE,
+    cache_dir: Optional[Path] = None,
+) -> Path:
+    """Return the cached table path, solving and writing it on first use."""
+    path = policy_table_path(opponent_threshold, max_diff, max_score, cache_dir)
+    if path.exists():
+        return path
+    table = solve_policy(opponent_threshold, max_diff, max_score)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        np.save(handle, table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_policy_table(path: Path):
+    """Memory-map a table written by ``ensure_policy_table``."""
+    if np is None:
+        raise RuntimeError("load_policy_table requires numpy")
+    return np.load(path, mmap_mode="r")
@@ -1,24 +1,79 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, MutableSet
 from dataclasses import dataclass, field
-from typing import List, Set
+from typing import List
 
 from .types import Player
 from .stats import PlayerStats
 
 
-@dataclass
+class ActivePlayers(MutableSet):
+    """Live set-like view over ``RoundState.active_mask``.
+
+    Iterates player ids in ascending order, so ``sorted()`` is a no-op.
+    """
+
+    __slots__ = ("_round",)
+
+    def __init__(self, round_state: "RoundState") -> None:
+        self._round = round_state
+
+    def __contains__(self, player_id: object) -> bool:
+        if not isinstance(player_id, int) or player_id < 0:
+            return False
+        return bool(self._round.active_mask >> player_id & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self._round.active_mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self) -> int:
+        return self._round.active_mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._round.active_mask != 0
+
+    def add(self, player_id: int) -> None:
+        self._round.active_mask |= 1 << player_id
+
+    def discard(self, player_id: int) -> None:
+        self._round.active_mask &= ~(1 << player_id)
+
+    def __repr__(self) -> str:
+        return f"ActivePlayers({set(self)!r})"
+
+
+def players_mask(player_ids: Iterable[int]) -> int:
+    mask = 0
+    for pid in player_ids:
+        mask |= 1 << pid
+    return mask
+
+
+@dataclass(slots=True)
 class RoundState:
     round_index: int
     match_index: int
     round_score: int
-    active_players: Set[int]
+    active_mask: int
     roller_index: int
     starter_index: int
     rolls_elapsed_in_round: int
 
+    @property
+    def active_players(self) -> ActivePlayers:
+        return ActivePlayers(self)
+
+    @active_players.setter
+    def active_players(self, player_ids: Iterable[int]) -> None:
+        self.active_mask = players_mask(player_ids)
+
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[Player]
     totals: List[int]
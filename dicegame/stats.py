@@ -1,54 +1,147 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional, Tuple
 
+# Lower bucket edges for the fixed histograms; the last bucket is open-ended.
+BANK_AMOUNT_EDGES: Tuple[int, ...] = (0, 10, 20, 50, 100, 200, 500, 1000)
+ROLLS_ELAPSED_EDGES: Tuple[int, ...] = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15)
 
-@dataclass
+
+@dataclass(slots=True)
+class RunningStat:
+    """Online accumulator with O(1) memory: count, sums, min/max and a histogram.
+
+    Accumulators merge by addition and subtract into deltas. Min and max can
+    be merged but not subtracted, so deltas report them as ``None``.
+    """
+
+    edges: Tuple[int, ...]
+    count: int = 0
+    total: int = 0
+    sum_squares: int = 0
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    histogram: List[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not self.histogram:
+            self.histogram = [0] * len(self.edges)
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        self.sum_squares += value * value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.histogram[max(bisect_right(self.edges, value) - 1, 0)] += 1
+
+    @property
+    def mean(self) -> float:
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        mean = self.total / self.count
+        return max(self.sum_squares - self.count * mean * mean, 0.0) / (self.count - 1)
+
+    def copy(self) -> "RunningStat":
+        return RunningStat(
+            edges=self.edges,
+            count=self.count,
+            total=self.total,
+            sum_squares=self.sum_squares,
+            minimum=self.minimum,
+            maximum=self.maximum,
+            histogram=list(self.histogram),
+        )
+
+    def merged(self, other: "RunningStat") -> "RunningStat":
+        if self.edges != other.edges:
+            raise ValueError("Cannot merge histograms with different edges")
+        bounds = [value for value in (self.minimum, other.minimum) if value is not None]
+        tops = [value for value in (self.maximum, other.maximum) if value is not None]
+        return RunningStat(
+            edges=self.edges,
+            count=self.count + other.count,
+            total=self.total + other.total,
+            sum_squares=self.sum_squares + other.sum_squares,
+            minimum=min(bounds) if bounds else None,
+            maximum=max(tops) if tops else None,
+            histogram=[a + b for a, b in zip(self.histogram, other.histogram)],
+        )
+
+    def minus(self, earlier: "RunningStat") -> "RunningStat":
+        if self.edges != earlier.edges:
+            raise ValueError("Cannot subtract histograms with different edges")
+        return RunningStat(
+            edges=self.edges,
+            count=self.count - earlier.count,
+            total=self.total - earlier.total,
+            sum_squares=self.sum_squares - earlier.sum_squares,
+            histogram=[a - b for a, b in zip(self.histogram, earlier.histogram)],
+        )
+
+
+def _bank_amounts() -> RunningStat:
+    return RunningStat(BANK_AMOUNT_EDGES)
+
+
+def _rolls_elapsed() -> RunningStat:
+    return RunningStat(ROLLS_ELAPSED_EDGES)
+
+
+@dataclass(slots=True)
 class PlayerStats:
     ones_rolled: int = 0
     voluntary_banks_count: int = 0
     forced_zero_banks_count: int = 0
-    voluntary_bank_amounts: List[int] = field(default_factory=list)
+    voluntary_bank_amounts: RunningStat = field(default_factory=_bank_amounts)
     missed_points: int = 0
     rolls_taken_as_roller: int = 0
-    rolls_elapsed_before_voluntary_bank: List[int] = field(default_factory=list)
+    rolls_elapsed_before_voluntary_bank: RunningStat = field(default_factory=_rolls_elapsed)
 
     @property
     def avg_voluntary_bank(self) -> float:
-        if not self.voluntary_bank_amounts:
-            return 0.0
-        return sum(self.voluntary_bank_amounts) / len(self.voluntary_bank_amounts)
+        return self.voluntary_bank_amounts.mean
 
     @property
     def avg_rolls_elapsed_before_bank(self) -> float:
-        if not self.rolls_elapsed_before_voluntary_bank:
-            return 0.0
-        return sum(self.rolls_elapsed_before_voluntary_bank) / len(
-            self.rolls_elapsed_before_voluntary_bank
-        )
+        return self.rolls_elapsed_before_voluntary_bank.mean
+
+    def record_voluntary_bank(self, amount: int, rolls_elapsed: int) -> None:
+        self.voluntary_banks_count += 1
+        self.voluntary_bank_amounts.add(amount)
+        self.rolls_elapsed_before_voluntary_bank.add(rolls_elapsed)
 
     def snapshot(self) -> "PlayerStats":
         return PlayerStats(
             ones_rolled=self.ones_rolled,
             voluntary_banks_count=self.voluntary_banks_count,
             forced_zero_banks_count=self.forced_zero_banks_count,
-            voluntary_bank_amounts=list(self.voluntary_bank_amounts),
+            voluntary_bank_amounts=self.voluntary_bank_amounts.copy(),
             missed_points=self.missed_points,
             rolls_taken_as_roller=self.rolls_taken_as_roller,
-            rolls_elapsed_before_voluntary_bank=list(self.rolls_elapsed_before_voluntary_bank),
+            rolls_elapsed_before_voluntary_bank=self.rolls_elapsed_before_voluntary_bank.copy(),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStatsDelta:
     ones_rolled: int
     voluntary_banks_count: int
     forced_zero_banks_count: int
-    voluntary_bank_amounts: List[int]
+    voluntary_bank_amounts: RunningStat
     missed_points: int
     rolls_taken_as_roller: int
-    rolls_elapsed_before_voluntary_bank: List[int]
+    rolls_elapsed_before_voluntary_bank: RunningStat
 
 
 def diff_stats(current: PlayerStats, previous: PlayerStats) -> PlayerStatsDelta:
@@ -57,13 +150,28 @@ def diff_stats(current: PlayerStats, previous: PlayerStats) -> PlayerStatsDelta:
         voluntary_banks_count=current.voluntary_banks_count - previous.voluntary_banks_count,
         forced_zero_banks_count=current.forced_zero_banks_count
         - previous.forced_zero_banks_count,
-        voluntary_bank_amounts=current.voluntary_bank_amounts[
-            len(previous.voluntary_bank_amounts) :
-        ],
+        voluntary_bank_amounts=current.voluntary_bank_amounts.minus(
+            previous.voluntary_bank_amounts
+        ),
         missed_points=current.missed_points - previous.missed_points,
         rolls_taken_as_roller=current.rolls_taken_as_roller
         - previous.rolls_taken_as_roller,
-        rolls_elapsed_before_voluntary_bank=current.rolls_elapsed_before_voluntary_bank[
-            len(previous.rolls_elapsed_before_voluntary_bank) :
-        ],
+        rolls_elapsed_before_voluntary_bank=current.rolls_elapsed_before_voluntary_bank.minus(
+            previous.rolls_elapsed_before_voluntary_bank
+        ),
+    )
+
+
+def merge_stats(first: PlayerStats, second: PlayerStats) -> PlayerStats:
+    """Combine two players' (or two games') stats into one rollup."""
+    return PlayerStats(
+        ones_rolled=first.ones_rolled + second.ones_rolled,
+        voluntary_banks_count=first.voluntary_banks_count + second.voluntary_banks_count,
+        forced_zero_banks_count=first.forced_zero_banks_count + second.forced_zero_banks_count,
+        voluntary_bank_amounts=first.voluntary_bank_amounts.merged(second.voluntary_bank_amounts),
+        missed_points=first.missed_points + second.missed_points,
+        rolls_taken_as_roller=first.rolls_taken_as_roller + second.rolls_taken_as_roller,
+        rolls_elapsed_before_voluntary_bank=first.rolls_elapsed_before_voluntary_bank.merged(
+            second.rolls_elapsed_before_voluntary_bank
+        ),
     )
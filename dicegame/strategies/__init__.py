@@ -1,11 +1,27 @@
-from .base import Strategy
+from .base import (
+    ArrayStrategy,
+    BankResolver,
+    BatchStrategy,
+    ManyStrategy,
+    SeedableStrategy,
+    Strategy,
+)
 from .threshold import ThresholdStrategy
 from .greedy import GreedyStrategy
 from .roll_limit import RollLimitStrategy
+from .optimal import OptimalStrategy
+from .lookahead import LookaheadStrategy
 
 __all__ = [
     "Strategy",
+    "ManyStrategy",
+    "BankResolver",
+    "ArrayStrategy",
+    "BatchStrategy",
+    "SeedableStrategy",
     "ThresholdStrategy",
     "GreedyStrategy",
     "RollLimitStrategy",
+    "OptimalStrategy",
+    "LookaheadStrategy",
 ]
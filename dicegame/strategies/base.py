@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Any, List, Protocol, Sequence, Tuple, runtime_checkable
 
 from ..state import GameState
 
@@ -8,3 +8,70 @@ from ..state import GameState
 class Strategy(Protocol):
     def decide_bank(self, state: GameState, player_id: int) -> bool:
         """Return True if the player should bank in the current pre-roll window."""
+
+
+@runtime_checkable
+class ManyStrategy(Protocol):
+    def decide_bank_many(self, state: GameState, active_ids: int) -> int:
+        """Return the subset of ``active_ids`` (a player bitmask) that banks now."""
+
+
+@runtime_checkable
+class ArrayStrategy(Protocol):
+    def decide_bank_array(self, round_score: Any, rolls_elapsed_in_round: Any) -> Any:
+        """Return a boolean array: True where the player should bank.
+
+        Arguments are equally shaped integer arrays, one entry per game, so the
+        decision must depend only on the round score and rolls elapsed.
+        """
+
+
+@runtime_checkable
+class BatchStrategy(Protocol):
+    def decide_bank_batch(self, batch: Any, player_id: int) -> Any:
+        """Return a boolean array: True where ``player_id`` should bank.
+
+        ``batch`` is a ``dicegame.vectorized.BatchState`` holding the full
+        per-game state (totals, active mask, round index and score) as arrays.
+        """
+
+
+@runtime_checkable
+class SeedableStrategy(Protocol):
+    def with_seed(self, seed: int) -> "Strategy":
+        """Return a copy whose decisions depend only on ``seed`` and the game state."""
+
+
+class BankResolver:
+    """Resolves a whole pre-roll window into a bitmask of banking players.
+
+    Players whose strategies compare equal and implement ``ManyStrategy`` are
+    decided together in one call; other strategies fall back to one
+    ``decide_bank`` call per active player.
+    """
+
+    def __init__(self, strategies: Sequence[Strategy]) -> None:
+        self._groups: List[Tuple[ManyStrategy, int]] = []
+        self._fallback: List[Tuple[int, Strategy]] = []
+        for pid, strategy in enumerate(strategies):
+            if not isinstance(strategy, ManyStrategy):
+                self._fallback.append((pid, strategy))
+                continue
+            for index, (grouped, mask) in enumerate(self._groups):
+                if grouped is strategy or grouped == strategy:
+                    self._groups[index] = (grouped, mask | 1 << pid)
+                    break
+            else:
+                self._groups.append((strategy, 1 << pid))
+
+    def __call__(self, state: GameState) -> int:
+        active = state.round_state.active_mask
+        banks = 0
+        for strategy, mask in self._groups:
+            members = active & mask
+            if members:
+                banks |= strategy.decide_bank_many(state, members) & members
+        for pid, strategy in self._fallback:
+            if active >> pid & 1 and strategy.decide_bank(state, pid):
+                banks |= 1 << pid
+        return banks
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 
 from .base import Strategy
 from ..state import GameState
@@ -8,5 +9,14 @@ from ..state import GameState
 
 @dataclass
 class GreedyStrategy(Strategy):
+    """Never banks voluntarily; every round ends in a bust."""
+
     def decide_bank(self, state: GameState, player_id: int) -> bool:
-        return state.round_state.round_score >= 999999
+        return False
+
+    def decide_bank_many(self, state: GameState, active_ids: int) -> int:
+        return 0
+
+    def decide_bank_array(self, round_score: Any, rolls_elapsed_in_round: Any) -> Any:
+        # Scores are never negative, so this is an all-False mask of the right shape.
+        return round_score < 0
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
+
+from .base import BankResolver, Strategy
+from .threshold import ThresholdStrategy
+from ..actions import Bank, Roll
+from ..engine import GameEngine
+from ..rollout import play_to_end
+from ..state import GameState
+from ..types import BufferedRandomDice, FixedDice
+
+ROLLOUT_DICE_BUFFER = 512
+# Rollouts per NumPy batch. Unseeded decisions start small and size later
+# batches from the measured rate so the last one ends near the deadline.
+ROLLOUT_BATCH = 2048
+MIN_ROLLOUT_BATCH = 128
+# Seeded decisions cannot watch the clock and stay reproducible, so they play a
+# fixed count sized from the budget at these conservative rates per millisecond.
+SEEDED_BATCHED_ROLLOUTS_PER_MS = 200
+SEEDED_SCALAR_ROLLOUTS_PER_MS = 10
+
+
+@dataclass
+class LookaheadStrategy(Strategy):
+    """Monte Carlo lookahead within a per-decision time budget.
+
+    Each decision plays paired rollouts from a copy of the state: one where
+    the player banks now and one where they roll on, both on the same dice,
+    with everyone then following ``ThresholdStrategy(rollout_threshold)``.
+    The player banks if that wins more often (final margin breaks ties).
+
+    Under that uniform policy every later round starts with everyone active
+    and adds the same to every total, so margins are final once the current
+    round closes and rollouts stop there. Rollouts run in NumPy batches when
+    it is installed, one engine each otherwise.
+
+    Without a ``seed`` a decision plays rollouts until ``time_budget`` runs
+    out or ``max_rollouts`` is reached. With one it plays a fixed count
+    derived from ``time_budget`` (capped by ``max_rollouts``), so seeded runs
+    are reproducible and still scale with the budget.
+    """
+
+    time_budget: float = 0.05
+    max_rollouts: int = 20000
+    rollout_threshold: int = 30
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def with_seed(self, seed: int) -> "LookaheadStrategy":
+        return replace(self, seed=seed)
+
+    def decide_bank(self, state: GameState, player_id: int) -> bool:
+        from ..vectorized import supports_batch
+
+        rs = state.round_state
+        bit = 1 << player_id
+        if state.game_over or not rs.active_mask & bit:
+            return False
+        rollout_strategies = [ThresholdStrategy(self.rollout_threshold)] * state.n_players
+        policy = BankResolver(rollout_strategies)
+        others = policy(state) & ~bit
+        if supports_batch(rollout_strategies):
+            bank, roll = self._batched(state, player_id, others, rollout_strategies)
+        else:
+            bank, roll = self._scalar(state, player_id, others, policy)
+        return bank > roll
+
+    def rollout_limit(self, per_ms: int) -> int:
+        """Rollouts per decision: ``max_rollouts``, or for seeded runs the budget's share of it."""
+        if self.seed is None:
+            return self.max_rollouts
+        return max(1, min(self.max_rollouts, int(self.time_budget * 1000 * per_ms)))
+
+    def _more(self, rollouts: int, limit: int, deadline: float) -> bool:
+        if rollouts >= limit:
+            return False
+        return self.seed is not None or time.perf_counter() < deadline
+
+    def _batched(
+        self, state: GameState, player_id: int, others: int, strategies
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        import numpy as np
+
+        from ..vectorized import BatchStart, play_from
+
+        round_index = state.round_state.round_index
+        branches = []
+        for window_banks in (others | 1 << player_id, others):
+            engine = _after_banks(state, window_banks)
+            rs = engine.state.round_state
+            if engine.state.game_over or rs.round_index != round_index:
+                branches.append((None, _outcome(engine.state.totals, player_id)))
+                continue
+            start = BatchStart(
+                totals=list(engine.state.totals),
+                active_mask=rs.active_mask,
+                round_score=rs.round_score,
+                rolls_elapsed_in_round=rs.rolls_elapsed_in_round,
+                round_index=rs.round_index,
+                starter_index=rs.starter_index,
+                roller_index=rs.roller_index,
+            )
+            branches.append((start, None))
+
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+        limit = self.rollout_limit(SEEDED_BATCHED_ROLLOUTS_PER_MS)
+        scores = [[0, 0], [0, 0]]
+        rollouts = 0
+        batch = ROLLOUT_BATCH if self.seed is not None else MIN_ROLLOUT_BATCH
+        while self._more(rollouts, limit, deadline):
+            count = min(batch, limit - rollouts)
+            seed = self._rng.getrandbits(64)
+            for score, (start, fixed) in zip(scores, branches):
+                if fixed is not None:
+                    win, margin = fixed
+                    score[0] += win * count
+                    score[1] += margin * count
+                    continue
+                # The window was just decided, so every rollout opens with a roll.
+                rng = np.random.default_rng(seed)
+                totals = play_from(
+                    start, strategies, count, rng, first_window=False, last_round=round_index
+                )
+                others_best = np.delete(totals, player_id, axis=1).max(axis=1)
+                margins = totals[:, player_id] - others_best
+                score[0] += int((margins >= 0).sum())
+                score[1] += int(margins.sum())
+            rollouts += count
+            if self.seed is None:
+                now = time.perf_counter()
+                per_rollout = (now - started) / rollouts
+                batch = int((deadline - now) / per_rollout)
+                batch = max(MIN_ROLLOUT_BATCH, min(ROLLOUT_BATCH, batch))
+        return tuple(scores[0]), tuple(scores[1])
+
+    def _scalar(
+        self, state: GameState, player_id: int, others: int, policy: BankResolver
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        deadline = time.perf_counter() + self.time_budget
+        limit = self.rollout_limit(SEEDED_SCALAR_ROLLOUTS_PER_MS)
+        bank_wins = roll_wins = bank_margin = roll_margin = 0
+        rollouts = 0
+        while self._more(rollouts, limit, deadline):
+            seed = self._rng.getrandbits(64)
+            win, margin = self._rollout(state, player_id, others | 1 << player_id, seed, policy)
+            bank_wins += win
+            bank_margin += margin
+            win, margin = self._rollout(state, player_id, others, seed, policy)
+            roll_wins += win
+            roll_margin += margin
+            rollouts += 1
+        return (bank_wins, bank_margin), (roll_wins, roll_margin)
+
+    def _rollout(
+        self, state: GameState, player_id: int, window_banks: int, seed: int, policy: BankResolver
+    ) -> Tuple[int, int]:
+        round_index = state.round_state.round_index
+        engine = _after_banks(state, window_banks)
+        # Banks that close the round settle the margin; never roll into the next round.
+        if engine.state.game_over or engine.state.round_state.round_index != round_index:
+            return _outcome(engine.state.totals, player_id)
+        engine.dice = BufferedRandomDice(rng=random.Random(seed), buffer_size=ROLLOUT_DICE_BUFFER)
+        engine.step(Roll())
+        return _outcome(play_to_end(engine, policy, last_round=round_index), player_id)
+
+
+def _after_banks(state: GameState, window_banks: int) -> GameEngine:
+    """A headless copy of ``state`` with this window's banks applied, in player order."""
+    engine = GameEngine.from_state(state, FixedDice([]))
+    while window_banks and not engine.state.game_over:
+        lowest = window_banks & -window_banks
+        window_banks ^= lowest
+        engine.step(Bank(lowest.bit_length() - 1))
+    return engine
+
+
+def _outcome(totals, player_id: int) -> Tuple[int, int]:
+    best_other = max(total for pid, total in enumerate(totals) if pid != player_id)
+    margin = totals[player_id] - best_other
+    return int(margin >= 0), margin
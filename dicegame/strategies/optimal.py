@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .base import Strategy
+from ..solver import DEFAULT_OPPONENT_THRESHOLD, ensure_policy_table, load_policy_table
+from ..state import GameState
+
+
+@dataclass
+class OptimalStrategy(Strategy):
+    """Bank according to a precomputed value-iteration table (see ``dicegame.solver``)."""
+
+    table_path: str
+    _table: Any = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def load(
+        cls,
+        opponent_threshold: int = DEFAULT_OPPONENT_THRESHOLD,
+        cache_dir: Optional[Path] = None,
+    ) -> "OptimalStrategy":
+        return cls(str(ensure_policy_table(opponent_threshold, cache_dir=cache_dir)))
+
+    @property
+    def table(self) -> Any:
+        if self._table is None:
+            self._table = load_policy_table(Path(self.table_path))
+        return self._table
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers re-map the file instead of receiving a pickled copy.
+        return {"table_path": self.table_path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.table_path = state["table_path"]
+        self._table = None
+
+    def decide_bank(self, state: GameState, player_id: int) -> bool:
+        table = self.table
+        rs = state.round_state
+        max_diff = (table.shape[2] - 1) // 2
+        max_score = table.shape[3] - 1
+        if rs.round_score > max_score:
+            return True
+        others = [pid for pid in range(state.n_players) if pid != player_id]
+        lead = state.totals[player_id] - max(state.totals[pid] for pid in others)
+        opponents_active = bool(rs.active_mask & ~(1 << player_id))
+        diff_index = min(max(lead, -max_diff), max_diff) + max_diff
+        return bool(table[int(opponents_active), rs.round_index - 1, diff_index, rs.round_score])
+
+    def decide_bank_batch(self, batch: Any, player_id: int) -> Any:
+        import numpy as np
+
+        table = self.table
+        max_diff = (table.shape[2] - 1) // 2
+        max_score = table.shape[3] - 1
+        others = np.arange(batch.totals.shape[1]) != player_id
+        lead = batch.totals[:, player_id] - batch.totals[:, others].max(axis=1)
+        opponents_active = batch.active[:, others].any(axis=1)
+        diff_index = np.clip(lead, -max_diff, max_diff) + max_diff
+        score_index = np.minimum(batch.round_score, max_score)
+        decision = table[
+            opponents_active.astype(np.intp), batch.round_index - 1, diff_index, score_index
+        ]
+        return (decision != 0) | (batch.round_score > max_score)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 
 from .base import Strategy
 from ..state import GameState
@@ -12,3 +13,9 @@ class ThresholdStrategy(Strategy):
 
     def decide_bank(self, state: GameState, player_id: int) -> bool:
         return state.round_state.round_score >= self.threshold
+
+    def decide_bank_many(self, state: GameState, active_ids: int) -> int:
+        return active_ids if state.round_state.round_score >= self.threshold else 0
+
+    def decide_bank_array(self, round_score: Any, rolls_elapsed_in_round: Any) -> Any:
+        return round_score >= self.threshold
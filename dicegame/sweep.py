@@ -0,0 +1,179 @@
+"""Strategy parameter sweeps evaluated with common random numbers.
+
+Every cell of the grid replays the same per-game dice streams, so differences
+between cells come from the strategies rather than from the dice, and paired
+confidence intervals are much tighter than independent runs would give.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Callable, List, Sequence, Tuple
+
+from .cli import SINGLE_GAME_DICE_BUFFER, derive_seed, run_single_game
+from .stats import RunningStat
+from .strategies import Strategy
+from .types import BufferedRandomDice
+
+Z_95 = 1.96
+# Histogram edges for the cells' accumulators; only their moments are reported.
+WIN_EDGES = (0, 1)
+SCORE_EDGES = (0, 100, 200, 500, 1000)
+
+
+def expand_spec(spec: str) -> List[str]:
+    """Expand ``name:start..stop[:step]`` into one spec per value (inclusive)."""
+    if ".." not in spec:
+        return [spec]
+    name, _, value_range = spec.partition(":")
+    bounds, _, step_text = value_range.partition(":")
+    start_text, _, stop_text = bounds.partition("..")
+    start, stop = int(start_text), int(stop_text)
+    step = int(step_text) if step_text else 1
+    if step <= 0 or stop < start:
+        raise ValueError(f"Invalid strategy range: {spec}")
+    return [f"{name}:{value}" for value in range(start, stop + 1, step)]
+
+
+def expand_grid(specs: Sequence[str]) -> List[Tuple[str, ...]]:
+    return list(itertools.product(*(expand_spec(spec) for spec in specs)))
+
+
+class DiceStreams:
+    """Per-game dice streams, rebuilt from the game's derived seed for every sweep cell.
+
+    Nothing is kept between calls, so memory stays flat however many games
+    the sweep plays.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+
+    def dice(self, game: int) -> BufferedRandomDice:
+        rng = random.Random(derive_seed(self.seed, game))
+        return BufferedRandomDice(rng=rng, buffer_size=SINGLE_GAME_DICE_BUFFER)
+
+
+def _win_counter() -> RunningStat:
+    return RunningStat(WIN_EDGES)
+
+
+def _score_counter() -> RunningStat:
+    return RunningStat(SCORE_EDGES)
+
+
+@dataclass
+class SweepCell:
+    """The focus player's wins and scores in one grid cell, as running accumulators."""
+
+    specs: Tuple[str, ...]
+    wins: RunningStat = field(default_factory=_win_counter)
+    scores: RunningStat = field(default_factory=_score_counter)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins.mean
+
+    @property
+    def avg_score(self) -> float:
+        return self.scores.mean
+
+
+@dataclass
+class SweepRow:
+    rank: int
+    cell: SweepCell
+    diff_vs_best: float
+    ci_half_width: float
+
+
+class PairedWins:
+    """How often each pair of cells both won the same game.
+
+    With 0/1 outcomes that is all a paired comparison needs: over the games,
+    ``a - b`` sums to ``A - B`` and its squares to ``A + B - 2 * both``, so
+    memory grows with cells squared, never with games.
+    """
+
+    def __init__(self, cells: int) -> None:
+        self.both = [[0] * cells for _ in range(cells)]
+
+    def add(self, winners: Sequence[int]) -> None:
+        for i in winners:
+            row = self.both[i]
+            for j in winners:
+                row[j] += 1
+
+    def difference(self, a: SweepCell, b: SweepCell, i: int, j: int) -> Tuple[float, float]:
+        """Paired win-rate difference of cell ``i`` (``a``) over cell ``j`` (``b``)."""
+        sum_squares = a.wins.total + b.wins.total - 2 * self.both[i][j]
+        return paired_difference(a.wins.total - b.wins.total, sum_squares, a.wins.count)
+
+
+def paired_difference(total: float, sum_squares: float, n: int) -> Tuple[float, float]:
+    """Mean of ``n`` paired differences from their sums, and its 95% confidence half-width."""
+    if not n:
+        return 0.0, math.inf
+    mean = total / n
+    if n < 2:
+        return mean, math.inf
+    variance = max(sum_squares - n * mean * mean, 0.0) / (n - 1)
+    return mean, Z_95 * math.sqrt(variance / n)
+
+
+def run_sweep(
+    players: List[str],
+    specs: Sequence[str],
+    games: int,
+    seed: int,
+    parse: Callable[[str], Strategy],
+    focus: int = 0,
+) -> List[SweepRow]:
+    """Evaluate every grid cell on the same dice and rank by the focus player's win rate.
+
+    Games are played one at a time across every cell, so paired statistics
+    accumulate as they go and memory does not grow with ``games``.
+    """
+    if len(specs) != len(players):
+        raise ValueError("Number of strategies must match number of players")
+    streams = DiceStreams(seed)
+    grid = expand_grid(specs)
+    cells = [SweepCell(specs=cell_specs) for cell_specs in grid]
+    strategies = [[parse(spec) for spec in cell_specs] for cell_specs in grid]
+    paired = PairedWins(len(cells))
+    for game in range(games):
+        winners = []
+        for index, (cell, cell_strategies) in enumerate(zip(cells, strategies)):
+            scores = run_single_game(players, cell_strategies, streams.dice(game))
+            won = scores[focus] == max(scores)
+            cell.wins.add(int(won))
+            cell.scores.add(scores[focus])
+            if won:
+                winners.append(index)
+        paired.add(winners)
+    order = sorted(
+        range(len(cells)), key=lambda i: (cells[i].win_rate, cells[i].avg_score), reverse=True
+    )
+    best = order[0]
+    rows: List[SweepRow] = []
+    for rank, index in enumerate(order, start=1):
+        cell = cells[index]
+        diff, half_width = (0.0, 0.0)
+        if index != best:
+            diff, half_width = paired.difference(cell, cells[best], index, best)
+        rows.append(SweepRow(rank=rank, cell=cell, diff_vs_best=diff, ci_half_width=half_width))
+    return rows
+
+
+def format_sweep(rows: Sequence[SweepRow]) -> str:
+    lines = [f"{'rank':>4}  {'win_rate':>8}  {'avg_score':>9}  {'diff_vs_best':>18}  strategies"]
+    for row in rows:
+        diff = f"{row.diff_vs_best:+.3f} ±{row.ci_half_width:.3f}"
+        lines.append(
+            f"{row.rank:>4}  {row.cell.win_rate:>8.3f}  {row.cell.avg_score:>9.2f}  "
+            f"{diff:>18}  {' '.join(row.cell.specs)}"
+        )
+    return "\n".join(lines)
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Protocol, List
+import mmap
+from dataclasses import dataclass, field
+from typing import Any, List, Protocol
 import random
 
+# Maps a random byte to a face; bytes 252-255 are dropped so every face
+# stays equally likely (252 is the largest multiple of 6 below 256).
+_FACE_TABLE = bytes(byte % 6 + 1 for byte in range(256))
+_REJECTED_BYTES = bytes(range(252, 256))
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Player:
     id: int
     name: str
@@ -25,6 +31,31 @@ class RandomDice:
         return rng.randint(1, 6)
 
 
+@dataclass
+class BufferedRandomDice:
+    """Random dice served from a buffer refilled by one bulk ``randbytes`` call."""
+
+    rng: random.Random | None = None
+    buffer_size: int = 65536
+    _buffer: bytes = field(default=b"", init=False, repr=False)
+    _index: int = field(default=0, init=False, repr=False)
+
+    def roll(self) -> int:
+        if self._index >= len(self._buffer):
+            self._refill()
+        value = self._buffer[self._index]
+        self._index += 1
+        return value
+
+    def _refill(self) -> None:
+        rng = self.rng or random
+        buffer = b""
+        while not buffer:
+            buffer = rng.randbytes(self.buffer_size).translate(_FACE_TABLE, _REJECTED_BYTES)
+        self._buffer = buffer
+        self._index = 0
+
+
 @dataclass
 class FixedDice:
     rolls: List[int]
@@ -36,3 +67,52 @@ class FixedDice:
         value = self.rolls[self.index]
         self.index += 1
         return value
+
+
+@dataclass
+class TapeDice:
+    """Replays a memory-mapped file of pre-recorded faces, one byte per roll."""
+
+    path: str
+    index: int = 0
+    _file: Any = field(default=None, init=False, repr=False)
+    _map: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._file.close()
+            raise ValueError(f"Empty dice tape: {self.path}") from exc
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def roll(self) -> int:
+        if self.index >= len(self._map):
+            raise IndexError("TapeDice exhausted")
+        value = self._map[self.index]
+        if not 1 <= value <= 6:
+            raise ValueError(f"Invalid face {value} at tape offset {self.index}")
+        self.index += 1
+        return value
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+
+def write_tape(path: str, dice: Dice, rolls: int, chunk_size: int = 1 << 20) -> None:
+    """Record ``rolls`` faces from ``dice`` into a tape file for ``TapeDice``."""
+    with open(path, "wb") as handle:
+        remaining = rolls
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            handle.write(bytes(dice.roll() for _ in range(count)))
+            remaining -= count
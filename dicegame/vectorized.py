@@ -0,0 +1,263 @@
+"""Batch simulator that plays many games in parallel NumPy arrays.
+
+Only strategies implementing ``ArrayStrategy`` or ``BatchStrategy`` can be
+simulated here; the rules mirror ``GameEngine`` and ``run_single_game``
+exactly, so results are statistically identical to the scalar path.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+from .cli import SimulationResult
+from .results import STAT_COLUMNS, GameRows
+from .strategies import ArrayStrategy, BatchStrategy, Strategy
+
+ROUNDS_PER_GAME = 30
+DEFAULT_BATCH_SIZE = 65536
+DEFAULT_BLOCK_ROWS = 64
+
+
+@dataclass
+class BatchState:
+    """Per-game arrays handed to ``BatchStrategy.decide_bank_batch``."""
+
+    round_index: Any
+    round_score: Any
+    rolls_elapsed_in_round: Any
+    totals: Any
+    active: Any
+
+
+@dataclass
+class BatchStart:
+    """One game position that every game in a batch starts from."""
+
+    totals: Sequence[int]
+    active_mask: int
+    round_score: int
+    rolls_elapsed_in_round: int
+    round_index: int
+    starter_index: int
+    roller_index: int
+
+
+def supports_batch(strategies: Sequence[Strategy]) -> bool:
+    """Return True if NumPy is available and every strategy has an array predicate."""
+    if np is None:
+        return False
+    return all(
+        isinstance(strategy, (ArrayStrategy, BatchStrategy)) for strategy in strategies
+    )
+
+
+class _DiceBlock:
+    """Serves one die per game per step from pre-drawn blocks of faces."""
+
+    def __init__(self, rng, width: int, rows: int) -> None:
+        self.rng = rng
+        self.width = width
+        self.rows = rows
+        self.block = rng.integers(1, 7, size=(rows, width), dtype=np.int8)
+        self.row = 0
+
+    def next(self, count: int):
+        if self.row >= self.rows:
+            self.block = self.rng.integers(1, 7, size=(self.rows, self.width), dtype=np.int8)
+            self.row = 0
+        faces = self.block[self.row, :count]
+        self.row += 1
+        return faces
+
+
+def _play_batch(
+    n_players: int,
+    strategies: Sequence[Strategy],
+    games: int,
+    rng,
+    block_rows: int,
+    stats: Optional[Dict[str, Any]] = None,
+    start: Optional[BatchStart] = None,
+    first_window: bool = True,
+    last_round: int = ROUNDS_PER_GAME,
+):
+    """Play ``games`` complete games and return their final totals (games x players).
+
+    If ``stats`` is given, it is filled with a (games x players) array per
+    name in ``STAT_COLUMNS``, counted the same way as ``PlayerStats``.
+    Games begin at ``start`` (default: a new game); with ``first_window``
+    false, its pre-roll window is taken as already decided and play opens
+    with a roll. Games stop once round ``last_round`` closes.
+    """
+    if start is None:
+        start = BatchStart([0] * n_players, (1 << n_players) - 1, 0, 0, 1, 0, 0)
+    final_totals = np.zeros((games, n_players), dtype=np.int64)
+    game_ids = np.arange(games)
+    totals = np.tile(np.asarray(start.totals, dtype=np.int64), (games, 1))
+    active_row = [bool(start.active_mask >> pid & 1) for pid in range(n_players)]
+    active = np.tile(np.asarray(active_row, dtype=bool), (games, 1))
+    round_score = np.full(games, start.round_score, dtype=np.int64)
+    rolls_elapsed = np.full(games, start.rolls_elapsed_in_round, dtype=np.int64)
+    round_index = np.full(games, start.round_index, dtype=np.int64)
+    starter = np.full(games, start.starter_index, dtype=np.int64)
+    roller = np.full(games, start.roller_index, dtype=np.int64)
+    window = first_window
+    offsets = np.arange(n_players)
+    dice = _DiceBlock(rng, games, block_rows)
+    uses_state = [isinstance(strategy, BatchStrategy) for strategy in strategies]
+    counters: Dict[str, Any] = {}
+    if stats is not None:
+        counters = {name: np.zeros((games, n_players), dtype=np.int64) for name in STAT_COLUMNS}
+        stats.update({name: np.zeros_like(values) for name, values in counters.items()})
+
+    while game_ids.size:
+        live = game_ids.size
+        rows = np.arange(live)
+
+        # Pre-roll window: every active player decides against the same state.
+        batch = None
+        if window and any(uses_state):
+            batch = BatchState(
+                round_index, round_score, rolls_elapsed, totals.copy(), active.copy()
+            )
+        for pid, strategy in enumerate(strategies if window else ()):
+            if uses_state[pid]:
+                decide = strategy.decide_bank_batch(batch, pid)
+            else:
+                decide = strategy.decide_bank_array(round_score, rolls_elapsed)
+            banks = active[:, pid] & np.broadcast_to(np.asarray(decide, dtype=bool), (live,))
+            totals[:, pid] += np.where(banks, round_score, 0)
+            active[:, pid] &= ~banks
+            if counters:
+                counters["voluntary_banks"][:, pid] += banks
+        window = True
+
+        # Roll for every game that still has an active player.
+        rolling = active.any(axis=1)
+        candidates = (roller[:, None] + offsets) % n_players
+        first_active = np.argmax(active[rows[:, None], candidates], axis=1)
+        roller = np.where(rolling, candidates[rows, first_active], roller)
+        die = dice.next(live)
+        bust = rolling & (die == 1)
+        double = rolling & (die == 2)
+        add = rolling & (die > 2)
+        if counters:
+            counters["rolls_taken_as_roller"][rows, roller] += rolling
+            counters["ones_rolled"][rows, roller] += bust
+            busted = active & bust[:, None]
+            counters["forced_zero_banks"] += busted
+            counters["missed_points"] += busted * round_score[:, None]
+        round_score = np.where(double, np.maximum(round_score * 2, 2), round_score)
+        round_score = np.where(add, round_score + die, round_score)
+        rolls_elapsed += rolling
+
+        # Close rounds that busted or where everyone banked.
+        round_over = bust | ~rolling
+        if round_over.any():
+            round_index += round_over
+            starter = np.where(round_over, (starter + 1) % n_players, starter)
+            roller = np.where(round_over, starter, roller)
+            round_score[round_over] = 0
+            rolls_elapsed[round_over] = 0
+            active[round_over] = True
+
+            finished = round_index > last_round
+            if finished.any():
+                final_totals[game_ids[finished]] = totals[finished]
+                for name, values in counters.items():
+                    stats[name][game_ids[finished]] = values[finished]
+                    counters[name] = values[~finished]
+                keep = ~finished
+                game_ids = game_ids[keep]
+                totals = totals[keep]
+                active = active[keep]
+                round_score = round_score[keep]
+                rolls_elapsed = rolls_elapsed[keep]
+                round_index = round_index[keep]
+                starter = starter[keep]
+                roller = roller[keep]
+    return final_totals
+
+
+def play_from(
+    start: BatchStart,
+    strategies: Sequence[Strategy],
+    games: int,
+    rng: "np.random.Generator",
+    first_window: bool = True,
+    last_round: int = ROUNDS_PER_GAME,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+):
+    """Play ``games`` games on from ``start`` and return their totals (games x players).
+
+    Play stops at game end or once round ``last_round`` closes. Runs with the
+    same ``rng`` replay the same dice, so callers can compare alternatives
+    on common random numbers.
+    """
+    if not supports_batch(strategies):
+        raise ValueError("Batch simulation requires numpy and array-capable strategies")
+    return _play_batch(
+        len(strategies),
+        strategies,
+        games,
+        rng,
+        block_rows,
+        start=start,
+        first_window=first_window,
+        last_round=last_round,
+    )
+
+
+def simulate_batch(
+    players: List[str],
+    strategies: Sequence[Strategy],
+    games: int,
+    rng: Optional["np.random.Generator"] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    rows: Optional[GameRows] = None,
+) -> SimulationResult:
+    """Simulate ``games`` games in batches.
+
+    If ``rows`` is given, its ``winner``, ``total`` and stat columns are
+    filled with one entry per game (per-player columns flattened row-major).
+    """
+    if not supports_batch(strategies):
+        raise ValueError("Batch simulation requires numpy and array-capable strategies")
+    if len(strategies) != len(players):
+        raise ValueError("Number of strategies must match number of players")
+    rng = rng if rng is not None else np.random.default_rng()
+    n_players = len(players)
+    totals = np.zeros(n_players, dtype=np.int64)
+    wins = np.zeros(n_players, dtype=np.int64)
+    score_squares = [0] * n_players
+    recorded: Dict[str, List[Any]] = {}
+    remaining = games
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        stats: Optional[Dict[str, Any]] = {} if rows is not None else None
+        scores = _play_batch(n_players, strategies, count, rng, block_rows, stats=stats)
+        if stats is not None:
+            top = scores == scores.max(axis=1, keepdims=True)
+            stats["winner"] = np.where(top.sum(axis=1) > 1, -1, scores.argmax(axis=1))
+            stats["total"] = scores
+            for name, values in stats.items():
+                recorded.setdefault(name, []).append(values)
+        totals += scores.sum(axis=0)
+        wins += (scores == scores.max(axis=1, keepdims=True)).sum(axis=0)
+        # Python ints: squared totals can overflow int64 when summed.
+        squares = (scores.astype(object) ** 2).sum(axis=0)
+        score_squares = [a + int(b) for a, b in zip(score_squares, squares)]
+        remaining -= count
+    if rows is not None:
+        for name, values in recorded.items():
+            rows[name] = np.concatenate(values).reshape(-1)
+    return SimulationResult(
+        totals=totals.tolist(), wins=wins.tolist(), games=games, score_squares=score_squares
+    )
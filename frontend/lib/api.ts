@@ -33,13 +33,43 @@ export function createGame(players: string[]): Promise<GameResponse> {
   });
 }
 
-export function getGame(gameId: string, sinceSeq?: number): Promise<GameResponse> {
-  const query = sinceSeq !== undefined ? `?since_seq=${sinceSeq}` : "";
+export function getGame(
+  gameId: string,
+  sinceSeq?: number,
+  waitSeconds?: number
+): Promise<GameResponse> {
+  const params = new URLSearchParams();
+  if (sinceSeq !== undefined) params.set("since_seq", String(sinceSeq));
+  if (waitSeconds !== undefined) params.set("wait", String(waitSeconds));
+  const query = params.toString() ? `?${params.toString()}` : "";
   return request<GameResponse>(`/api/games/${gameId}${query}`, {
     method: "GET"
   });
 }
 
+// Opens one Server-Sent Events connection that delivers a GameResponse on every change.
+// The first update carries the full retained log; later ones only new events. The browser
+// reconnects on its own and resumes from the last seq it saw. Returns an unsubscribe function.
+export function subscribeToGame(
+  gameId: string,
+  onUpdate: (response: GameResponse, isFirst: boolean) => void,
+  onError: (message: string) => void
+): () => void {
+  const source = new EventSource(`${API_BASE}/api/games/${gameId}/stream`);
+  let received = 0;
+  source.addEventListener("update", (message) => {
+    const response = JSON.parse((message as MessageEvent<string>).data) as GameResponse;
+    onUpdate(response, received === 0);
+    received += 1;
+  });
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      onError("Lost connection to the game server.");
+    }
+  };
+  return () => source.close();
+}
+
 export function bank(gameId: string, playerId: number): Promise<GameResponse> {
   return request<GameResponse>(`/api/games/${gameId}/bank`, {
     method: "POST",
@@ -41,12 +41,24 @@ export interface EventDTO {
   payload: Record<string, unknown>;
 }
 
+export interface StateDeltaDTO {
+  base_version: number;
+  fields: Record<string, unknown>;
+  players: Array<{ id: number } & Record<string, unknown>>;
+}
+
 export interface GameResponse {
   game_id: string;
-  state: GameStateDTO;
+  // Null when the state comes back as `state_delta` instead.
+  state: GameStateDTO | null;
   events: EventDTO[];
   valid_actions: ValidActionsDTO;
   latest_seq: number;
+  snapshot_seq: number;
+  resync_required: boolean;
+  version: number;
+  // Only set for GET requests with delta=true; `state` is then null. The UI never asks for it.
+  state_delta?: StateDeltaDTO | null;
 }
 
 export interface ErrorResponse {
@@ -1,7 +1,7 @@
 import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { useRouter } from "next/router";
 import styles from "../../styles/Game.module.css";
-import { bank, getGame, roll } from "../../lib/api";
+import { bank, roll, subscribeToGame } from "../../lib/api";
 import { EventDTO, GameResponse, GameStateDTO, ValidActionsDTO } from "../../lib/types";
 
 interface SummaryInfo {
@@ -60,62 +60,50 @@ export default function GamePage() {
   const [state, setState] = useState<GameStateDTO | null>(null);
   const [validActions, setValidActions] = useState<ValidActionsDTO | null>(null);
   const [events, setEvents] = useState<EventDTO[]>([]);
-  const [latestSeq, setLatestSeq] = useState(0);
   const [error, setError] = useState<string | null>(null);
   const [summary, setSummary] = useState<SummaryInfo | null>(null);
-  const pollingRef = useRef<NodeJS.Timeout | null>(null);
+
+  // Action responses and the stream can both deliver an event; keep each seq once.
+  const seenSeqRef = useRef(0);
 
   const updateFromResponse = useCallback(
     (response: GameResponse, append: boolean) => {
-      setState(response.state);
-      setValidActions(response.valid_actions);
-      setLatestSeq(response.latest_seq);
-      if (append) {
-        const newEvents = [...response.events].reverse();
+      // Events we missed were compacted server-side; start over from this response.
+      if (append && !response.resync_required) {
+        if (response.latest_seq < seenSeqRef.current) return;
+        const fresh = response.events.filter((event) => event.seq > seenSeqRef.current);
+        seenSeqRef.current = response.latest_seq;
+        setState(response.state);
+        setValidActions(response.valid_actions);
+        const newEvents = [...fresh].reverse();
         setEvents((prev) => [...newEvents, ...prev]);
-        const summaryEvent = response.events.find(
+        const summaryEvent = fresh.find(
           (event) => event.type === "match_end" || event.type === "game_end"
         );
-        if (summaryEvent) {
+        if (summaryEvent && response.state) {
           setSummary(computeSummary(response.state, summaryEvent));
         }
       } else {
+        seenSeqRef.current = response.latest_seq;
+        setState(response.state);
+        setValidActions(response.valid_actions);
         setEvents([...response.events].reverse());
       }
     },
     []
   );
 
-  const loadGame = useCallback(
-    async (sinceSeq?: number) => {
-      if (!gameId || Array.isArray(gameId)) return;
-      try {
-        const response = await getGame(gameId, sinceSeq);
-        updateFromResponse(response, sinceSeq !== undefined);
-        setError(null);
-      } catch (err) {
-        setError(err instanceof Error ? err.message : "Failed to load game.");
-      }
-    },
-    [gameId, updateFromResponse]
-  );
-
   useEffect(() => {
     if (!gameId || Array.isArray(gameId)) return;
-    loadGame();
-  }, [gameId, loadGame]);
-
-  useEffect(() => {
-    if (!gameId || Array.isArray(gameId)) return;
-    pollingRef.current = setInterval(() => {
-      loadGame(latestSeq);
-    }, 1000);
-    return () => {
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-      }
-    };
-  }, [gameId, latestSeq, loadGame]);
+    return subscribeToGame(
+      gameId,
+      (response, isFirst) => {
+        updateFromResponse(response, !isFirst);
+        setError(null);
+      },
+      (message) => setError(message)
+    );
+  }, [gameId, updateFromResponse]);
 
   const canRoll = validActions?.can_roll ?? false;
   const bankableIds = useMemo(
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from dicegame.analysis import round_distribution, roll_limit_distribution, threshold_distribution
+from dicegame.cli import simulate
+from dicegame.strategies import GreedyStrategy, RollLimitStrategy, ThresholdStrategy
+
+
+def test_single_roll_distribution_is_exact():
+    dist = roll_limit_distribution(1)
+    assert dist.bust_probability == pytest.approx(1 / 6)
+    assert dist.outcomes == pytest.approx({amount: 1 / 6 for amount in (0, 2, 3, 4, 5, 6)})
+    assert dist.expected_value == pytest.approx(20 / 6)
+
+
+def test_threshold_distribution_sums_to_one_and_is_memoized():
+    dist = threshold_distribution(50)
+    assert sum(dist.outcomes.values()) == pytest.approx(1.0)
+    assert min(amount for amount in dist.outcomes if amount) >= 50
+    assert round_distribution(ThresholdStrategy(50)) is dist
+
+
+def test_zero_threshold_banks_immediately():
+    dist = threshold_distribution(0)
+    assert dist.outcomes == {0: 1.0}
+    assert dist.bust_probability == 0.0
+
+
+def test_greedy_is_a_closed_form():
+    dist = round_distribution(GreedyStrategy())
+    assert dist.outcomes == {0: 1.0} and dist.bust_probability == 1.0
+    assert dist.expected_game_score == 0.0
+
+
+def test_expected_game_score_matches_simulation():
+    strategies = [ThresholdStrategy(20), RollLimitStrategy(2), GreedyStrategy()]
+    random.seed(11)
+    result = simulate(["A", "B", "C"], strategies, 2000)
+    for i, strategy in enumerate(strategies):
+        expected = round_distribution(strategy).expected_game_score
+        assert result.totals[i] / result.games == pytest.approx(expected, rel=0.03)
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from dicegame.actions import Roll
+from dicegame.engine import GameEngine
+from dicegame.strategies import BankResolver, RollLimitStrategy, ThresholdStrategy
+from dicegame.types import FixedDice
+
+
+@dataclass
+class CountingThreshold(ThresholdStrategy):
+    calls: int = 0
+
+    def decide_bank_many(self, state, active_ids):
+        self.calls += 1
+        return super().decide_bank_many(state, active_ids)
+
+
+class OddPlayersBank:
+    def decide_bank(self, state, player_id):
+        return player_id % 2 == 1
+
+
+def test_equal_strategies_are_decided_in_one_call():
+    shared = CountingThreshold(5)
+    resolver = BankResolver([shared, CountingThreshold(5), shared, RollLimitStrategy(3)])
+    engine = GameEngine(["A", "B", "C", "D"], FixedDice([6]))
+    engine.step(Roll())
+    assert resolver(engine.state) == 0b0111
+    assert shared.calls == 1
+
+
+def test_only_active_players_are_returned_and_fallback_is_used():
+    resolver = BankResolver([ThresholdStrategy(0), OddPlayersBank(), OddPlayersBank()])
+    engine = GameEngine(["A", "B", "C"], FixedDice([]))
+    assert resolver(engine.state) == 0b011
+    engine.state.round_state.active_mask = 0b100
+    assert resolver(engine.state) == 0
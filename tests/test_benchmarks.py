@@ -0,0 +1,30 @@
+from benchmarks.suite import compare, run_suites
+
+
+def _report(**values):
+    return {
+        "metrics": {
+            name: {"value": value, "unit": "x", "better": better}
+            for name, (value, better) in values.items()
+        }
+    }
+
+
+def test_compare_flags_regressions_in_either_direction():
+    baseline = _report(rate=(100.0, "higher"), latency=(10.0, "lower"))
+    assert compare(baseline, _report(rate=(85.0, "higher"), latency=(11.5, "lower")), 0.2) == []
+    regressions = compare(baseline, _report(rate=(70.0, "higher"), latency=(13.0, "lower")), 0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("rate:")
+
+
+def test_compare_ignores_metrics_missing_from_baseline():
+    assert compare(_report(), _report(new=(1.0, "higher")), 0.1) == []
+
+
+def test_run_suites_reports_engine_metrics():
+    report = run_suites(["engine"], scale=0.01, repeat=1)
+    metrics = report["metrics"]
+    assert metrics["engine.steps_per_sec"]["value"] > 0
+    assert metrics["engine.headless_steps_per_sec"]["better"] == "higher"
+    assert metrics["engine.headless_speedup"]["value"] > 1
@@ -0,0 +1,106 @@
+import pytest
+
+from dicegame import cli
+from dicegame.checkpoint import load_checkpoint
+from dicegame.strategies import RollLimitStrategy, ThresholdStrategy
+
+PLAYERS = ["A", "B"]
+
+
+class ScalarThreshold:
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def __repr__(self):
+        return f"ScalarThreshold({self.threshold})"
+
+    def decide_bank(self, state, player_id):
+        return state.round_state.round_score >= self.threshold
+
+
+def crash_after(monkeypatch, chunks):
+    original = cli.simulate_chunk_rows
+    calls = []
+
+    def flaky(chunk):
+        if len(calls) == chunks:
+            raise KeyboardInterrupt
+        calls.append(chunk.index)
+        return original(chunk)
+
+    monkeypatch.setattr(cli, "simulate_chunk_rows", flaky)
+
+
+def test_resumed_run_is_bit_identical(monkeypatch, tmp_path):
+    strategies = [ScalarThreshold(20), ScalarThreshold(35)]
+    path = str(tmp_path / "run.ckpt")
+    expected = cli.run_simulation(PLAYERS, strategies, 5500, seed=11)
+    crash_after(monkeypatch, 3)
+    with pytest.raises(KeyboardInterrupt):
+        cli.run_simulation(
+            PLAYERS, strategies, 5500, seed=11, checkpoint=path, checkpoint_interval=0
+        )
+    saved = load_checkpoint(path)
+    assert saved.next_chunk == 3 and saved.result.games == 3000 and not saved.complete
+    monkeypatch.undo()
+    resumed = cli.run_simulation(PLAYERS, strategies, 5500, checkpoint=path, resume=True)
+    assert resumed == expected
+    assert load_checkpoint(path).complete
+    # A completed checkpoint returns its result without simulating again.
+    assert cli.run_simulation(PLAYERS, strategies, 5500, checkpoint=path, resume=True) == expected
+
+
+def test_resume_truncates_output_to_checkpoint(monkeypatch, tmp_path):
+    pytest.importorskip("numpy")
+    strategies = [RollLimitStrategy(2), ThresholdStrategy(30)]
+    path = str(tmp_path / "run.ckpt")
+    full = tmp_path / "full.bin"
+    partial = tmp_path / "partial.bin"
+    cli.run_simulation(PLAYERS, strategies, 40000, seed=5, output=str(full))
+    crash_after(monkeypatch, 1)
+    with pytest.raises(KeyboardInterrupt):
+        cli.run_simulation(
+            PLAYERS,
+            strategies,
+            40000,
+            seed=5,
+            output=str(partial),
+            checkpoint=path,
+            checkpoint_interval=0,
+        )
+    monkeypatch.undo()
+    with open(partial, "ab") as handle:
+        handle.write(b"torn block")
+    cli.run_simulation(
+        PLAYERS, strategies, 40000, output=str(partial), checkpoint=path, resume=True
+    )
+    assert partial.read_bytes() == full.read_bytes()
+
+
+def test_resume_rejects_a_different_run(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    strategies = [ScalarThreshold(20), ScalarThreshold(35)]
+    cli.run_simulation(PLAYERS, strategies, 100, seed=1, checkpoint=path)
+    with pytest.raises(ValueError):
+        cli.run_simulation(PLAYERS, strategies, 200, checkpoint=path, resume=True)
+    with pytest.raises(ValueError):
+        cli.run_simulation(PLAYERS, strategies, 100, seed=2, checkpoint=path, resume=True)
+
+
+def test_resume_rejects_a_different_output(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    strategies = [ScalarThreshold(20), ScalarThreshold(35)]
+    first = tmp_path / "first.bin"
+    cli.run_simulation(PLAYERS, strategies, 100, seed=1, output=str(first), checkpoint=path)
+    other = tmp_path / "other.bin"
+    with pytest.raises(ValueError):
+        cli.run_simulation(
+            PLAYERS, strategies, 100, output=str(other), checkpoint=path, resume=True
+        )
+    with pytest.raises(ValueError):
+        cli.run_simulation(PLAYERS, strategies, 100, checkpoint=path, resume=True)
+    assert not other.exists()
+    resumed = cli.run_simulation(
+        PLAYERS, strategies, 100, output=str(first), checkpoint=path, resume=True
+    )
+    assert resumed.games == 100
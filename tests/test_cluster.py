@@ -0,0 +1,109 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from dicegame.cli import parse_strategy, run_simulation
+from dicegame.cluster import Coordinator, run_worker
+
+PLAYERS = ["A", "B", "C"]
+SPECS = ["roll_limit:2", "threshold:25", "greedy"]
+
+
+def start_workers(coordinator, count):
+    host, port = coordinator.address
+    threads = [threading.Thread(target=run_worker, args=(host, port)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def expected(games, seed):
+    return run_simulation(PLAYERS, [parse_strategy(spec) for spec in SPECS], games, seed=seed)
+
+
+def test_cluster_matches_local_run_for_any_worker_count():
+    for workers in (1, 3):
+        coordinator = Coordinator(PLAYERS, SPECS, 20000, seed=21, port=0)
+        coordinator.start()
+        threads = start_workers(coordinator, workers)
+        result = coordinator.wait(timeout=60)
+        for thread in threads:
+            thread.join(timeout=10)
+        assert result == expected(20000, 21)
+
+
+def test_chunks_from_dead_workers_are_reassigned():
+    coordinator = Coordinator(PLAYERS, SPECS, 20000, seed=4, port=0)
+    coordinator.start()
+    # A worker that takes a task and then dies without answering.
+    with socket.create_connection(coordinator.address) as sock:
+        stream = sock.makefile("rwb")
+        stream.write(b'{"type": "ready"}\n')
+        stream.flush()
+        task = json.loads(stream.readline())
+        assert task["type"] == "task" and task["index"] == 0
+        stream.close()
+    threads = start_workers(coordinator, 2)
+    result = coordinator.wait(timeout=60)
+    for thread in threads:
+        thread.join(timeout=10)
+    assert result == expected(20000, 4)
+
+
+def test_expired_leases_are_reassigned():
+    coordinator = Coordinator(PLAYERS, SPECS, 20000, seed=8, port=0, lease_timeout=0.2)
+    coordinator.start()
+    # A stalled worker keeps its connection open but never answers.
+    with socket.create_connection(coordinator.address) as sock:
+        sock.sendall(b'{"type": "ready"}\n')
+        threads = start_workers(coordinator, 1)
+        result = coordinator.wait(timeout=60)
+    for thread in threads:
+        thread.join(timeout=10)
+    assert result == expected(20000, 8)
+
+
+def test_workers_without_numpy_play_batch_chunks_as_scalar(monkeypatch):
+    import dicegame.vectorized as vectorized
+
+    pytest.importorskip("numpy")
+    coordinator = Coordinator(PLAYERS, SPECS, 20000, seed=5, port=0)
+    assert coordinator.task_message(0)["batch"]
+    monkeypatch.setattr(vectorized, "np", None)
+    coordinator.start()
+    host, port = coordinator.address
+    completed = []
+    thread = threading.Thread(target=lambda: completed.append(run_worker(host, port)))
+    thread.start()
+    result = coordinator.wait(timeout=60)
+    thread.join(timeout=10)
+    assert completed and completed[0] > 0
+    assert result.games == 20000 and sum(result.wins) >= 20000
+
+
+def test_malformed_results_are_not_merged():
+    coordinator = Coordinator(PLAYERS, SPECS, 20000, seed=6, port=0)
+    coordinator.start()
+    bad = [
+        {"totals": [0, 0], "wins": [1, 0], "games": 1, "score_squares": [0, 0]},
+        {"totals": [0] * 3, "wins": [1, 0, 0], "games": 1, "score_squares": [0] * 3},
+    ]
+    for result in bad:
+        with socket.create_connection(coordinator.address) as sock:
+            stream = sock.makefile("rwb")
+            stream.write(b'{"type": "ready"}\n')
+            stream.flush()
+            task = json.loads(stream.readline())
+            message = {"type": "result", "index": task["index"], "result": result}
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            # The coordinator drops the connection instead of sending another task.
+            assert stream.readline() == b""
+            stream.close()
+    threads = start_workers(coordinator, 2)
+    result = coordinator.wait(timeout=60)
+    for thread in threads:
+        thread.join(timeout=10)
+    assert result == expected(20000, 6)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from backend import main
+from backend.broadcast import GameBroadcaster
+from backend.models import BankRequest, CreateGameRequest
+from backend.store import InMemoryGameStore
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(main, "store", InMemoryGameStore(event_retention=100_000))
+    monkeypatch.setattr(main, "broadcaster", GameBroadcaster())
+    return main
+
+
+@pytest.fixture
+def contended():
+    # Switch threads as often as possible so unsynchronized steps interleave.
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def test_concurrent_actions_keep_each_game_log_gap_free(api, contended):
+    game_ids = [
+        json.loads(api.create_game(CreateGameRequest(players=["A", "B", "C"])).body)["game_id"]
+        for _ in range(4)
+    ]
+    rng = random.Random(7)
+    calls = [(rng.choice(game_ids), rng.randrange(4)) for _ in range(8000)]
+
+    def fire(call):
+        game_id, choice = call
+        if choice == 3:
+            return game_id, api.roll(game_id)
+        return game_id, api.bank(game_id, BankRequest(player_id=choice))
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        outcomes = list(pool.map(fire, calls))
+
+    returned = {game_id: [] for game_id in game_ids}
+    for game_id, response in outcomes:
+        if response.status_code == 200:
+            body = json.loads(response.body)
+            seqs = [event["seq"] for event in body["events"]]
+            # Each response's events end exactly at the seq it reports.
+            assert not seqs or seqs[-1] == body["latest_seq"]
+            returned[game_id].extend(seqs)
+
+    for game_id in game_ids:
+        session = api.store.get(game_id)
+        log = [event.seq for event in session.events.retained()]
+        assert log == list(range(1, session.latest_seq + 1))
+        # Every event was handed to exactly one caller.
+        assert sorted(returned[game_id]) == log
+
+
+def test_reads_waiting_on_a_game_lock_do_not_block_other_games(api):
+    httpx = pytest.importorskip("httpx")
+    busy, idle = [
+        json.loads(api.create_game(CreateGameRequest(players=["A", "B"])).body)["game_id"]
+        for _ in range(2)
+    ]
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with api.store.get(busy).lock:
+            held.set()
+            release.wait(5)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.perf_counter()
+            blocked = asyncio.create_task(client.get(f"/api/games/{busy}"))
+            await asyncio.sleep(0.05)
+            other = await client.get(f"/api/games/{idle}")
+            elapsed = time.perf_counter() - started
+            release.set()
+            return elapsed, other.status_code, (await blocked).status_code
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait(5)
+    try:
+        elapsed, other_status, blocked_status = asyncio.run(scenario())
+    finally:
+        release.set()
+        holder.join()
+    assert other_status == 200 and blocked_status == 200
+    assert elapsed < 0.5
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.broadcast import GameBroadcaster
+from backend.store import InMemoryGameStore
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "store", InMemoryGameStore())
+    monkeypatch.setattr(main, "broadcaster", GameBroadcaster())
+    return TestClient(main.app)
+
+
+def test_unchanged_game_returns_304_until_an_action(client):
+    game_id = client.post("/api/games", json={"players": ["A", "B"]}).json()["game_id"]
+    first = client.get(f"/api/games/{game_id}")
+    tag = first.headers["etag"]
+    assert first.json()["version"] == 0
+
+    unchanged = client.get(f"/api/games/{game_id}", headers={"If-None-Match": tag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    client.post(f"/api/games/{game_id}/bank", json={"player_id": 0})
+    changed = client.get(f"/api/games/{game_id}", headers={"If-None-Match": tag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != tag
+    assert changed.json()["version"] == 1
+
+
+def test_state_snapshot_is_built_once_per_version(client):
+    game_id = client.post("/api/games", json={"players": ["A", "B"]}).json()["game_id"]
+    session = main.store.get(game_id)
+    assert session.snapshot() is session.snapshot()
+    before = session.snapshot()
+    main.store.apply_action(game_id, main.Bank(0))
+    assert session.snapshot() is not before
+
+
+def test_delta_lists_only_changed_player_fields(client):
+    game_id = client.post("/api/games", json={"players": ["A", "B", "C"]}).json()["game_id"]
+    tag = client.get(f"/api/games/{game_id}").headers["etag"]
+    client.post(f"/api/games/{game_id}/bank", json={"player_id": 1})
+
+    body = client.get(
+        f"/api/games/{game_id}",
+        params={"since_seq": 0, "delta": "true"},
+        headers={"If-None-Match": tag},
+    ).json()
+    assert body["state"] is None
+    delta = body["state_delta"]
+    assert delta["base_version"] == 0
+    assert [player["id"] for player in delta["players"]] == [1]
+    assert delta["players"][0]["round_status"] == "BANKED"
+    assert "name" not in delta["players"][0]
+    assert [event["type"] for event in body["events"]] == ["bank"]
+
+
+def test_delta_falls_back_to_full_state_for_unknown_versions(client):
+    game_id = client.post("/api/games", json={"players": ["A", "B"]}).json()["game_id"]
+    client.post(f"/api/games/{game_id}/bank", json={"player_id": 0})
+    body = client.get(
+        f"/api/games/{game_id}",
+        params={"since_seq": 0, "delta": "true"},
+        headers={"If-None-Match": '"999"'},
+    ).json()
+    assert body["state"] is not None
+    assert body["state_delta"] is None
+
+
+def test_delta_does_not_need_since_seq(client):
+    game_id = client.post("/api/games", json={"players": ["A", "B"]}).json()["game_id"]
+    tag = client.get(f"/api/games/{game_id}").headers["etag"]
+    client.post(f"/api/games/{game_id}/bank", json={"player_id": 0})
+    body = client.get(
+        f"/api/games/{game_id}", params={"delta": "true"}, headers={"If-None-Match": tag}
+    ).json()
+    assert body["state"] is None
+    assert body["state_delta"]["base_version"] == 0
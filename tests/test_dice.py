@@ -0,0 +1,56 @@
+import errno
+import random
+from collections import Counter
+
+import pytest
+
+from dicegame.types import BufferedRandomDice, FixedDice, TapeDice, write_tape
+
+
+def test_buffered_dice_are_uniform_and_reproducible():
+    dice = BufferedRandomDice(rng=random.Random(1), buffer_size=1000)
+    faces = [dice.roll() for _ in range(60000)]
+    counts = Counter(faces)
+    assert set(counts) == {1, 2, 3, 4, 5, 6}
+    assert all(abs(count - 10000) < 500 for count in counts.values())
+    again = BufferedRandomDice(rng=random.Random(1), buffer_size=1000)
+    assert [again.roll() for _ in range(60000)] == faces
+
+
+def test_tape_dice_replays_recorded_faces(tmp_path):
+    path = str(tmp_path / "rolls.tape")
+    write_tape(path, FixedDice([3, 1, 6, 2, 5]), 5, chunk_size=2)
+    dice = TapeDice(path)
+    assert len(dice) == 5
+    assert [dice.roll() for _ in range(5)] == [3, 1, 6, 2, 5]
+    with pytest.raises(IndexError):
+        dice.roll()
+    dice.close()
+
+
+def test_tape_dice_rejects_empty_tape(tmp_path):
+    path = tmp_path / "empty.tape"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        TapeDice(str(path))
+
+
+def test_tape_dice_closes_the_file_when_mapping_fails(monkeypatch, tmp_path):
+    import dicegame.types as types
+
+    path = tmp_path / "rolls.tape"
+    path.write_bytes(b"\x01")
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    def unmappable(*args, **kwargs):
+        raise OSError(errno.ENODEV, "No such device")
+
+    monkeypatch.setattr(types, "open", tracking_open, raising=False)
+    monkeypatch.setattr(types.mmap, "mmap", unmappable)
+    with pytest.raises(OSError):
+        TapeDice(str(path))
+    assert opened and opened[0].closed
@@ -0,0 +1,50 @@
+import json
+import random
+from dataclasses import asdict
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.adapter import event_to_dto, game_state_dto, valid_actions_dto
+from backend.models import GameResponse, encode_game_response
+from dicegame.actions import Bank, Roll
+from dicegame.engine import GameEngine
+from dicegame.types import BufferedRandomDice
+
+
+def _finished_engine() -> GameEngine:
+    engine = GameEngine(["A", "B", "C"], BufferedRandomDice(rng=random.Random(3)))
+    while not engine.state.game_over:
+        rs = engine.state.round_state
+        if rs.round_score >= 25:
+            engine.step(Bank(next(iter(rs.active_players))))
+        else:
+            engine.step(Roll())
+    return engine
+
+
+def test_payloads_match_asdict():
+    engine = _finished_engine()
+    for event in engine.event_log:
+        if event.type == "match_end":
+            summary = event.data["summary"]
+            payload = event_to_dto(1, event).payload["summary"]
+            assert json.loads(json.dumps(payload)) == json.loads(json.dumps(asdict(summary)))
+
+
+@pytest.mark.parametrize("with_state", [True, False])
+def test_encoded_response_matches_pydantic(with_state):
+    engine = _finished_engine()
+    events = [event_to_dto(seq, event) for seq, event in enumerate(engine.event_log, start=1)]
+    response = GameResponse(
+        game_id="g",
+        state=game_state_dto(engine) if with_state else None,
+        events=events,
+        valid_actions=valid_actions_dto(engine),
+        latest_seq=len(events),
+    )
+    encoded = encode_game_response(response)
+    assert json.loads(encoded) == json.loads(response.model_dump_json())
+    # The cached fragments are reused, not re-encoded.
+    assert events[0].json_bytes() is events[0].json_bytes()
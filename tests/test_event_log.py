@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.event_log import EventLog, ResyncRequired
+from backend.models import EventDTO
+
+
+def make_event(seq):
+    return EventDTO(seq=seq, ts_iso="2024-01-01T00:00:00Z", type="roll")
+
+
+def test_since_slices_by_seq():
+    log = EventLog(retention=100)
+    for seq in range(1, 11):
+        log.append(make_event(seq))
+    assert [event.seq for event in log.since(7)] == [8, 9, 10]
+    assert log.since(10) == []
+    assert len(log.since(0)) == 10
+    with pytest.raises(ValueError):
+        log.append(make_event(12))
+
+
+def test_retention_compacts_old_events():
+    log = EventLog(retention=4)
+    for seq in range(1, 12):
+        log.append(make_event(seq))
+    assert log.latest_seq == 11
+    assert log.snapshot_seq == 7
+    assert [event.seq for event in log.retained()] == [8, 9, 10, 11]
+    assert [event.seq for event in log.since(9)] == [10, 11]
+    assert [event.seq for event in log.since(7)] == [8, 9, 10, 11]
+    with pytest.raises(ResyncRequired) as excinfo:
+        log.since(6)
+    assert excinfo.value.snapshot_seq == 7
+
+
+def test_lagging_client_is_told_to_resync(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend import main
+    from backend.store import InMemoryGameStore
+
+    monkeypatch.setattr(main, "store", InMemoryGameStore(event_retention=3))
+    client = TestClient(main.app)
+    game_id = client.post("/api/games", json={"players": ["A", "B", "C"]}).json()["game_id"]
+    for player_id in range(3):
+        client.post(f"/api/games/{game_id}/bank", json={"player_id": player_id})
+    for player_id in range(3):
+        body = client.post(f"/api/games/{game_id}/bank", json={"player_id": player_id}).json()
+    assert body["latest_seq"] == 8
+    caught_up = client.get(f"/api/games/{game_id}?since_seq=6").json()
+    assert not caught_up["resync_required"]
+    assert [event["seq"] for event in caught_up["events"]] == [7, 8]
+    behind = client.get(f"/api/games/{game_id}?since_seq=2").json()
+    assert behind["resync_required"]
+    assert behind["snapshot_seq"] == 5
+    assert [event["seq"] for event in behind["events"]] == [6, 7, 8]
@@ -0,0 +1,231 @@
+import json
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.eviction import ARCHIVE_VERSION, EvictionPolicy, SessionArchive
+from backend.models import RawEvent
+from backend.sqlite_store import SqliteGameStore
+from backend.store import InMemoryGameStore
+from dicegame.actions import Bank, Roll
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _act(store, game_id, rng):
+    session = store.get(game_id)
+    rs = session.engine.state.round_state
+    if session.engine.state.game_over:
+        return False
+    if rs.round_score >= 20 and rng.random() < 0.5:
+        store.apply_action(game_id, Bank(rng.choice(list(rs.active_players))))
+    else:
+        store.apply_action(game_id, Roll())
+    return True
+
+
+def _finish(store, game_id, seed=0):
+    rng = random.Random(seed)
+    while _act(store, game_id, rng):
+        pass
+
+
+def _view(session):
+    return (
+        session.version,
+        list(session.engine.state.totals),
+        session.engine.state.round_state.round_index,
+        [event.json_bytes() for event in session.events.retained()],
+    )
+
+
+def _store(tmp_path, **policy):
+    return InMemoryGameStore(
+        policy=EvictionPolicy(**policy), archive=SessionArchive(str(tmp_path / "archive"))
+    )
+
+
+def test_finished_games_are_compacted():
+    store = InMemoryGameStore()
+    session = store.create(["A", "B", "C"])
+    rng = random.Random(1)
+    while not session.engine.state.game_over:
+        _act(store, session.game_id, rng)
+        if not session.engine.state.game_over:
+            before = session.approx_bytes()
+    assert session.engine.event_log == []
+    assert all(isinstance(event, RawEvent) for event in session.events.retained())
+    assert session.approx_bytes() < before / 3
+
+
+def test_lru_sessions_spill_and_reload(tmp_path):
+    store = _store(tmp_path, max_sessions=2)
+    first = store.create(["A", "B"])
+    _finish(store, first.game_id)
+    expected = _view(first)
+    second = store.create(["A", "B"]).game_id
+    store.create(["A", "B"])
+    assert len(store) == 2 and store.spilled_count() == 1
+    assert first.evicted
+
+    reloaded = store.get(first.game_id)
+    assert reloaded is not first
+    assert _view(reloaded) == expected
+    # Reloading pushed the least recently used session out instead.
+    assert store.spilled_count() == 1 and second in store.archive
+
+
+def test_idle_sessions_expire(tmp_path):
+    clock = FakeClock()
+    store = InMemoryGameStore(
+        policy=EvictionPolicy(idle_ttl=60),
+        archive=SessionArchive(str(tmp_path / "archive")),
+        clock=clock,
+    )
+    idle = store.create(["A", "B"]).game_id
+    clock.now = 30
+    active = store.create(["A", "B"]).game_id
+    clock.now = 70
+    assert store.evict() == 1
+    assert idle in store.archive and active not in store.archive
+
+
+def test_byte_budget(tmp_path):
+    store = _store(tmp_path, max_bytes=200_000)
+    game_ids = [store.create(["A", "B", "C"]).game_id for _ in range(6)]
+    for game_id in game_ids:
+        _act(store, game_id, random.Random(0))
+    assert store.resident_bytes() <= 200_000
+    assert len(store) + store.spilled_count() == 6
+
+
+def test_actions_follow_a_session_evicted_under_them(tmp_path):
+    store = _store(tmp_path, max_sessions=1)
+    stale = store.create(["A", "B"])
+    store.create(["A", "B"])
+    assert stale.evicted
+    store.apply_action(stale.game_id, Roll())
+    assert store.get(stale.game_id).version == 1
+    assert stale.version == 0
+
+
+def test_concurrent_actions_survive_eviction(tmp_path):
+    store = _store(tmp_path, max_sessions=3)
+    game_ids = [store.create(["A", "B", "C"]).game_id for _ in range(8)]
+    rng = random.Random(5)
+    calls = [rng.choice(game_ids) for _ in range(2000)]
+
+    def fire(game_id):
+        try:
+            store.apply_action(game_id, Roll())
+            return game_id
+        except ValueError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        applied = [game_id for game_id in pool.map(fire, calls) if game_id]
+    for game_id in game_ids:
+        session = store.get(game_id)
+        assert session.version == applied.count(game_id)
+        seqs = [event.seq for event in session.events.retained()]
+        assert seqs == list(range(1, session.latest_seq + 1))
+
+
+def test_sqlite_store_evicts_without_archive(tmp_path):
+    store = SqliteGameStore(str(tmp_path / "games.db"), policy=EvictionPolicy(max_sessions=1))
+    first = store.create(["A", "B"])
+    _finish(store, first.game_id)
+    expected = _view(first)
+    store.create(["A", "B"])
+    assert len(store) == 1 and store.spilled_count() == 1
+    assert _view(store.get(first.game_id)) == expected
+    store.close()
+
+
+def test_archive_is_versioned_json_and_survives_a_restart(tmp_path):
+    store = _store(tmp_path, max_sessions=1)
+    first = store.create(["A", "B"])
+    _finish(store, first.game_id)
+    expected = _view(first)
+    store.create(["A", "B"])
+    with open(tmp_path / "archive" / f"{first.game_id}.gz", "rb") as handle:
+        payload = json.loads(zlib.decompress(handle.read()))
+    assert payload["version"] == ARCHIVE_VERSION and payload["game_id"] == first.game_id
+
+    restarted = _store(tmp_path, max_sessions=1)
+    assert _view(restarted.get(first.game_id)) == expected
+
+
+class SlowArchive(SessionArchive):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.saving = threading.Event()
+        self.release = threading.Event()
+
+    def save(self, archived):
+        self.saving.set()
+        assert self.release.wait(5)
+        return super().save(archived)
+
+
+def test_spilling_does_not_hold_the_store_lock(tmp_path):
+    archive = SlowArchive(str(tmp_path / "archive"))
+    store = InMemoryGameStore(policy=EvictionPolicy(max_sessions=1), archive=archive)
+    spilled = store.create(["A", "B"]).game_id
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        creating = pool.submit(store.create, ["A", "B"], "new")
+        assert archive.saving.wait(5)
+        # Other games are served while the spilled one is being written out.
+        assert pool.submit(store.get, "new").result(timeout=1).game_id == "new"
+        # The spilled game itself waits until it can be loaded back.
+        acting = pool.submit(store.apply_action, spilled, Roll())
+        time.sleep(0.05)
+        assert not acting.done()
+        archive.release.set()
+        creating.result(timeout=5)
+        acting.result(timeout=5)
+    assert store.get(spilled).version == 1
+
+
+def test_eviction_is_opt_in(monkeypatch):
+    for name in ("DICEGAME_IDLE_TTL", "DICEGAME_MAX_SESSIONS", "DICEGAME_MAX_SESSION_BYTES"):
+        monkeypatch.delenv(name, raising=False)
+    assert not EvictionPolicy.from_env().enabled
+    monkeypatch.setenv("DICEGAME_MAX_SESSIONS", "5")
+    assert EvictionPolicy.from_env() == EvictionPolicy(max_sessions=5)
+    with pytest.raises(ValueError):
+        InMemoryGameStore(policy=EvictionPolicy.from_env())
+
+
+def test_sqlite_eviction_waits_for_the_last_commit(tmp_path, monkeypatch):
+    store = SqliteGameStore(str(tmp_path / "games.db"), policy=EvictionPolicy(max_sessions=1))
+    game_id = store.create(["A", "B"]).game_id
+    other = store.create(["A", "B"]).game_id
+    store.get(game_id)
+    commit = store._writer._commit
+
+    def slow_commit(batch):
+        time.sleep(0.2)
+        commit(batch)
+
+    monkeypatch.setattr(store._writer, "_commit", slow_commit)
+    with store.locked(game_id):
+        _, durable = store.submit_action(game_id, Roll())
+    # Loading the other game evicts this one before the action's commit lands.
+    store.get(other)
+    assert store.get(game_id).version == 1
+    durable()
+    store.apply_action(game_id, Roll())
+    store.close()
@@ -0,0 +1,174 @@
+import pytest
+
+from dicegame.actions import Bank, Roll
+from dicegame.cli import run_simulation
+from dicegame.engine import GameEngine
+from dicegame.strategies import BankResolver, LookaheadStrategy, ThresholdStrategy
+from dicegame.rollout import play_to_end
+from dicegame.strategies import lookahead
+from dicegame.types import FixedDice
+
+
+def last_round_engine(totals, round_score, active_mask):
+    engine = GameEngine(["A", "B"], FixedDice([]))
+    engine.state.totals[:] = totals
+    rs = engine.state.round_state
+    rs.round_index = 30
+    rs.match_index = 3
+    rs.round_score = round_score
+    rs.active_mask = active_mask
+    return engine
+
+
+def test_fork_copies_mutable_state_and_skips_events():
+    engine = GameEngine(["A", "B"], FixedDice([5, 4]))
+    engine.step(Roll())
+    fork = engine.fork(dice=FixedDice([6, 1]))
+    assert fork.step(Roll()) == []
+    fork.step(Bank(0))
+    assert fork.state.round_state.round_score == 11
+    assert engine.state.round_state.round_score == 5
+    assert engine.state.totals == [0, 0]
+    assert fork.state.totals == [11, 0]
+    assert fork.event_log == []
+    assert len(engine.event_log) == 1
+    assert fork.state.stats[0] is not engine.state.stats[0]
+
+
+def test_recording_fork_keeps_history():
+    engine = GameEngine(["A", "B"], FixedDice([5]))
+    engine.step(Roll())
+    fork = engine.fork(dice=FixedDice([3]), record_events=True)
+    fork.step(Roll())
+    assert [e.type for e in fork.event_log] == ["roll", "roll"]
+    assert len(engine.event_log) == 1
+
+
+def test_headless_engines_cannot_fork_with_events():
+    engine = GameEngine(["A", "B"], FixedDice([5]), headless=True)
+    with pytest.raises(ValueError):
+        engine.fork(record_events=True)
+
+
+def test_lookahead_banks_a_winning_lead():
+    engine = last_round_engine([0, 5], round_score=20, active_mask=0b01)
+    strategy = LookaheadStrategy(time_budget=1.0, max_rollouts=50, seed=1)
+    assert strategy.decide_bank(engine.state, 0)
+
+
+def test_lookahead_keeps_rolling_when_banking_cannot_win():
+    engine = last_round_engine([0, 100], round_score=10, active_mask=0b01)
+    strategy = LookaheadStrategy(time_budget=1.0, max_rollouts=50, seed=1)
+    assert not strategy.decide_bank(engine.state, 0)
+
+
+def test_seeded_lookahead_plays_a_fixed_number_of_rollouts(monkeypatch):
+    import dicegame.vectorized as vectorized
+
+    played = []
+    play_from = vectorized.play_from
+
+    def counting(start, strategies, games, rng, **kwargs):
+        played.append(games)
+        return play_from(start, strategies, games, rng, **kwargs)
+
+    monkeypatch.setattr(vectorized, "play_from", counting)
+    engine = last_round_engine([0, 5], round_score=20, active_mask=0b11)
+    decisions = []
+    for budget in (0.001, 0.001, 0.004, 10.0):
+        played.clear()
+        strategy = LookaheadStrategy(time_budget=budget, max_rollouts=5000, seed=7)
+        decisions.append(strategy.decide_bank(engine.state, 0))
+        # Both branches roll on, each playing the whole fixed count.
+        assert sum(played) == 2 * strategy.rollout_limit(lookahead.SEEDED_BATCHED_ROLLOUTS_PER_MS)
+        assert sum(played) == 2 * min(int(budget * 1000 * 200), 5000)
+    assert decisions[0] == decisions[1]
+
+
+def test_seeded_lookahead_runs_keep_to_their_budget():
+    import time
+
+    from dicegame.cli import parse_strategy
+
+    started = time.perf_counter()
+    result = run_simulation(
+        ["A", "B"], [parse_strategy("lookahead:2"), ThresholdStrategy(25)], games=2, seed=3
+    )
+    assert result.games == 2
+    # About 150 decisions per game at ~2 ms each; the fixed 20,000 rollouts took seconds.
+    assert time.perf_counter() - started < 3.0
+
+
+def test_rollouts_stop_when_the_window_closes_the_round(monkeypatch):
+    engine = last_round_engine([0, 3], round_score=40, active_mask=0b11)
+    engine.state.round_state.round_index = 29
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rolled into the next round")
+
+    monkeypatch.setattr(lookahead, "play_to_end", fail)
+    policy = BankResolver([ThresholdStrategy(30)] * 2)
+    assert LookaheadStrategy()._rollout(engine.state, 0, 0b11, seed=1, policy=policy) == (0, -3)
+
+
+def test_rollouts_end_with_the_current_round():
+    engine = GameEngine(["A", "B"], FixedDice([4, 1]))
+    policy = BankResolver([ThresholdStrategy(100)] * 2)
+    assert play_to_end(engine, policy, last_round=1) == [0, 0]
+    assert engine.state.round_state.round_index == 2 and not engine.state.game_over
+
+
+def test_play_from_can_skip_the_first_window():
+    np = pytest.importorskip("numpy")
+    from dicegame.vectorized import BatchStart, play_from
+
+    start = BatchStart([0, 0], 0b11, 0, 0, 30, 1, 1)
+    strategies = [ThresholdStrategy(0)] * 2
+    banked = play_from(start, strategies, 64, np.random.default_rng(0))
+    rolled = play_from(start, strategies, 64, np.random.default_rng(0), first_window=False)
+    assert not banked.any()
+    assert rolled.any() and (rolled[:, 0] == rolled[:, 1]).all()
+
+
+def test_seeded_simulations_with_lookahead_reproduce():
+    def run():
+        strategies = [LookaheadStrategy(time_budget=10.0, max_rollouts=16), ThresholdStrategy(25)]
+        return run_simulation(["A", "B"], strategies, games=3, seed=11)
+
+    assert run() == run()
+
+
+def test_snapshot_round_trips_as_versioned_json():
+    import json
+    import random
+    from dataclasses import asdict
+
+    from dicegame.types import RandomDice
+
+    engine = GameEngine(["A", "B", "C"], RandomDice(random.Random(7)))
+    rng = random.Random(8)
+    while engine.state.round_state.round_index < 14:
+        rs = engine.state.round_state
+        if rs.round_score >= 15 and rng.random() < 0.5:
+            engine.step(Bank(next(iter(rs.active_players))))
+        else:
+            engine.step(Roll())
+    data = engine.to_snapshot()
+    payload = json.loads(data)
+    assert payload["version"] == 1
+    assert payload["state"] == json.loads(json.dumps(asdict(engine.state)))
+
+    restored = GameEngine.from_snapshot(data, FixedDice([]))
+    assert restored.state == engine.state
+    assert restored._match_start_stats == engine._match_start_stats
+    assert restored._match_start_totals == engine._match_start_totals
+    # Both finish the game identically, match summaries included.
+    policy = BankResolver([ThresholdStrategy(25)] * 3)
+    for copy in (engine, restored):
+        copy.dice = RandomDice(random.Random(10))
+        play_to_end(copy, policy)
+    assert len(engine.state.match_summaries) == 3
+    assert restored.state == engine.state
+
+    with pytest.raises(ValueError):
+        GameEngine.from_snapshot(json.dumps({"version": 0}).encode(), FixedDice([]))
@@ -0,0 +1,51 @@
+import random
+
+from dicegame.actions import Bank, Roll
+from dicegame.engine import GameEngine
+from dicegame.types import FixedDice
+
+
+def play(engine: GameEngine) -> None:
+    while not engine.state.game_over:
+        rs = engine.state.round_state
+        if rs.round_score >= 12:
+            for pid in sorted(rs.active_players):
+                if pid != rs.round_index % 3:
+                    engine.step(Bank(pid))
+        if engine.state.round_state.active_players and not engine.state.game_over:
+            engine.step(Roll())
+
+
+def test_headless_matches_full_engine_counters():
+    rng = random.Random(3)
+    rolls = [rng.randint(1, 6) for _ in range(5000)]
+    full = GameEngine(["A", "B", "C"], FixedDice(list(rolls)))
+    headless = GameEngine(["A", "B", "C"], FixedDice(list(rolls)), headless=True, record_stats=True)
+    play(full)
+    play(headless)
+    assert headless.state.totals == full.state.totals
+    for fast, slow in zip(headless.state.stats, full.state.stats):
+        assert fast.voluntary_banks_count == slow.voluntary_banks_count
+        assert fast.forced_zero_banks_count == slow.forced_zero_banks_count
+        assert fast.missed_points == slow.missed_points
+        assert fast.ones_rolled == slow.ones_rolled
+        assert fast.avg_voluntary_bank == slow.avg_voluntary_bank
+        assert fast.avg_rolls_elapsed_before_bank == slow.avg_rolls_elapsed_before_bank
+
+
+def test_headless_records_no_history():
+    engine = GameEngine(["A", "B"], FixedDice([6, 1]), headless=True)
+    assert engine.step(Roll()) == []
+    assert engine.step(Bank(0)) == []
+    assert engine.step(Roll()) == []
+    assert engine.event_log == []
+    assert engine.state.match_summaries == []
+    assert engine.state.stats[0].voluntary_banks_count == 0
+    assert engine.state.stats[0].rolls_taken_as_roller == 0
+    assert engine.state.round_state.round_index == 2
+    counted = GameEngine(["A", "B"], FixedDice([6, 1]), headless=True, record_stats=True)
+    counted.step(Roll())
+    counted.step(Bank(0))
+    assert counted.step(Roll()) == []
+    assert counted.state.stats[0].avg_voluntary_bank == 6
+    assert counted.state.stats[1].forced_zero_banks_count == 1
@@ -0,0 +1,101 @@
+import sys
+import threading
+
+import pytest
+
+from dicegame.actions import Bank, Roll
+from dicegame.engine import GameEngine
+from dicegame.metrics import MetricsRegistry
+from dicegame.types import FixedDice
+
+
+def test_engine_observers_see_every_logged_event():
+    engine = GameEngine(["A", "B"], FixedDice([3, 1]))
+    seen = []
+    engine.add_observer(seen.append)
+    engine.step(Roll())
+    engine.step(Bank(0))
+    engine.step(Roll())
+    assert [event.type for event in seen] == ["roll", "bank", "roll", "bust", "round_end"]
+    assert seen == engine.event_log
+    engine.remove_observer(seen.append)
+    assert not engine.observers
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    actions = registry.counter("actions_total", "Actions")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    registry.gauge("sessions", "Sessions", lambda: 3)
+    actions.inc(action="roll")
+    actions.inc(2, action="roll")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+    text = registry.render()
+    assert 'actions_total{action="roll"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert "sessions 3" in text
+    with pytest.raises(ValueError):
+        registry.counter("sessions", "Duplicate")
+
+
+def test_concurrent_updates_are_not_lost_and_labels_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "C")
+    histogram = registry.histogram("h_seconds", "H")
+
+    def work():
+        for _ in range(20000):
+            counter.inc()
+            histogram.observe(0.01)
+
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous)
+    assert counter.value() == 80000
+    assert histogram.count == 80000 and sum(histogram.counts) == 80000
+
+    counter.inc(kind='say "hi"\\\n')
+    assert 'c_total{kind="say \\"hi\\"\\\\\\n"} 1' in registry.render()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter("c_total", "C")
+    histogram = registry.histogram("h_seconds", "H")
+    counter.inc()
+    histogram.observe(1.0)
+    with histogram.time():
+        pass
+    assert counter.value() == 0
+    assert histogram.count == 0
+
+
+def test_backend_exposes_metrics_and_round_end_events():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    client = TestClient(app)
+    game = client.post("/api/games", json={"players": ["A", "B"]}).json()
+    game_id = game["game_id"]
+    for player_id in (0, 1):
+        response = client.post(f"/api/games/{game_id}/bank", json={"player_id": player_id})
+    assert [event["type"] for event in response.json()["events"]] == ["bank", "round_end"]
+    text = client.get("/metrics").text
+    assert 'dicegame_actions_total{action="bank",outcome="ok"}' in text
+    assert 'dicegame_events_total{type="round_end"}' in text
+    assert "dicegame_live_sessions" in text
@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dicegame.cli import simulate
+from dicegame.solver import ensure_policy_table, load_policy_table
+from dicegame.strategies import OptimalStrategy, ThresholdStrategy
+from dicegame.vectorized import simulate_batch
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp("policy")
+    return ensure_policy_table(20, max_diff=150, max_score=80, cache_dir=cache_dir)
+
+
+def test_policy_table_is_cached_and_memory_mapped(table_path):
+    cached = ensure_policy_table(20, max_diff=150, max_score=80, cache_dir=table_path.parent)
+    assert cached == table_path
+    table = load_policy_table(table_path)
+    assert isinstance(table, np.memmap)
+    assert table.shape == (2, 30, 301, 81)
+
+
+def test_optimal_strategy_pickles_without_table(table_path):
+    strategy = OptimalStrategy(str(table_path))
+    assert strategy.table is not None
+    clone = pickle.loads(pickle.dumps(strategy))
+    assert clone._table is None
+    assert clone == strategy
+
+
+def test_optimal_strategy_beats_weaker_threshold(table_path):
+    players = ["Optimal", "Threshold"]
+    strategies = [OptimalStrategy(str(table_path)), ThresholdStrategy(10)]
+    scalar = simulate(players, strategies, 400, seed=3)
+    batch = simulate_batch(players, strategies, 4000, rng=np.random.default_rng(3))
+    assert scalar.wins[0] > scalar.wins[1]
+    assert batch.wins[0] / batch.games == pytest.approx(scalar.wins[0] / scalar.games, abs=0.08)
@@ -0,0 +1,44 @@
+from dicegame import cli
+from dicegame.cli import simulate
+from dicegame.strategies import RollLimitStrategy, ThresholdStrategy
+
+
+def test_seeded_simulation_is_independent_of_worker_count(monkeypatch):
+    monkeypatch.setattr(cli, "SCALAR_CHUNK_GAMES", 40)
+    players = ["A", "B", "C"]
+    strategies = [ThresholdStrategy(20), RollLimitStrategy(2), ThresholdStrategy(60)]
+    serial = simulate(players, strategies, 200, seed=42, workers=1)
+    parallel = simulate(players, strategies, 200, seed=42, workers=3)
+    assert serial == parallel
+    assert serial.games == 200
+    assert sum(serial.wins) >= 200
+
+
+def test_different_seeds_differ():
+    players = ["A", "B"]
+    strategies = [ThresholdStrategy(20), RollLimitStrategy(2)]
+    assert simulate(players, strategies, 50, seed=1) != simulate(players, strategies, 50, seed=2)
+
+
+def test_target_ci_stops_early_and_is_worker_independent(monkeypatch):
+    monkeypatch.setattr(cli, "SCALAR_CHUNK_GAMES", 50)
+    monkeypatch.setattr(cli, "BATCH_CHUNK_GAMES", 50)
+    players = ["A", "B"]
+    strategies = [ThresholdStrategy(20), RollLimitStrategy(2)]
+    serial = cli.run_simulation(players, strategies, 5000, seed=9, target_ci=0.05)
+    parallel = cli.run_simulation(players, strategies, 5000, seed=9, workers=2, target_ci=0.05)
+    assert serial == parallel
+    assert serial.games < 5000
+    assert serial.games % 50 == 0
+    win_widths, score_widths = cli.confidence_intervals(serial)
+    assert max(win_widths) <= 0.05
+    assert all(width > 0 for width in score_widths)
+
+
+def test_target_ci_respects_game_budget(monkeypatch):
+    monkeypatch.setattr(cli, "SCALAR_CHUNK_GAMES", 50)
+    monkeypatch.setattr(cli, "BATCH_CHUNK_GAMES", 50)
+    players = ["A", "B"]
+    strategies = [ThresholdStrategy(20), RollLimitStrategy(2)]
+    result = cli.run_simulation(players, strategies, 120, seed=9, target_ci=1e-6)
+    assert result.games == 120
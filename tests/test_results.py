@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dicegame.cli import run_simulation, run_single_game
+from dicegame.results import ResultsFile, ResultsWriter
+from dicegame.strategies import ThresholdStrategy
+from dicegame.types import BufferedRandomDice
+
+
+class ScalarThreshold:
+    """Threshold banking without an array predicate, forcing the scalar path."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def decide_bank(self, state, player_id):
+        return state.round_state.round_score >= self.threshold
+
+
+def test_blocks_round_trip(tmp_path):
+    path = tmp_path / "rows.bin"
+    with ResultsWriter(str(path), ["A", "B"]) as writer:
+        for start in (0, 2):
+            writer.write_block(
+                {
+                    "game": [start, start + 1],
+                    "chunk_seed": [2**63 + start] * 2,
+                    "chunk_game": [0, 1],
+                    "winner": [0, 1],
+                    "total": [10, 5, 3, 7],
+                    "ones_rolled": [1, 2, 3, 4],
+                    "voluntary_banks": [5, 6, 7, 8],
+                    "forced_zero_banks": [0, 0, 0, 0],
+                    "missed_points": [2**40, 0, 0, 0],
+                    "rolls_taken_as_roller": [9, 9, 9, 9],
+                }
+            )
+    with ResultsFile(str(path)) as results:
+        assert results.players == ["A", "B"]
+        assert results.games == 4
+        assert results.column("game").tolist() == [0, 1, 2, 3]
+        assert results.column("chunk_seed")[0] == 2**63
+        assert results.column("total").tolist() == [[10, 5], [3, 7], [10, 5], [3, 7]]
+        summary = results.summary()
+    assert summary.avg_total == [6.5, 6.0]
+    assert summary.win_rate == [0.5, 0.5]
+    assert summary.stat_totals["missed_points"] == [2**41, 0]
+
+
+@pytest.mark.parametrize("strategy", [ThresholdStrategy, ScalarThreshold])
+def test_simulation_output_matches_aggregates(tmp_path, strategy):
+    path = tmp_path / "games.bin"
+    players = ["A", "B", "C"]
+    strategies = [strategy(15), strategy(30), strategy(45)]
+    result = run_simulation(players, strategies, 1500, seed=4, output=str(path))
+    assert result == run_simulation(players, strategies, 1500, seed=4)
+    with ResultsFile(str(path)) as results:
+        summary = results.summary()
+        winners = results.column("winner")
+        totals = results.column("total")
+        chunk_seeds = results.column("chunk_seed")
+        chunk_games = results.column("chunk_game")
+    assert summary.games == result.games
+    assert summary.avg_total == [total / result.games for total in result.totals]
+    assert summary.win_rate == [wins / result.games for wins in result.wins]
+    tied = (totals == totals.max(axis=1, keepdims=True)).sum(axis=1) > 1
+    assert tied.any()
+    assert ((winners == -1) == tied).all()
+    assert (totals[~tied].argmax(axis=1) == winners[~tied]).all()
+    starts = np.r_[True, chunk_seeds[1:] != chunk_seeds[:-1]]
+    assert (chunk_games[starts] == 0).all() and (np.diff(chunk_games)[~starts[1:]] == 1).all()
+    if strategy is ScalarThreshold:
+        # A row replays from its chunk's seed after the games before it in the chunk.
+        row = 1234
+        dice = BufferedRandomDice(rng=random.Random(int(chunk_seeds[row])))
+        for _ in range(int(chunk_games[row]) + 1):
+            scores = run_single_game(players, strategies, dice)
+        assert scores == totals[row].tolist()
+    # Every player either banks or is caught by the bust once per round.
+    stats = summary.stat_totals
+    assert [a + b for a, b in zip(stats["voluntary_banks"], stats["forced_zero_banks"])] == [
+        30 * result.games
+    ] * 3
@@ -0,0 +1,57 @@
+from dicegame.actions import Bank, Roll
+from dicegame.engine import GameEngine
+from dicegame.state import RoundState
+from dicegame.types import FixedDice
+
+
+def make_round(mask: int) -> RoundState:
+    return RoundState(
+        round_index=1,
+        match_index=1,
+        round_score=0,
+        active_mask=mask,
+        roller_index=0,
+        starter_index=0,
+        rolls_elapsed_in_round=0,
+    )
+
+
+def test_active_players_view_tracks_mask():
+    rs = make_round(0b1011)
+    view = rs.active_players
+    assert list(view) == [0, 1, 3]
+    assert len(view) == 3
+    assert 3 in view and 2 not in view and -1 not in view
+    assert view == {0, 1, 3}
+    view.remove(1)
+    assert rs.active_mask == 0b1001
+    rs.active_players = {2}
+    assert list(view) == [2]
+    view.discard(2)
+    assert not view
+
+
+def test_next_active_wraps_around():
+    engine = GameEngine(["A", "B", "C", "D"], FixedDice([]))
+    rs = engine.state.round_state
+    rs.active_mask = 0b0101
+    assert engine._next_active_index(0) == 2
+    assert engine._next_active_index(2) == 0
+    assert engine._next_active_index(3) == 0
+    rs.active_mask = 0b0100
+    assert engine._next_active_index(2) == 2
+
+
+def test_bank_removes_player_and_roll_skips_banked_roller():
+    engine = GameEngine(["A", "B", "C"], FixedDice([4, 5]))
+    engine.step(Roll())
+    engine.step(Bank(0))
+    assert engine.state.round_state.active_players == {1, 2}
+    events = engine.step(Roll())
+    assert events[0].data["player_id"] == 1
+
+
+def test_state_objects_are_slotted():
+    engine = GameEngine(["A", "B"], FixedDice([]))
+    for obj in (engine.state, engine.state.round_state, engine.state.stats[0], engine.players[0]):
+        assert not hasattr(obj, "__dict__")
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+from collections import Counter
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from backend import gateway
+from backend.sharding import HashRing, ShardClient, serve_shard, socket_paths, start_owners
+from backend.sqlite_store import SqliteGameStore
+from backend.store import InMemoryGameStore
+
+
+def test_ring_spreads_keys_and_moves_few_on_growth():
+    keys = [f"game-{index}" for index in range(20000)]
+    ring = HashRing(["a", "b", "c", "d"])
+    assert [ring.owner(key) for key in keys[:50]] == [
+        HashRing(["a", "b", "c", "d"]).owner(key) for key in keys[:50]
+    ]
+    counts = Counter(ring.owner(key) for key in keys)
+    assert min(counts.values()) > 0.7 * len(keys) / 4
+
+    grown = HashRing(["a", "b", "c", "d", "e"])
+    moved = [key for key in keys if grown.owner(key) != ring.owner(key)]
+    # Only keys taken over by the new node move.
+    assert all(grown.owner(key) == "e" for key in moved)
+    assert len(moved) < 0.3 * len(keys)
+
+
+def test_stores_reject_taken_game_ids(tmp_path):
+    durable = SqliteGameStore(str(tmp_path / "games.db"))
+    for store in (InMemoryGameStore(), durable):
+        assert store.create(["A", "B"], game_id="g1").game_id == "g1"
+        with pytest.raises(ValueError):
+            store.create(["A", "B"], game_id="g1")
+    durable.close()
+
+
+@pytest.fixture(scope="module")
+def shards():
+    # Unix socket paths are length-limited, so keep them short.
+    directory = tempfile.mkdtemp(prefix="dg-")
+    owners = start_owners(directory, 2)
+    yield socket_paths(directory, 2)
+    for process in owners:
+        process.terminate()
+        process.wait()
+
+
+@pytest.fixture
+def run(shards, monkeypatch):
+    monkeypatch.setenv("DICEGAME_SHARDS", ",".join(shards))
+
+    def run(scenario):
+        async def main():
+            transport = httpx.ASGITransport(app=gateway.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                try:
+                    return await scenario(client)
+                finally:
+                    await gateway.client().close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_gateway_routes_games_to_their_owners(run):
+    async def scenario(client):
+        created = [
+            (await client.post("/api/games", json={"players": ["A", "B"]})).json()
+            for _ in range(8)
+        ]
+        game_id = created[0]["game_id"]
+        rolled = await client.post(f"/api/games/{game_id}/roll")
+        polled = await client.get(f"/api/games/{game_id}", params={"since_seq": 0})
+        unchanged = await client.get(
+            f"/api/games/{game_id}", headers={"If-None-Match": polled.headers["etag"]}
+        )
+        bad_bank = await client.post(f"/api/games/{game_id}/bank", json={"player_id": 9})
+        missing = await client.post("/api/games/nope/roll")
+        owners = {gateway.client().owner(game["game_id"]) for game in created}
+        return rolled, polled, unchanged, bad_bank, missing, owners
+
+    rolled, polled, unchanged, bad_bank, missing, owners = run(scenario)
+    assert rolled.status_code == 200 and rolled.json()["version"] == 1
+    assert polled.json()["latest_seq"] == rolled.json()["latest_seq"]
+    assert polled.headers["x-latest-seq"] == str(rolled.json()["latest_seq"])
+    assert unchanged.status_code == 304
+    assert bad_bank.status_code == 400 and "valid_actions" in bad_bank.json()
+    assert missing.status_code == 404 and missing.json() == {"detail": "Game not found"}
+    assert len(owners) == 2
+
+
+def test_concurrent_actions_stay_ordered_per_game(run):
+    async def scenario(client):
+        game_ids = [
+            (await client.post("/api/games", json={"players": ["A", "B", "C"]})).json()["game_id"]
+            for _ in range(6)
+        ]
+        rng = random.Random(3)
+        calls = [rng.choice(game_ids) for _ in range(600)]
+        replies = await asyncio.gather(
+            *(client.post(f"/api/games/{game_id}/roll") for game_id in calls)
+        )
+        logs = {}
+        for game_id in game_ids:
+            logs[game_id] = (await client.get(f"/api/games/{game_id}")).json()
+        return calls, replies, logs
+
+    calls, replies, logs = run(scenario)
+    for game_id, game in logs.items():
+        applied = [
+            reply.json()["version"]
+            for call, reply in zip(calls, replies)
+            if call == game_id and reply.status_code == 200
+        ]
+        assert sorted(applied) == list(range(1, game["version"] + 1))
+        seqs = [event["seq"] for event in game["events"]]
+        assert seqs == list(range(1, game["latest_seq"] + 1))
+
+
+def test_stream_relays_updates_and_keepalives(run):
+    async def scenario(client):
+        game_id = (await client.post("/api/games", json={"players": ["A", "B"]})).json()["game_id"]
+        first = await gateway.client().forward(game_id, {"op": "get", "since_seq": None})
+        messages = gateway.sse_messages(game_id, first, heartbeat=0.05)
+        received = [await messages.__anext__(), await messages.__anext__()]
+        await client.post(f"/api/games/{game_id}/roll")
+        received.append(await messages.__anext__())
+        await messages.aclose()
+        return received
+
+    update, keepalive, after_roll = run(scenario)
+    assert update.startswith("id: 0\nevent: update\n")
+    assert keepalive == ": keepalive\n\n"
+    data = json.loads(after_roll.split("data: ", 1)[1])
+    assert after_roll.startswith(f"id: {data['latest_seq']}\n") and data["version"] == 1
+
+
+def test_shard_metrics_are_forwarded(run):
+    async def scenario(client):
+        return [(await client.get(f"/metrics/shards/{index}")) for index in (0, 1, 2)]
+
+    first, second, missing = run(scenario)
+    assert "dicegame_live_sessions" in first.text and "dicegame_live_sessions" in second.text
+    assert missing.status_code == 404
+
+
+
+def test_owners_spill_to_their_own_archives(monkeypatch):
+    monkeypatch.setenv("DICEGAME_MAX_SESSIONS", "1")
+    directory = tempfile.mkdtemp(prefix="dg-")
+    archive = os.path.join(directory, "archive")
+    owners = start_owners(directory, 2, archive_dir=archive)
+    paths = socket_paths(directory, 2)
+    game_ids = [f"game-{index}" for index in range(12)]
+
+    async def scenario():
+        client = ShardClient(paths)
+        try:
+            for game_id in game_ids:
+                reply = await client.forward(game_id, {"op": "create", "players": ["A", "B"]})
+                assert reply.status == 200
+        finally:
+            await client.close()
+        return client
+
+    try:
+        client = asyncio.run(scenario())
+    finally:
+        for process in owners:
+            process.terminate()
+            process.wait()
+    for index, path in enumerate(paths):
+        owned = {game_id for game_id in game_ids if client.owner(game_id) == path}
+        spilled = {name[:-3] for name in os.listdir(f"{archive}.{index}")}
+        # Each owner keeps one game resident and spills the rest to its own directory.
+        assert spilled < owned and len(spilled) == len(owned) - 1
+
+
+def test_owner_errors_become_500_replies(monkeypatch):
+    from backend import main
+
+    monkeypatch.setattr(main, "store", main.store)
+    store = InMemoryGameStore()
+    directory = tempfile.mkdtemp(prefix="dg-")
+    path = os.path.join(directory, "owner.sock")
+
+    def broken(game_id, action):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        server = asyncio.create_task(serve_shard(path, store))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        client = ShardClient([path])
+        try:
+            await client.forward("g", {"op": "create", "players": ["A", "B"]})
+            with monkeypatch.context() as patch:
+                patch.setattr(store, "submit_action", broken)
+                failed = await client.forward("g", {"op": "roll"})
+            # The same pooled connection serves the next request.
+            rolled = await client.forward("g", {"op": "roll"})
+            return failed, rolled, len(client._idle[path])
+        finally:
+            await client.close()
+            server.cancel()
+
+    failed, rolled, connections = asyncio.run(scenario())
+    assert failed.status == 500
+    assert json.loads(failed.body) == {"detail": "Internal Server Error"}
+    assert rolled.status == 200 and connections == 1
@@ -0,0 +1,143 @@
+import random
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from backend.sqlite_store import GroupCommitWriter, SqliteGameStore
+from dicegame.actions import Bank, Roll
+
+
+def _play(store, game_id, actions, rng):
+    for _ in range(actions):
+        session = store.get(game_id)
+        if session.engine.state.game_over:
+            return
+        active = list(session.engine.state.round_state.active_players)
+        if session.engine.state.round_state.round_score >= 20 and rng.random() < 0.5:
+            store.apply_action(game_id, Bank(rng.choice(active)))
+        else:
+            store.apply_action(game_id, Roll())
+
+
+def _state(session):
+    engine = session.engine
+    return (
+        session.version,
+        session.latest_seq,
+        list(engine.state.totals),
+        engine.state.round_state.round_index,
+        engine.state.round_state.round_score,
+        engine.state.round_state.active_mask,
+        [stats.ones_rolled for stats in engine.state.stats],
+        len(engine.state.match_summaries),
+        engine.state.game_over,
+    )
+
+
+@pytest.mark.parametrize("actions", [10, 100, 400])
+def test_reopened_store_recovers_games(tmp_path, actions):
+    path = str(tmp_path / "games.db")
+    store = SqliteGameStore(path, snapshot_interval=16)
+    game_id = store.create(["A", "B", "C"]).game_id
+    _play(store, game_id, actions, random.Random(actions))
+    before = _state(store.get(game_id))
+    events = [event.json_bytes() for event in store.get(game_id).events.retained()]
+    store.close()
+
+    reopened = SqliteGameStore(path, snapshot_interval=16)
+    session = reopened.get(game_id)
+    assert _state(session) == before
+    assert [event.json_bytes() for event in session.events.retained()] == events
+    # The recovered game keeps playing and persisting.
+    _play(reopened, game_id, 5, random.Random(1))
+    reopened.close()
+
+
+def test_old_events_are_read_from_the_database(tmp_path):
+    store = SqliteGameStore(str(tmp_path / "games.db"), event_retention=8)
+    game_id = store.create(["A", "B"]).game_id
+    _play(store, game_id, 60, random.Random(2))
+    session = store.get(game_id)
+    assert len(session.events) <= 8
+    assert len(session.events.retained()) == len(session.events)
+    seqs = [event.seq for event in session.events.since(3)]
+    assert seqs == list(range(4, session.latest_seq + 1))
+    assert session.events.snapshot_seq == 0
+    store.close()
+
+
+def test_reset_and_unknown_games(tmp_path):
+    path = str(tmp_path / "games.db")
+    store = SqliteGameStore(path)
+    game_id = store.create(["A", "B"]).game_id
+    _play(store, game_id, 20, random.Random(3))
+    store.reset(game_id)
+    version = store.get(game_id).version
+    store.close()
+
+    reopened = SqliteGameStore(path)
+    session = reopened.get(game_id)
+    assert session.latest_seq == 0 and session.version == version
+    assert session.engine.state.totals == [0, 0]
+    with pytest.raises(KeyError):
+        reopened.get("missing")
+    reopened.close()
+
+
+def test_concurrent_games_share_commits(tmp_path):
+    store = SqliteGameStore(str(tmp_path / "games.db"))
+    game_ids = [store.create(["A", "B"]).game_id for _ in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda gid: _play(store, gid, 50, random.Random(gid)), game_ids))
+    expected = {gid: _state(store.get(gid)) for gid in game_ids}
+    store.close()
+
+    reopened = SqliteGameStore(str(tmp_path / "games.db"))
+    assert {gid: _state(reopened.get(gid)) for gid in game_ids} == expected
+    reopened.close()
+
+
+def test_failed_commit_reloads_the_game_from_the_database(tmp_path):
+    path = str(tmp_path / "games.db")
+    store = SqliteGameStore(path)
+    game_id = store.create(["A", "B"]).game_id
+    _play(store, game_id, 20, random.Random(4))
+    session = store.get(game_id)
+    before = _state(session)
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TRIGGER fail BEFORE INSERT ON actions BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+    )
+    conn.commit()
+    with store.locked(game_id):
+        _, durable = store.submit_action(game_id, Roll())
+        # The action is applied but its commit is waited on after the lock is released.
+        assert session.version == before[0] + 1
+    with pytest.raises(sqlite3.IntegrityError):
+        durable()
+    assert session.evicted
+    conn.execute("DROP TRIGGER fail")
+    conn.commit()
+    conn.close()
+
+    reloaded = store.get(game_id)
+    assert reloaded is not session
+    assert _state(reloaded) == before
+    _play(store, game_id, 5, random.Random(5))
+    store.close()
+
+
+def test_writes_after_a_failed_write_are_aborted(tmp_path):
+    writer = GroupCommitWriter(str(tmp_path / "games.db"))
+    failed = writer.submit([("INSERT INTO missing VALUES (?)", (1,))])
+    with pytest.raises(sqlite3.OperationalError):
+        failed.result()
+    insert = ("INSERT INTO games (game_id, players, base_version) VALUES (?, '[]', 0)", ("g",))
+    with pytest.raises(RuntimeError):
+        writer.submit([insert], after=failed).result()
+    writer.submit([insert]).result()
+    writer.close()
@@ -1,5 +1,10 @@
-from dicegame.actions import Bank
+import statistics
+
+import pytest
+
+from dicegame.actions import Bank, Roll
 from dicegame.engine import GameEngine
+from dicegame.stats import BANK_AMOUNT_EDGES, RunningStat, merge_stats
 from dicegame.types import FixedDice
 
 
@@ -26,3 +31,31 @@ def test_starter_rotation_across_rounds_and_matches():
     assert engine.state.round_state.match_index == 2
     assert expected_starters == [0, 1, 2, 0, 1, 2, 0, 1, 2, 0]
     assert engine.state.round_state.starter_index == 1
+
+
+def test_running_stat_tracks_aggregates_and_histogram():
+    stat = RunningStat(BANK_AMOUNT_EDGES)
+    for value in (4, 12, 60, 1500):
+        stat.add(value)
+    assert stat.count == 4
+    assert stat.mean == 394
+    assert (stat.minimum, stat.maximum) == (4, 1500)
+    assert stat.histogram == [1, 1, 0, 1, 0, 0, 0, 1]
+    assert stat.variance == pytest.approx(statistics.variance([4, 12, 60, 1500]))
+
+
+def test_match_deltas_subtract_and_rollups_merge():
+    engine = GameEngine(["A", "B"], FixedDice([6, 5, 1] * 20))
+    for _ in range(10):
+        engine.step(Roll())
+        engine.step(Bank(0))
+        engine.step(Roll())
+        engine.step(Roll())
+    delta = engine.state.match_summaries[0].stats_deltas[0]
+    assert delta.voluntary_bank_amounts.count == 10
+    assert delta.voluntary_bank_amounts.total == 60
+    assert delta.voluntary_bank_amounts.minimum is None
+    rollup = merge_stats(engine.state.stats[0], engine.state.stats[0])
+    assert rollup.voluntary_banks_count == 20
+    assert rollup.avg_voluntary_bank == 6
+    assert rollup.voluntary_bank_amounts.maximum == 6
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from backend import main
+from backend.broadcast import GameBroadcaster
+from backend.store import InMemoryGameStore
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(main, "store", InMemoryGameStore())
+    monkeypatch.setattr(main, "broadcaster", GameBroadcaster())
+    transport = httpx.ASGITransport(app=main.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def test_long_poll_returns_when_an_action_lands(api):
+    async def scenario():
+        async with api as client:
+            game = (await client.post("/api/games", json={"players": ["A", "B"]})).json()
+            game_id = game["game_id"]
+            poll = asyncio.create_task(
+                client.get(f"/api/games/{game_id}", params={"since_seq": 0, "wait": 10})
+            )
+            await asyncio.sleep(0.1)
+            assert not poll.done()
+            await client.post(f"/api/games/{game_id}/bank", json={"player_id": 0})
+            response = await asyncio.wait_for(poll, 5)
+            return response.json()
+
+    body = asyncio.run(scenario())
+    assert [event["type"] for event in body["events"]] == ["bank"]
+    assert body["latest_seq"] == 1
+
+
+def test_long_poll_times_out_with_no_events(api):
+    async def scenario():
+        async with api as client:
+            game = (await client.post("/api/games", json={"players": ["A", "B"]})).json()
+            response = await client.get(
+                f"/api/games/{game['game_id']}", params={"since_seq": 0, "wait": 0.1}
+            )
+            return response.json()
+
+    assert asyncio.run(scenario())["events"] == []
+
+
+def test_game_updates_fan_out_to_every_subscriber(monkeypatch):
+    monkeypatch.setattr(main, "store", InMemoryGameStore())
+    monkeypatch.setattr(main, "broadcaster", GameBroadcaster())
+    session = main.store.create(["A", "B"])
+
+    async def watch():
+        seen = []
+        async for response in main.game_updates(session.game_id, None, heartbeat=5):
+            seen.append([event.seq for event in response.events])
+            if response.latest_seq >= 2:
+                return seen
+
+    async def scenario():
+        watchers = [asyncio.create_task(watch()) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for player_id in (0, 1):
+            main.bank(session.game_id, main.BankRequest(player_id=player_id))
+            await asyncio.sleep(0.05)
+        return await asyncio.wait_for(asyncio.gather(*watchers), 5)
+
+    for seen in asyncio.run(scenario()):
+        assert seen == [[], [1], [2, 3]]
+
+
+def test_stream_sends_heartbeats_when_idle(monkeypatch):
+    monkeypatch.setattr(main, "store", InMemoryGameStore())
+    monkeypatch.setattr(main, "broadcaster", GameBroadcaster())
+    session = main.store.create(["A", "B"])
+
+    async def scenario():
+        updates = main.game_updates(session.game_id, 0, heartbeat=0.05)
+        first = await updates.__anext__()
+        second = await updates.__anext__()
+        await updates.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.latest_seq == 0 and second is None
+
+
+def test_a_timed_out_waiter_does_not_strand_the_others():
+    async def scenario():
+        broadcaster = GameBroadcaster()
+        changed = []
+        loop = asyncio.get_running_loop()
+        short = asyncio.create_task(broadcaster.wait("g", lambda: bool(changed), 0.05))
+        long = asyncio.create_task(broadcaster.wait("g", lambda: bool(changed), 5))
+        assert not await short
+        started = loop.time()
+        changed.append(True)
+        broadcaster.publish("g")
+        assert await asyncio.wait_for(long, 1)
+        return loop.time() - started, broadcaster._waiters
+
+    elapsed, waiters = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert waiters == {}
@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+from dicegame.cli import parse_strategy, run_single_game
+from dicegame.sweep import DiceStreams, expand_grid, expand_spec, run_sweep
+
+
+def test_expand_spec_ranges_are_inclusive():
+    assert expand_spec("threshold:20..50:10") == [
+        "threshold:20",
+        "threshold:30",
+        "threshold:40",
+        "threshold:50",
+    ]
+    assert expand_spec("roll_limit:1..3") == ["roll_limit:1", "roll_limit:2", "roll_limit:3"]
+    assert expand_spec("greedy") == ["greedy"]
+    with pytest.raises(ValueError):
+        expand_spec("threshold:50..20")
+
+
+def test_expand_grid_is_cartesian():
+    grid = expand_grid(["threshold:10..20:10", "roll_limit:1..2"])
+    assert len(grid) == 4
+    assert ("threshold:20", "roll_limit:1") in grid
+
+
+def test_dice_streams_replay_the_same_faces():
+    streams = DiceStreams(seed=5)
+    first = streams.dice(3)
+    faces = [first.roll() for _ in range(200)]
+    again = streams.dice(3)
+    assert [again.roll() for _ in range(200)] == faces
+    assert streams.dice(4).roll() in range(1, 7)
+
+
+def test_identical_cells_have_identical_results():
+    rows = run_sweep(
+        ["A", "B"],
+        ["threshold:20..30:10", "roll_limit:2"],
+        games=100,
+        seed=1,
+        parse=parse_strategy,
+    )
+    assert len(rows) == 2
+    assert rows[0].diff_vs_best == 0.0
+    assert rows[0].cell.win_rate >= rows[1].cell.win_rate
+    duplicate = run_sweep(
+        ["A", "B"], ["threshold:20", "roll_limit:2"], games=100, seed=1, parse=parse_strategy
+    )
+    match = next(row for row in rows if row.cell.specs == ("threshold:20", "roll_limit:2"))
+    assert duplicate[0].cell.wins == match.cell.wins
+
+
+def test_sweeps_without_games_do_not_divide_by_zero():
+    rows = run_sweep(["A", "B"], ["threshold:20..30:10", "greedy"], 0, seed=1, parse=parse_strategy)
+    assert [row.cell.win_rate for row in rows] == [0.0, 0.0]
+    assert rows[1].diff_vs_best == 0.0 and rows[1].ci_half_width == math.inf
+
+
+def test_paired_intervals_match_the_per_game_differences():
+    players = ["A", "B"]
+    specs = ["threshold:15..45:15", "threshold:25"]
+    rows = run_sweep(players, specs, games=200, seed=2, parse=parse_strategy)
+    streams = DiceStreams(seed=2)
+    outcomes = {}
+    for row in rows:
+        strategies = [parse_strategy(spec) for spec in row.cell.specs]
+        scores = [run_single_game(players, strategies, streams.dice(g)) for g in range(200)]
+        outcomes[row.cell.specs] = [int(s[0] == max(s)) for s in scores]
+        assert row.cell.wins.total == sum(outcomes[row.cell.specs])
+    best = outcomes[rows[0].cell.specs]
+    for row in rows[1:]:
+        diffs = [a - b for a, b in zip(outcomes[row.cell.specs], best)]
+        mean = sum(diffs) / len(diffs)
+        variance = sum((d - mean) ** 2 for d in diffs) / (len(diffs) - 1)
+        assert row.diff_vs_best == pytest.approx(mean)
+        assert row.ci_half_width == pytest.approx(1.96 * math.sqrt(variance / len(diffs)))
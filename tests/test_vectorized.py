@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dicegame.cli import simulate
+from dicegame.strategies import GreedyStrategy, RollLimitStrategy, ThresholdStrategy
+from dicegame.vectorized import simulate_batch, supports_batch
+
+
+class PlayerIdStrategy:
+    def decide_bank(self, state, player_id):
+        return player_id == 0
+
+
+def test_supports_batch_requires_array_predicates():
+    assert supports_batch([ThresholdStrategy(50), RollLimitStrategy(3), GreedyStrategy()])
+    assert not supports_batch([ThresholdStrategy(50), PlayerIdStrategy()])
+
+
+def test_immediate_bankers_always_tie_at_zero():
+    result = simulate_batch(["A", "B", "C"], [RollLimitStrategy(0)] * 3, 500)
+    assert result.totals == [0, 0, 0]
+    assert result.wins == [500, 500, 500]
+    assert result.games == 500
+
+
+def test_batch_matches_scalar_averages():
+    players = ["A", "B"]
+    strategies = [RollLimitStrategy(1), ThresholdStrategy(20)]
+    batch = simulate_batch(players, strategies, 20000, rng=np.random.default_rng(7))
+    random.seed(7)
+    scalar = simulate(players, strategies, 2000)
+    # One roll then bank: 5/6 chance of banking the face, 20/6 per round.
+    assert batch.totals[0] / batch.games == pytest.approx(100, rel=0.02)
+    for i in range(2):
+        assert batch.totals[i] / batch.games == pytest.approx(
+            scalar.totals[i] / scalar.games, rel=0.05
+        )
+        assert batch.wins[i] / batch.games == pytest.approx(
+            scalar.wins[i] / scalar.games, abs=0.03
+        )